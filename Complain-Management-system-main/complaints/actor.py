@@ -0,0 +1,70 @@
+"""
+Request-scoped view of who is acting (request.actor)
+
+Views, serializers and permission checks used to look up
+``request.user.profile`` and recompute ``role`` / ``is_admin`` on their
+own. ActorMiddleware attaches one immutable Actor per request instead,
+built from the user the authentication backend already loaded with its
+profile (complaints/authentication.py), so it costs no queries.
+
+The actor is built on first access, so under DRF it reflects the user set
+by token authentication as long as it is read inside the view.
+"""
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils.functional import SimpleLazyObject
+
+
+@dataclass(frozen=True)
+class Actor:
+    user_id: int | None
+    is_authenticated: bool
+    has_profile: bool
+    role: str           # profile role; 'student' without a profile, as the views always assumed
+    is_admin: bool      # staff or superuser
+    department: str
+    category: str
+
+
+ANONYMOUS = Actor(
+    user_id=None, is_authenticated=False, has_profile=False, role='anon',
+    is_admin=False, department='', category='',
+)
+
+
+def actor_for(user):
+    """The Actor for ``user``, computed once per user instance"""
+    if not user.is_authenticated:
+        return ANONYMOUS
+    actor = user.__dict__.get('_actor')
+    if actor is None:
+        profile = getattr(user, 'profile', None)
+        actor = Actor(
+            user_id=user.pk,
+            is_authenticated=True,
+            has_profile=profile is not None,
+            role=profile.role if profile else 'student',
+            is_admin=user.is_staff or user.is_superuser,
+            department=profile.department if profile else '',
+            category=profile.category if profile else '',
+        )
+        user._actor = actor
+    return actor
+
+
+class ActorMiddleware:
+    """Place after AuthenticationMiddleware; works for sync and async views"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        # Built on first access: inside DRF views that is after token auth
+        request.actor = SimpleLazyObject(lambda: actor_for(request.user))
+        # Under ASGI this returns the coroutine for the caller to await
+        return self.get_response(request)
@@ -1,11 +1,20 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
+from django.forms.models import BaseInlineFormSet
 from django.urls import reverse, path
 from django.utils.html import format_html
 from django.utils import timezone
 from datetime import datetime
 from django.http import HttpResponseRedirect
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import render
+import io
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 
 from .models import (
     UserProfile,
@@ -14,7 +23,13 @@ from .models import (
     Feedback,
     Notification
 )
-from .admin_views import export_complaints_pdf
+from .admin_views import export_complaints_pdf, export_complaints_csv
+from .assignment import OPEN_STATUSES
+from .bulk import bulk_assign, bulk_update_status
+from .db import estimated_row_count
+from .history import history_page
+from .sla import compute_due_at
+from .importer import ErrorWriter, detect_format, import_complaints
 
 
 # =========================
@@ -94,13 +109,99 @@ class UserProfileAdmin(admin.ModelAdmin):
 # =========================
 # Complaint History Inline
 # =========================
+class RecentHistoryFormSet(BaseInlineFormSet):
+    """Only the newest page of history; older rows load lazily in the template"""
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            entries, self.next_cursor = ([], None)
+            if self.instance.pk:
+                entries, self.next_cursor = history_page(self.instance)
+            self._queryset = super().get_queryset().filter(
+                pk__in=[entry.pk for entry in entries]
+            ).select_related('changed_by')
+        return self._queryset
+
+
 class ComplaintHistoryInline(admin.TabularInline):
     model = ComplaintHistory
+    formset = RecentHistoryFormSet
+    template = 'admin/complaints/complaint/history_inline.html'
     extra = 0
     readonly_fields = ('changed_by', 'from_status', 'to_status', 'timestamp')
     fields = ('changed_by', 'from_status', 'to_status', 'remarks', 'timestamp')
 
 
+# =========================
+# Changelist Scaling Helpers
+# =========================
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """
+    Related-field filter backed by the admin autocomplete view.
+    Only the selected value is loaded instead of every related row.
+    """
+    template = 'admin/complaints/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.app_label = model._meta.app_label
+        self.model_name = model._meta.model_name
+        self.field_name = field_path
+
+    def field_choices(self, field, request, model_admin):
+        if not self.lookup_val:
+            return []
+        related = field.remote_field.model._default_manager.filter(pk__in=self.lookup_val)
+        return [(obj.pk, str(obj)) for obj in related]
+
+    def has_output(self):
+        return True
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the planner's row estimate for the unfiltered changelist once the
+    table is large; filtered lists still get an exact (indexed) count.
+    """
+    exact_count_limit = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        return super().count
+
+
+class ComplaintActionForm(ActionForm):
+    """Extra inputs shown next to the admin action dropdown"""
+    status = forms.ChoiceField(
+        choices=[('', 'New status')] + Complaint.STATUS_CHOICES,
+        required=False
+    )
+    # Searched through the User admin instead of rendering every faculty
+    # member as an <option> on each changelist page
+    assigned_to = forms.ModelChoiceField(
+        queryset=User.objects.filter(profile__role__in=['faculty', 'hod']),
+        required=False,
+        label='Assign to',
+        widget=AutocompleteSelect(
+            Complaint._meta.get_field('assigned_to'), admin.site, attrs={'style': 'width: 16em'}
+        )
+    )
+
+
+class ComplaintImportForm(forms.Form):
+    file = forms.FileField(help_text='.csv, .json or .ndjson')
+    notify = forms.BooleanField(required=False, initial=True, label='Notify assignees and admins')
+    index = forms.BooleanField(
+        required=False, initial=True, label='Index for duplicate detection',
+        help_text='Untick for large files and run index_duplicates afterwards'
+    )
+
+
 # =========================
 # Complaint Admin
 # =========================
@@ -115,15 +216,23 @@ class ComplaintAdmin(admin.ModelAdmin):
         'assigned_to',
         'status',
         'created_at',
+        'due_at',
         'resolved_at'
     )
     list_filter = (
         'status',
         'priority',
         'category',
-        'assigned_to',
+        ('assigned_to', AutocompleteFilter),
+        ('user', AutocompleteFilter),
         'created_at'
     )
+    list_select_related = ('user', 'assigned_to', 'category', 'subcategory')
+    autocomplete_fields = ('user', 'assigned_to')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    action_form = ComplaintActionForm
+    actions = ['assign_selected', 'change_status_selected', 'export_selected_csv']
     search_fields = (
         'complaint_no',
         'title',
@@ -131,7 +240,7 @@ class ComplaintAdmin(admin.ModelAdmin):
         'user__username',
         'assigned_to__username'
     )
-    readonly_fields = ('complaint_no', 'created_at', 'resolved_at')
+    readonly_fields = ('complaint_no', 'created_at', 'resolved_at', 'escalated_at', 'duplicate_of')
     inlines = [ComplaintHistoryInline]
     ordering = ('-created_at',)
     change_list_template = 'admin/complaints/complaint/change_list.html'
@@ -141,7 +250,7 @@ class ComplaintAdmin(admin.ModelAdmin):
             'fields': ('complaint_no', 'title', 'description', 'category', 'subcategory', 'user')
         }),
         ('Assignment & Status', {
-            'fields': ('assigned_to', 'status', 'priority', 'resolved_at')
+            'fields': ('assigned_to', 'status', 'priority', 'due_at', 'escalated_at', 'resolved_at', 'duplicate_of')
         }),
         ('Attachments & Remarks', {
             'fields': ('attachment', 'remarks', 'admin_remarks')
@@ -153,18 +262,105 @@ class ComplaintAdmin(admin.ModelAdmin):
     )
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'assigned_to')
+        return super().get_queryset(request).select_related(
+            'user', 'assigned_to', 'category', 'subcategory'
+        )
+
+    def save_model(self, request, obj, form, change):
+        # due_at was fixed from the old priority; move it unless the admin set
+        # it by hand or the complaint is already closed or escalated
+        if (change and 'priority' in form.changed_data and 'due_at' not in form.changed_data
+                and obj.status in OPEN_STATUSES and not obj.escalated_at):
+            obj.due_at = compute_due_at(obj.priority, start=obj.created_at)
+        super().save_model(request, obj, form, change)
+
+    # Bulk actions run as set-based updates (see complaints.bulk)
+    def get_action_form(self, request):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        return form
+
+    @admin.action(description='Assign selected complaints')
+    def assign_selected(self, request, queryset):
+        form = self.get_action_form(request)
+        if not form.is_valid() or not form.cleaned_data.get('assigned_to'):
+            self.message_user(request, 'Choose a faculty member to assign to.', messages.WARNING)
+            return
+        faculty = form.cleaned_data['assigned_to']
+        if faculty.profile.role == 'hod' and not request.user.is_superuser:
+            self.message_user(request, 'Only superusers can assign complaints to HOD.', messages.ERROR)
+            return
+
+        result = bulk_assign(request.user, queryset.order_by(), faculty)
+        self.message_user(
+            request,
+            f"Assigned {result['updated']} complaint(s) to {faculty.get_full_name() or faculty.username}.",
+            messages.SUCCESS
+        )
+
+    @admin.action(description='Change status of selected complaints')
+    def change_status_selected(self, request, queryset):
+        form = self.get_action_form(request)
+        if not form.is_valid() or not form.cleaned_data.get('status'):
+            self.message_user(request, 'Choose the new status.', messages.WARNING)
+            return
+        new_status = form.cleaned_data['status']
+
+        result = bulk_update_status(request.user, queryset.order_by(), new_status)
+        self.message_user(
+            request,
+            f"Updated {result['updated']} complaint(s) to {dict(Complaint.STATUS_CHOICES)[new_status]}.",
+            messages.SUCCESS
+        )
+
+    @admin.action(description='Export selected complaints to CSV')
+    def export_selected_csv(self, request, queryset):
+        return export_complaints_csv(queryset)
     
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
             path('export-pdf/', self.admin_site.admin_view(export_complaints_pdf), name='complaints_complaint_export_pdf'),
+            path('import/', self.admin_site.admin_view(self.import_view), name='complaints_complaint_import'),
         ]
         return custom_urls + urls
+
+    def import_view(self, request):
+        """Upload a CSV/JSON file of complaints (see complaints.importer)"""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = ComplaintImportForm(request.POST or None, request.FILES or None)
+        context = {**self.admin_site.each_context(request), 'opts': self.model._meta, 'form': form}
+
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            errors_file = io.StringIO()
+            errors = ErrorWriter(errors_file)
+            # Streamed from the upload (a temporary file once it is large)
+            stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+            try:
+                result = import_complaints(
+                    stream, detect_format(upload.name), request.user,
+                    notify=form.cleaned_data['notify'], index=form.cleaned_data['index'], on_error=errors,
+                )
+            except ValueError as exc:
+                form.add_error('file', f"Could not read the file: {exc}")
+            else:
+                rows = result['imported'] + result['failed']
+                context.update(
+                    result=result,
+                    rate=rows / result['seconds'] if result['seconds'] else 0,
+                    errors_csv=errors_file.getvalue(),
+                )
+            finally:
+                stream.detach()
+
+        return render(request, 'admin/complaints/complaint/import.html', context)
     
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
         extra_context['pdf_export_url'] = reverse('admin:complaints_complaint_export_pdf')
+        extra_context['import_url'] = reverse('admin:complaints_complaint_import')
         extra_context['current_year'] = timezone.now().year
         extra_context['current_month'] = timezone.now().month
         return super().changelist_view(request, extra_context=extra_context)
@@ -1,8 +1,9 @@
 """
-Admin views for PDF export functionality
+Admin views for PDF and CSV export functionality
 """
+import csv
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from datetime import datetime, timedelta
 from reportlab.lib.pagesizes import A4, letter
@@ -211,3 +212,49 @@ def export_complaints_pdf(request):
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     
     return response
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv"""
+
+    def write(self, value):
+        return value
+
+
+def export_complaints_csv(queryset):
+    """
+    Stream a CSV of the given complaints.
+    Rows are read with values_list() in chunks, so memory stays flat no matter
+    how many complaints are selected.
+    """
+    status_labels = dict(Complaint.STATUS_CHOICES)
+    rows = queryset.order_by('-created_at').values_list(
+        'complaint_no', 'title', 'category__name', 'status', 'priority',
+        'user__username', 'user__first_name', 'user__last_name',
+        'assigned_to__first_name', 'assigned_to__last_name', 'assigned_to__username',
+        'created_at', 'resolved_at'
+    )
+
+    def generate():
+        writer = csv.writer(Echo())
+        yield writer.writerow([
+            'Complaint No', 'Title', 'Category', 'Status', 'Priority', 'User',
+            'Assigned To', 'Created At', 'Resolved At'
+        ])
+        for (complaint_no, title, category, status, priority, username, first, last,
+             assigned_first, assigned_last, assigned_username, created_at, resolved_at) in rows.iterator(chunk_size=2000):
+            yield writer.writerow([
+                complaint_no,
+                title,
+                category,
+                status_labels.get(status, status),
+                priority,
+                f"{first} {last}".strip() or username,
+                f"{assigned_first or ''} {assigned_last or ''}".strip() or assigned_username or '',
+                created_at.strftime('%Y-%m-%d %H:%M'),
+                resolved_at.strftime('%Y-%m-%d %H:%M') if resolved_at else '',
+            ])
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="complaints_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
+    return response
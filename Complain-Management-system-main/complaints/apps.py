@@ -4,3 +4,109 @@ from django.apps import AppConfig
 class ComplaintsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'complaints'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_init, post_save
+        from .analytics import bump_data_version
+        from .authentication import profile_changed, token_deleted, user_changed
+        from .changes import FEED_MODELS, change_deleted, change_saved
+        from .db import configure_sqlite_connection
+        from .duplicates import complaint_text_loaded, complaint_text_saved
+        from .thumbnails import complaint_saved
+        from .workload import (
+            complaint_state_deleted, complaint_state_loaded, complaint_state_saved,
+            feedback_deleted, feedback_saved
+        )
+
+        connection_created.connect(
+            configure_sqlite_connection,
+            dispatch_uid='complaints.configure_sqlite_connection'
+        )
+        post_save.connect(
+            complaint_saved,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.complaint_thumbnails'
+        )
+        post_init.connect(
+            complaint_text_loaded,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.duplicates_loaded'
+        )
+        post_save.connect(
+            complaint_text_saved,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.duplicates_indexed'
+        )
+        post_save.connect(
+            bump_data_version,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.data_version_saved'
+        )
+        post_delete.connect(
+            bump_data_version,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.data_version_deleted'
+        )
+        post_init.connect(
+            complaint_state_loaded,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.faculty_workload_loaded'
+        )
+        post_save.connect(
+            complaint_state_saved,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.faculty_workload_saved'
+        )
+        post_delete.connect(
+            complaint_state_deleted,
+            sender='complaints.Complaint',
+            dispatch_uid='complaints.faculty_workload_deleted'
+        )
+        post_save.connect(
+            feedback_saved,
+            sender='complaints.Feedback',
+            dispatch_uid='complaints.faculty_feedback_saved'
+        )
+        post_delete.connect(
+            feedback_deleted,
+            sender='complaints.Feedback',
+            dispatch_uid='complaints.faculty_feedback_deleted'
+        )
+        post_save.connect(
+            user_changed,
+            sender=settings.AUTH_USER_MODEL,
+            dispatch_uid='complaints.auth_cache_user_saved'
+        )
+        post_delete.connect(
+            user_changed,
+            sender=settings.AUTH_USER_MODEL,
+            dispatch_uid='complaints.auth_cache_user_deleted'
+        )
+        post_save.connect(
+            profile_changed,
+            sender='complaints.UserProfile',
+            dispatch_uid='complaints.auth_cache_profile_saved'
+        )
+        post_delete.connect(
+            profile_changed,
+            sender='complaints.UserProfile',
+            dispatch_uid='complaints.auth_cache_profile_deleted'
+        )
+        for kind, model in FEED_MODELS.items():
+            post_save.connect(
+                change_saved,
+                sender=model,
+                dispatch_uid=f'complaints.change_log_{kind}_saved'
+            )
+            post_delete.connect(
+                change_deleted,
+                sender=model,
+                dispatch_uid=f'complaints.change_log_{kind}_deleted'
+            )
+        post_delete.connect(
+            token_deleted,
+            sender='authtoken.Token',
+            dispatch_uid='complaints.auth_cache_token_deleted'
+        )
@@ -0,0 +1,217 @@
+"""
+Load-balanced auto-assignment of new complaints
+
+Faculty whose ``UserProfile.category`` matches a complaint's category form
+its assignment pool. Each process keeps an in-memory index of open workload
+(PENDING + PROCESSING complaints) per member, seeded per category from
+FacultyWorkload on first use. workload.py, which maintains FacultyWorkload,
+mirrors every open-load change into the index, so both agree without a second
+set of signal receivers. The index is reloaded after ASSIGNMENT_INDEX_TTL
+seconds so it picks up changes made by other workers.
+
+Strategies (ASSIGNMENT_STRATEGY):
+- ``least_loaded``: fewest open complaints, O(log n) via a heap
+- ``weighted``: lowest load / weight, weights from ASSIGNMENT_WEIGHTS;
+  a weight of 0 takes a member out of the pool (e.g. on leave)
+- ``round_robin``: rotate through the pool
+- or a dotted path to an AssignmentStrategy subclass
+
+When a category has no pool, the static rules still apply: the
+subcategory faculty, then the category faculty.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils.module_loading import import_string
+
+from .models import FacultyWorkload, UserProfile
+
+
+OPEN_STATUSES = ('PENDING', 'PROCESSING')
+
+
+# =========================
+# Workload index
+# =========================
+class CategoryWorkload:
+    """Open workload of one category's pool, ordered by a lazy min-heap"""
+
+    def __init__(self, loads, weights=None):
+        self.loads = dict(loads)
+        self.weights = weights or {}
+        self.members = sorted(self.loads)
+        self._cursor = 0
+        self._counter = itertools.count()
+        self._rebuild_heap()
+
+    def _score(self, user_id):
+        return self.loads[user_id] / self.weights.get(user_id, 1)
+
+    def _rebuild_heap(self):
+        self._heap = [(self._score(uid), next(self._counter), uid) for uid in self.members]
+        heapq.heapify(self._heap)
+
+    def adjust(self, user_id, delta):
+        """Apply a workload change; superseded heap entries are skipped on read"""
+        self.loads[user_id] = max(self.loads[user_id] + delta, 0)
+        heapq.heappush(self._heap, (self._score(user_id), next(self._counter), user_id))
+        if len(self._heap) > 4 * len(self.members) + 16:
+            self._rebuild_heap()
+
+    def least_loaded(self):
+        while self._heap:
+            score, _, user_id = self._heap[0]
+            if score == self._score(user_id):
+                return user_id
+            heapq.heappop(self._heap)
+        return None
+
+    def next_in_rotation(self):
+        if not self.members:
+            return None
+        user_id = self.members[self._cursor % len(self.members)]
+        self._cursor += 1
+        return user_id
+
+
+class WorkloadIndex:
+    """Per-process registry of CategoryWorkload objects"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._categories = {}
+        self._member_category = {}
+
+    def ttl(self):
+        return getattr(settings, 'ASSIGNMENT_INDEX_TTL', 300)
+
+    def _load(self, key, strategy):
+        members = UserProfile.objects.filter(
+            role='faculty', category=key, user__is_active=True
+        ).values_list('user_id', 'user__username')
+        # Members without a positive weight take no new complaints
+        weights = {uid: strategy.weight_for(username) for uid, username in members}
+        weights = {uid: weight for uid, weight in weights.items() if weight > 0}
+        loads = dict.fromkeys(weights, 0)
+        loads.update(
+            FacultyWorkload.objects.filter(user_id__in=list(weights))
+            .values_list('user_id', 'open_complaints')
+        )
+        return CategoryWorkload(loads, weights)
+
+    def choose(self, key, strategy):
+        """Pick a member of ``key``'s pool, or None if the pool is empty"""
+        with self._lock:
+            entry = self._categories.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl():
+                workload = self._load(key, strategy)
+                self._categories[key] = (workload, time.monotonic())
+                for user_id in workload.members:
+                    self._member_category[user_id] = key
+            else:
+                workload = entry[0]
+            return strategy.choose(workload)
+
+    def adjust(self, user_id, delta):
+        with self._lock:
+            key = self._member_category.get(user_id)
+            entry = self._categories.get(key)
+            if entry and user_id in entry[0].loads:
+                entry[0].adjust(user_id, delta)
+
+    def set_loads(self, loads):
+        """Overwrite members' loads with recomputed values ({user id: open})"""
+        with self._lock:
+            for user_id, load in loads.items():
+                entry = self._categories.get(self._member_category.get(user_id))
+                if entry and user_id in entry[0].loads:
+                    entry[0].adjust(user_id, load - entry[0].loads[user_id])
+
+    def invalidate(self):
+        """Drop everything; used after set-based updates that bypass save()"""
+        with self._lock:
+            self._categories.clear()
+            self._member_category.clear()
+
+
+workload_index = WorkloadIndex()
+
+
+# =========================
+# Strategies
+# =========================
+class AssignmentStrategy:
+    """Chooses one user id from a CategoryWorkload"""
+
+    def weight_for(self, username):
+        return 1
+
+    def choose(self, workload):
+        raise NotImplementedError
+
+
+class LeastLoadedStrategy(AssignmentStrategy):
+    def choose(self, workload):
+        return workload.least_loaded()
+
+
+class WeightedStrategy(LeastLoadedStrategy):
+    """Least load relative to capacity; ASSIGNMENT_WEIGHTS maps username -> weight"""
+
+    def weight_for(self, username):
+        return getattr(settings, 'ASSIGNMENT_WEIGHTS', {}).get(username, 1)
+
+
+class RoundRobinStrategy(AssignmentStrategy):
+    def choose(self, workload):
+        return workload.next_in_rotation()
+
+
+STRATEGIES = {
+    'least_loaded': LeastLoadedStrategy,
+    'weighted': WeightedStrategy,
+    'round_robin': RoundRobinStrategy,
+}
+
+
+def get_strategy():
+    name = getattr(settings, 'ASSIGNMENT_STRATEGY', 'least_loaded')
+    strategy_class = STRATEGIES.get(name) or import_string(name)
+    return strategy_class()
+
+
+# =========================
+# Assignment
+# =========================
+def profile_category_for(category):
+    """Map a Category row to a UserProfile.category key (or None)"""
+    mapping = getattr(settings, 'ASSIGNMENT_CATEGORY_MAP', {})
+    if category.name in mapping:
+        return mapping[category.name]
+
+    name = category.name.strip().lower()
+    for key, label in UserProfile.CATEGORY_CHOICES:
+        label = label.lower()
+        if name in (key, label, label.split('/')[0].strip()):
+            return key
+    return None
+
+
+def choose_assignee(category, subcategory=None):
+    """Assignee for a new complaint: balanced pool first, then static rules"""
+    key = profile_category_for(category) if category else None
+    if key:
+        user_id = workload_index.choose(key, get_strategy())
+        if user_id is not None:
+            return User.objects.get(pk=user_id)
+
+    if subcategory and subcategory.faculty:
+        return subcategory.faculty
+    if category and category.faculty:
+        return category.faculty
+    return None
+
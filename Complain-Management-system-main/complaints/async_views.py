@@ -0,0 +1,229 @@
+"""
+Async read views, served instead of the sync ones when ASYNC_READ_VIEWS
+is enabled (run under ASGI: uvicorn/daphne/gunicorn -k uvicorn)
+
+Under ASGI the sync views run through a thread adapter for the whole
+request. These versions of the read-heavy endpoints await the async ORM
+and issue a page's independent queries together with asyncio.gather.
+Querysets, permission rules and template contexts are the ones the sync
+views use (views.py); only the I/O differs. Sync helpers (history,
+duplicate lookup, template rendering) run through sync_to_async.
+
+Django runs the async ORM calls of one request on that request's thread,
+so gather() overlaps the awaits rather than running SQL in parallel.
+bench_async_views compares throughput per worker with the sync views.
+
+The JSON endpoints (stats, notifications) authenticate with the same
+token/session classes as the DRF API, apply the 'api' throttle, and
+return the same payloads.
+"""
+import asyncio
+import math
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse
+from django.shortcuts import aget_object_or_404, redirect, render
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .actor import actor_for
+from .authentication import CachedTokenAuthentication
+from .duplicates import duplicates_for
+from .history import history_page
+from .models import Notification
+from .permissions import can_view_complaint
+from .serializers import ComplaintStatsSerializer, NotificationSerializer
+from .throttling import check
+from .views import (
+    average_resolution_time, can_merge_duplicates, complaint_detail_context,
+    complaint_detail_queryset, complaint_list_queryset, dashboard_querysets,
+    resolved_time_pairs, stats_count_querysets, stats_month_querysets, stats_queryset
+)
+
+
+async def _counts(querysets):
+    """{name: count} for {name: queryset}, counted concurrently"""
+    counts = await asyncio.gather(*(queryset.acount() for queryset in querysets.values()))
+    return dict(zip(querysets, counts))
+
+
+async def _listed(queryset):
+    return [obj async for obj in queryset]
+
+
+async def _actor(request):
+    user = await request.auser()
+    # The profile may not be loaded yet (sessions from before CachedModelBackend)
+    return user, await sync_to_async(actor_for)(user)
+
+
+# =========================
+# Template views
+# =========================
+@login_required
+async def dashboard(request):
+    """Role-aware dashboard"""
+    user, actor = await _actor(request)
+
+    if not actor.has_profile and not actor.is_admin:
+        messages.error(request, "User profile not found. Please contact administrator.")
+        return redirect('logout')
+
+    role, stats, recent_complaints = dashboard_querysets(actor, user)
+    stats, recent_complaints = await asyncio.gather(_counts(stats), _listed(recent_complaints))
+
+    context = {
+        'role': role,
+        'stats': stats,
+        'recent_complaints': recent_complaints,
+    }
+    return await sync_to_async(render)(request, 'complaints/dashboard.html', context)
+
+
+@login_required
+async def complaint_list(request):
+    user, actor = await _actor(request)
+    complaints, tab = complaint_list_queryset(actor, user, request.GET.get('tab'))
+
+    paginator = Paginator(complaints, 20)
+    # Count up front so get_page() below does no I/O
+    paginator.count = await complaints.acount()
+    page_obj = paginator.get_page(request.GET.get('page'))
+    page_obj.object_list = await _listed(page_obj.object_list)
+
+    return await sync_to_async(render)(request, 'complaints/complaint_list.html', {
+        'page_obj': page_obj,
+        'role': actor.role,
+        'tab': tab,
+    })
+
+
+@login_required
+async def complaint_detail(request, complaint_no):
+    """Complaint detail view"""
+    user, actor = await _actor(request)
+    complaint = await aget_object_or_404(complaint_detail_queryset(), complaint_no=complaint_no)
+
+    if not can_view_complaint(user, complaint):
+        raise Http404("Complaint not found")
+
+    history_task = sync_to_async(history_page)(complaint)
+    if can_merge_duplicates(user, complaint):
+        (history, history_cursor), duplicates = await asyncio.gather(
+            history_task, sync_to_async(duplicates_for)(complaint)
+        )
+    else:
+        (history, history_cursor), duplicates = await history_task, []
+
+    def rendered():
+        context = complaint_detail_context(request, complaint, history, history_cursor, duplicates)
+        return render(request, 'complaints/complaint_detail.html', context)
+    return await sync_to_async(rendered)()
+
+
+# =========================
+# JSON endpoints
+# =========================
+def _error(detail, status, headers=None):
+    response = _json({'detail': str(detail)}, status=status)
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+async def _api_user(request):
+    """
+    (user, None) as the API would authenticate the request, or
+    (None, error response)
+    """
+    header = request.headers.get('Authorization', '').split()
+    if header and header[0].lower() == CachedTokenAuthentication.keyword.lower():
+        if len(header) != 2:
+            return None, _error('Invalid token header.', 401, {'WWW-Authenticate': 'Token'})
+        try:
+            user, _ = await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(header[1])
+        except exceptions.AuthenticationFailed as exc:
+            return None, _error(exc.detail, 401, {'WWW-Authenticate': 'Token'})
+    else:
+        user = await request.auser()
+        if not user.is_authenticated:
+            return None, _error(
+                'Authentication credentials were not provided.', 401, {'WWW-Authenticate': 'Token'}
+            )
+    request.user = user
+
+    wait = await sync_to_async(check)('api', request, f'user:{user.pk}')
+    if wait:
+        retry_after = math.ceil(wait)
+        return None, _error(
+            f'Request was throttled. Expected available in {retry_after} seconds.',
+            429, {'Retry-After': str(retry_after)}
+        )
+    return user, None
+
+
+def _json(data, status=200):
+    # Same bytes as DRF's JSONRenderer
+    return JsonResponse(
+        data, status=status, encoder=JSONEncoder, safe=False,
+        json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')},
+    )
+
+
+async def complaint_stats(request):
+    """Get complaint statistics (async version of views.complaint_stats)"""
+    if request.method != 'GET':
+        return _error(f'Method "{request.method}" not allowed.', 405)
+    user, error = await _api_user(request)
+    if error:
+        return error
+    actor = await sync_to_async(actor_for)(user)
+    complaints = stats_queryset(actor, user)
+    months = stats_month_querysets(complaints)
+
+    stats, resolved, month_counts = await asyncio.gather(
+        _counts(stats_count_querysets(complaints)),
+        _listed(resolved_time_pairs(complaints)),
+        asyncio.gather(*(queryset.acount() for _, queryset in months)),
+    )
+    avg_resolution_time = average_resolution_time(resolved)
+    if avg_resolution_time is not None:
+        stats['avg_resolution_time'] = avg_resolution_time
+    stats['complaints_by_month'] = {month: count for (month, _), count in zip(months, month_counts)}
+
+    return _json(ComplaintStatsSerializer(stats).data)
+
+
+async def notification_list(request):
+    """The user's notifications, paginated like the API's PageNumberPagination"""
+    if request.method != 'GET':
+        return _error(f'Method "{request.method}" not allowed.', 405)
+    user, error = await _api_user(request)
+    if error:
+        return error
+
+    notifications = Notification.objects.filter(user=user).order_by('-created_at', '-id')
+    paginator = Paginator(notifications, api_settings.PAGE_SIZE)
+    paginator.count = await notifications.acount()
+    try:
+        page = paginator.page(request.GET.get('page', 1))
+    except Exception:
+        return _error('Invalid page.', 404)
+    results = await _listed(page.object_list)
+
+    url = request.build_absolute_uri()
+    previous = None
+    if page.has_previous():
+        number = page.previous_page_number()
+        previous = remove_query_param(url, 'page') if number == 1 else replace_query_param(url, 'page', number)
+    return _json({
+        'count': paginator.count,
+        'next': replace_query_param(url, 'page', page.next_page_number()) if page.has_next() else None,
+        'previous': previous,
+        'results': NotificationSerializer(results, many=True).data,
+    })
@@ -0,0 +1,147 @@
+"""
+Streaming delivery of protected attachments
+
+Views check permissions, then hand the file to ``serve_attachment`` which:
+- answers conditional requests (ETag / Last-Modified) with 304
+- honours single ``Range: bytes=`` requests with 206 partial content
+- streams from disk in blocks (never buffering the whole file), or
+- hands off to the web server with X-Accel-Redirect (nginx) / X-Sendfile
+  (Apache, lighttpd) when ATTACHMENT_SENDFILE_BACKEND is set
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from .storage import CHUNK_SIZE, attachment_storage
+from .thumbnails import get_thumbnail_sizes, thumbnail_name
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) for a single byte range, or None to send the whole
+    file (no/unsupported/multi-range header). Raises ValueError when the
+    range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if start >= size:
+        raise ValueError("Range starts past end of file")
+    end = int(last) if last else size - 1
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_matches(request, etag, last_modified):
+    """True when there is no If-Range header or it still matches the file"""
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        return value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+def iter_file_range(path, start, length):
+    with open(path, 'rb') as source:
+        source.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = source.read(min(CHUNK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def sendfile_response(name, path, content_type):
+    backend = getattr(settings, 'ATTACHMENT_SENDFILE_BACKEND', None)
+    response = HttpResponse(content_type=content_type)
+    if backend == 'nginx':
+        prefix = getattr(settings, 'ATTACHMENT_SENDFILE_URL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(name)
+    elif backend in ('apache', 'lighttpd'):
+        response['X-Sendfile'] = path
+    else:
+        raise ImproperlyConfigured(
+            f"Unknown ATTACHMENT_SENDFILE_BACKEND {backend!r}; use 'nginx', 'apache' or 'lighttpd'"
+        )
+    return response
+
+
+def serve_attachment(request, name, size=None):
+    """Stream an attachment (or one of its thumbnails) the caller may see"""
+    storage = attachment_storage()
+    if size:
+        if size not in get_thumbnail_sizes():
+            raise Http404("Unknown thumbnail size")
+        name = thumbnail_name(name, size)
+    if not storage.exists(name):
+        raise Http404("Attachment not found")
+
+    path = storage.path(name)
+    stat = os.stat(path)
+    last_modified = int(stat.st_mtime)
+    etag = f'"{os.path.basename(name)}-{stat.st_size:x}-{last_modified:x}"'
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    as_attachment = not (content_type.startswith('image/') or content_type == 'application/pdf')
+
+    if getattr(settings, 'ATTACHMENT_SENDFILE_BACKEND', None):
+        # The web server handles Range itself
+        response = sendfile_response(name, path, content_type)
+    else:
+        byte_range = None
+        range_header = request.headers.get('Range')
+        if range_header and if_range_matches(request, etag, last_modified):
+            try:
+                byte_range = parse_range(range_header, stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{stat.st_size}'
+                return response
+
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                iter_file_range(path, start, length), status=206, content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(length)
+        else:
+            # FileResponse uses wsgi.file_wrapper (sendfile) when available
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    response['Content-Disposition'] = content_disposition_header(as_attachment, os.path.basename(name))
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, max_age=3600)
+    return response
@@ -0,0 +1,262 @@
+"""
+Streaming backups: one NDJSON file per model (backup_stream, restore_stream)
+
+dumpdata/loaddata build the whole object graph in memory. Here each model
+is written in primary-key order from a chunked ``iterator()``, one JSON
+array of column values per line. A restore reads the lines back in chunks
+and inserts them with bulk_create. Both use constant memory whatever the
+table sizes.
+
+A backup directory holds ``manifest.json`` (models, columns, row counts)
+and one ``<app_label>.<model>.ndjson[.gz]`` file per model. Many-to-many
+tables are backed up as their own models.
+
+Dumps run in one transaction, so all files come from one snapshot. A
+restore runs in one transaction with foreign-key checks deferred, like
+loaddata, and checks every constraint once at the end.
+"""
+import base64
+import datetime
+import decimal
+import gzip
+import json
+import os
+import uuid
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connections, models, reset_queries, router, transaction
+from django.utils import timezone
+from django.utils.duration import duration_iso_string
+
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+CHUNK_SIZE = 2000
+
+
+class BackupError(Exception):
+    pass
+
+
+# =========================
+# Models
+# =========================
+def backup_models(labels=(), exclude=()):
+    """
+    Concrete models to back up, by app label or ``app_label.Model``.
+    Auto-created many-to-many tables follow the model that declares them.
+    """
+    labels = {label.lower() for label in labels}
+    exclude = {label.lower() for label in exclude}
+
+    def matches(model, wanted):
+        owner = model._meta.auto_created or model
+        return bool({
+            model._meta.app_label, model._meta.label_lower, owner._meta.label_lower
+        } & wanted)
+
+    selected = []
+    for model in apps.get_models(include_auto_created=True):
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        if labels and not matches(model, labels):
+            continue
+        if exclude and matches(model, exclude):
+            continue
+        selected.append(model)
+    return selected
+
+
+def _columns(model):
+    return list(model._meta.concrete_fields)
+
+
+def _file_name(model, compress):
+    return f"{model._meta.label_lower}.ndjson" + ('.gz' if compress else '')
+
+
+def _open(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='\n')
+    return open(path, mode, encoding='utf-8', newline='\n')
+
+
+# =========================
+# Dump
+# =========================
+def _json_default(value):
+    # Full precision (DjangoJSONEncoder drops microseconds past milliseconds)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return duration_iso_string(value)
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dump_model(model, path, chunk_size=CHUNK_SIZE):
+    """Write ``model``'s rows to ``path`` in pk order; returns the row count"""
+    columns = _columns(model)
+    binary = [i for i, field in enumerate(columns) if isinstance(field, models.BinaryField)]
+    rows = model._base_manager.using(router.db_for_read(model)).order_by('pk').values_list(
+        *[field.attname for field in columns]
+    )
+    encode = json.JSONEncoder(
+        default=_json_default, ensure_ascii=False, separators=(',', ':')
+    ).encode
+
+    count = 0
+    with _open(path, 'w') as stream:
+        for row in rows.iterator(chunk_size=chunk_size):
+            if binary:
+                row = list(row)
+                for i in binary:
+                    if row[i] is not None:
+                        row[i] = base64.b64encode(bytes(row[i])).decode()
+            stream.write(encode(row))
+            stream.write('\n')
+            count += 1
+    return count
+
+
+def dump(directory, model_list, compress=False, chunk_size=CHUNK_SIZE, progress=None):
+    """Back up ``model_list`` into ``directory``; returns the manifest"""
+    os.makedirs(directory, exist_ok=True)
+    manifest = {
+        'format': FORMAT_VERSION,
+        'created_at': timezone.now().isoformat(),
+        'models': [],
+    }
+    # One read transaction: every file sees the same snapshot
+    with transaction.atomic():
+        for model in model_list:
+            name = _file_name(model, compress)
+            count = dump_model(model, os.path.join(directory, name), chunk_size)
+            manifest['models'].append({
+                'model': model._meta.label_lower,
+                'file': name,
+                'columns': [field.attname for field in _columns(model)],
+                'count': count,
+            })
+            if progress:
+                progress(model, count)
+
+    # Written last: a directory without a manifest is an incomplete backup
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as stream:
+        json.dump(manifest, stream, indent=2)
+    return manifest
+
+
+# =========================
+# Restore
+# =========================
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.isfile(path):
+        raise BackupError(f"{path} not found; the backup is missing or incomplete.")
+    with open(path, encoding='utf-8') as stream:
+        manifest = json.load(stream)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise BackupError(f"Unsupported backup format {manifest.get('format')!r}.")
+    return manifest
+
+
+def _entries(manifest):
+    """(model, manifest entry, column fields) for each model in the backup"""
+    entries = []
+    for entry in manifest['models']:
+        try:
+            model = apps.get_model(entry['model'])
+        except LookupError:
+            raise BackupError(f"Unknown model {entry['model']} in the backup.")
+        fields = {field.attname: field for field in _columns(model)}
+        missing = [name for name in entry['columns'] if name not in fields]
+        if missing:
+            raise BackupError(f"{entry['model']} has no column(s) {', '.join(missing)}; migrate first.")
+        entries.append((model, entry, [fields[name] for name in entry['columns']]))
+    return entries
+
+
+@contextmanager
+def _stored_timestamps(model):
+    """Let bulk_create keep auto_now/auto_now_add values instead of stamping now()"""
+    fields = [field for field in model._meta.concrete_fields if isinstance(field, (models.DateField, models.TimeField))]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def load_model(model, path, fields, chunk_size=CHUNK_SIZE, using='default'):
+    """Insert the rows of one NDJSON file with bulk_create; returns the row count"""
+    names = [field.attname for field in fields]
+    to_python = [field.to_python for field in fields]
+    manager = model._base_manager.using(using)
+
+    count = 0
+    chunk = []
+    with _open(path, 'r') as stream, _stored_timestamps(model):
+        for line in stream:
+            values = json.loads(line)
+            chunk.append(model(**{
+                name: convert(value) if value is not None else None
+                for name, convert, value in zip(names, to_python, values)
+            }))
+            if len(chunk) == chunk_size:
+                manager.bulk_create(chunk)
+                count += len(chunk)
+                chunk = []
+                # With DEBUG on, the logged INSERTs would otherwise pile up
+                reset_queries()
+        if chunk:
+            manager.bulk_create(chunk)
+            count += len(chunk)
+    return count
+
+
+def restore(directory, replace=False, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Restore a backup made by dump(). Tables in the backup must be empty
+    unless ``replace`` is set, in which case they are emptied first.
+    Returns {label: rows}.
+    """
+    manifest = read_manifest(directory)
+    entries = _entries(manifest)
+    using = router.db_for_write(entries[0][0]) if entries else 'default'
+    connection = connections[using]
+    model_list = [model for model, _, _ in entries]
+    tables = [model._meta.db_table for model in model_list]
+
+    restored = {}
+    with transaction.atomic(using=using):
+        if replace:
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sql_flush(no_style(), tables):
+                    cursor.execute(sql)
+        else:
+            occupied = [model._meta.label for model in model_list if model._base_manager.using(using).exists()]
+            if occupied:
+                raise BackupError(f"Not empty: {', '.join(occupied)}. Use --replace to overwrite them.")
+
+        with connection.constraint_checks_disabled():
+            for model, entry, fields in entries:
+                count = load_model(model, os.path.join(directory, entry['file']), fields, chunk_size, using)
+                if count != entry['count']:
+                    raise BackupError(f"{entry['file']} has {count} rows, the manifest says {entry['count']}.")
+                restored[model._meta.label] = count
+                if progress:
+                    progress(model, count)
+
+        # Rows removed by --replace may still be referenced from other tables
+        connection.check_constraints(table_names=None if replace else tables)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), model_list):
+                cursor.execute(sql)
+    return restored
@@ -0,0 +1,150 @@
+"""
+Set-based bulk operations on complaints
+
+Each operation reads only the columns it needs, applies the change with a
+single UPDATE, and writes history and notifications with bulk_create, all
+in one transaction. Callers get a per-item result list back.
+"""
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .analytics import bump_data_version
+from .assignment import workload_index
+from .changes import record_changes
+from .models import Complaint, ComplaintHistory, Notification
+from .workload import refresh_workloads_on_commit
+
+
+BATCH_SIZE = 500
+
+# Per-item outcomes
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+FORBIDDEN = 'forbidden'
+NOT_FOUND = 'not_found'
+
+# Filters accepted instead of an explicit id list
+BULK_FILTER_FIELDS = ['status', 'priority', 'category', 'subcategory', 'assigned_to', 'user']
+
+
+def select_complaints(queryset, ids=None, filters=None):
+    """Narrow an already role-filtered queryset by ids or whitelisted filters"""
+    if ids:
+        return queryset.filter(pk__in=ids)
+    lookups = {key: value for key, value in (filters or {}).items() if key in BULK_FILTER_FIELDS}
+    return queryset.filter(**lookups)
+
+
+def _missing(ids, rows):
+    found = {row['id'] for row in rows}
+    return [{'id': pk, 'result': NOT_FOUND} for pk in (ids or []) if pk not in found]
+
+
+def bulk_update_status(user, queryset, new_status, remarks='', ids=None, can_update=None):
+    """
+    Move every selected complaint to ``new_status``.
+    ``can_update(user, row)`` decides per complaint; by default staff or the
+    assigned faculty member may change status.
+    """
+    if can_update is None:
+        def can_update(user, row):
+            return user.is_staff or row['assigned_to_id'] == user.id
+
+    status_label = dict(Complaint.STATUS_CHOICES).get(new_status, new_status)
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = list(queryset.values('id', 'complaint_no', 'status', 'user_id', 'assigned_to_id'))
+        results = _missing(ids, rows)
+        changed = []
+        for row in rows:
+            if not can_update(user, row):
+                outcome = FORBIDDEN
+            elif row['status'] == new_status:
+                outcome = UNCHANGED
+            else:
+                outcome = UPDATED
+                changed.append(row)
+            results.append({'id': row['id'], 'complaint_no': row['complaint_no'], 'result': outcome})
+
+        if changed:
+            update = {'status': new_status, 'updated_at': now}
+            if new_status == 'RESOLVED':
+                update['resolved_at'] = Coalesce('resolved_at', Value(now))
+            Complaint.objects.filter(pk__in=[row['id'] for row in changed]).update(**update)
+            record_changes(Complaint, [row['id'] for row in changed])
+            transaction.on_commit(workload_index.invalidate)
+            transaction.on_commit(bump_data_version)
+            refresh_workloads_on_commit(row['assigned_to_id'] for row in changed)
+
+            history = ComplaintHistory.objects.bulk_create([
+                ComplaintHistory(
+                    complaint_id=row['id'],
+                    changed_by=user,
+                    from_status=row['status'],
+                    to_status=new_status,
+                    remarks=remarks or f"Status updated to {status_label}",
+                )
+                for row in changed
+            ], batch_size=BATCH_SIZE)
+
+            notifications = Notification.objects.bulk_create([
+                Notification(
+                    user_id=row['user_id'],
+                    message=f"Complaint {row['complaint_no']} status updated to {status_label}",
+                )
+                for row in changed
+            ], batch_size=BATCH_SIZE)
+            record_changes(ComplaintHistory, [entry.pk for entry in history])
+            record_changes(Notification, [notification.pk for notification in notifications])
+
+    return {'updated': len(changed), 'results': results}
+
+
+def bulk_assign(user, queryset, faculty, remarks='', ids=None):
+    """Assign every selected complaint to ``faculty``"""
+    faculty_name = faculty.get_full_name() or faculty.username
+
+    with transaction.atomic():
+        rows = list(queryset.values('id', 'complaint_no', 'status', 'assigned_to_id'))
+        results = _missing(ids, rows)
+        changed = []
+        for row in rows:
+            if row['assigned_to_id'] == faculty.id:
+                outcome = UNCHANGED
+            else:
+                outcome = UPDATED
+                changed.append(row)
+            results.append({'id': row['id'], 'complaint_no': row['complaint_no'], 'result': outcome})
+
+        if changed:
+            Complaint.objects.filter(pk__in=[row['id'] for row in changed]).update(assigned_to=faculty, updated_at=timezone.now())
+            record_changes(Complaint, [row['id'] for row in changed])
+            transaction.on_commit(workload_index.invalidate)
+            transaction.on_commit(bump_data_version)
+            refresh_workloads_on_commit([faculty.id] + [row['assigned_to_id'] for row in changed])
+
+            history = ComplaintHistory.objects.bulk_create([
+                ComplaintHistory(
+                    complaint_id=row['id'],
+                    changed_by=user,
+                    from_status=row['status'],
+                    to_status=row['status'],
+                    remarks=f"Assigned to {faculty_name}. {remarks}".strip(),
+                )
+                for row in changed
+            ], batch_size=BATCH_SIZE)
+
+            notifications = Notification.objects.bulk_create([
+                Notification(
+                    user=faculty,
+                    message=f"You have been assigned complaint {row['complaint_no']}",
+                )
+                for row in changed
+            ], batch_size=BATCH_SIZE)
+            record_changes(ComplaintHistory, [entry.pk for entry in history])
+            record_changes(Notification, [notification.pk for notification in notifications])
+
+    return {'updated': len(changed), 'results': results}
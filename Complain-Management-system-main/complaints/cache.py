@@ -0,0 +1,290 @@
+"""
+Shared SQLite cache backend
+
+Every gunicorn worker on the host opens the same cache file, so cached
+stats, sessions and counters are shared and invalidation is seen by all
+workers. No Redis needed.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'complaints.cache.SQLiteCache',
+            'LOCATION': BASE_DIR / 'cache.sqlite3',
+            'OPTIONS': {'MAX_ENTRIES': 10000, 'CULL_FREQUENCY': 4},
+        }
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+from .db import apply_sqlite_pragmas
+
+
+CACHE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 64 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Only bump the LRU clock on reads when it is older than this (seconds),
+# so hot keys don't turn every get() into a write.
+TOUCH_RESOLUTION = 1.0
+
+# SQLite INTEGER is a signed 64-bit value
+INT_MIN, INT_MAX = -(1 << 63), (1 << 63) - 1
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cross-process cache stored in a single SQLite file.
+    - TTLs are stored as absolute expiry times
+    - LRU eviction by last access time once MAX_ENTRIES is exceeded
+    - incr()/decr() are atomic across processes (BEGIN IMMEDIATE)
+    - transform() is an atomic read-modify-write in one transaction
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        self._local = threading.local()
+
+    # =========================
+    # Connection handling
+    # =========================
+    def _connection(self):
+        # One connection per thread, re-opened after fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=5, isolation_level=None)
+            apply_sqlite_pragmas(conn.cursor(), CACHE_PRAGMAS)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "key TEXT PRIMARY KEY, value BLOB, expires REAL, accessed REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self, **kwargs):
+        # Connections are long-lived per thread; nothing to do per request
+        pass
+
+    # =========================
+    # Encoding
+    # =========================
+    @staticmethod
+    def _encode(value):
+        # Plain ints that fit in an INTEGER column are stored natively;
+        # everything else (including larger ints) is pickled
+        if type(value) is int and INT_MIN <= value <= INT_MAX:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, bytes):
+            return pickle.loads(value)
+        return value
+
+    # =========================
+    # Cache API
+    # =========================
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires, accessed FROM cache_entry WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        value, expires, accessed = row
+        if expires is not None and expires <= now:
+            conn.execute(
+                "DELETE FROM cache_entry WHERE key = ? AND expires <= ?", (key, now)
+            )
+            return default
+        if now - accessed > TOUCH_RESOLUTION:
+            conn.execute(
+                "UPDATE cache_entry SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return self._decode(value)
+
+    def get_many(self, keys, version=None):
+        key_map = {
+            self.make_and_validate_key(key, version=version): key for key in keys
+        }
+        if not key_map:
+            return {}
+        now = time.time()
+        placeholders = ','.join('?' * len(key_map))
+        rows = self._connection().execute(
+            f"SELECT key, value FROM cache_entry WHERE key IN ({placeholders}) "
+            f"AND (expires IS NULL OR expires > ?)",
+            (*key_map, now),
+        ).fetchall()
+        return {key_map[key]: self._decode(value) for key, value in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._write(key, value, timeout, replace=True)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._write(key, value, timeout, replace=False)
+
+    def _write(self, key, value, timeout, replace):
+        conn = self._connection()
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, self._encode(value), expires, now),
+                )
+                written = True
+            else:
+                conn.execute(
+                    "DELETE FROM cache_entry WHERE key = ? AND expires <= ?", (key, now)
+                )
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO cache_entry (key, value, expires, accessed) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, self._encode(value), expires, now),
+                )
+                written = cursor.rowcount == 1
+            if written:
+                self._cull(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return written
+
+    def _cull(self, conn, now):
+        count = conn.execute("SELECT COUNT(*) FROM cache_entry").fetchone()[0]
+        if count <= self._max_entries:
+            return
+        conn.execute("DELETE FROM cache_entry WHERE expires <= ?", (now,))
+        count = conn.execute("SELECT COUNT(*) FROM cache_entry").fetchone()[0]
+        if count <= self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            conn.execute("DELETE FROM cache_entry")
+            return
+        # Evict the least recently used fraction
+        conn.execute(
+            "DELETE FROM cache_entry WHERE key IN ("
+            "SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)",
+            (max(count // self._cull_frequency, count - self._max_entries),),
+        )
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE cache_entry SET expires = ?, accessed = ? "
+            "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self.get_backend_timeout(timeout), now, key, now),
+        )
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM cache_entry "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            value = self._decode(row[0])
+            if type(value) is not int:
+                raise TypeError("Cannot increment non-integer value for key '%s'" % key)
+            new_value = value + delta
+            conn.execute(
+                "UPDATE cache_entry SET value = ?, accessed = ? WHERE key = ?",
+                (self._encode(new_value), now, key),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return new_value
+
+    def transform(self, key, func, version=None):
+        """
+        Atomically apply ``func`` to the current value (None if missing or
+        expired). ``func`` returns (new value, timeout, result); a new value
+        of None leaves the entry as it is. Returns ``result``.
+        """
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM cache_entry "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, now),
+            ).fetchone()
+            new_value, timeout, result = func(self._decode(row[0]) if row else None)
+            if new_value is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, self._encode(new_value), self.get_backend_timeout(timeout), now),
+                )
+                if row is None:
+                    self._cull(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            "DELETE FROM cache_entry WHERE key = ?", (key,)
+        )
+        return cursor.rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if not keys:
+            return
+        placeholders = ','.join('?' * len(keys))
+        self._connection().execute(
+            f"DELETE FROM cache_entry WHERE key IN ({placeholders})", keys
+        )
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            "SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entry")
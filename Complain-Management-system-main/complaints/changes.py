@@ -0,0 +1,184 @@
+"""
+Change feed for incremental sync (/api/changes/?since=<cursor>)
+
+Every write to a complaint, history entry, feedback or notification
+appends a ChangeLog row in the same transaction: post_save/post_delete
+receivers cover save() and delete(), and the set-based paths (bulk
+actions, SLA escalation, imports, merges) call record_changes() for the
+rows they touch. The log id is the cursor. A consumer asks for entries
+after the last id it saw and gets the current state of those rows, read
+with one ``pk IN (...)`` query per kind. Pages are keysets on the log id,
+so a page costs the same however long the log is.
+
+SQLite has a single writer, so log ids are assigned in commit order. On
+PostgreSQL a transaction can commit after a later id is already visible.
+Consumers there should trail the head of the feed a little.
+
+prune_change_log keeps the log bounded. Among entries older than
+CHANGE_FEED_RETENTION_DAYS it deletes the ones superseded by a later entry
+for the same object, which loses nothing, and delete entries. So since=0
+is still a full snapshot of the live rows. A consumer more than the
+retention period behind could have missed a pruned delete, so its cursor
+is refused (cursor_expired()) and it must resync from since=0.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import ChangeLog, Complaint, ComplaintHistory, Feedback, Notification
+
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+FEED_MODELS = {
+    'complaint': Complaint,
+    'history': ComplaintHistory,
+    'feedback': Feedback,
+    'notification': Notification,
+}
+KINDS = {model: kind for kind, model in FEED_MODELS.items()}
+
+
+def page_size():
+    return getattr(settings, 'CHANGE_FEED_PAGE_SIZE', 500)
+
+
+def max_page_size():
+    return getattr(settings, 'CHANGE_FEED_MAX_PAGE_SIZE', 5000)
+
+
+def retention_days():
+    return getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 30)
+
+
+def retention_horizon(days=None):
+    return timezone.now() - timedelta(days=retention_days() if days is None else days)
+
+
+# =========================
+# Recording
+# =========================
+def record_changes(model, ids, action=UPSERT):
+    """Log writes that bypass save()/delete() (update(), bulk_create())"""
+    ChangeLog.objects.bulk_create([
+        ChangeLog(kind=KINDS[model], object_id=pk, action=action) for pk in ids
+    ], batch_size=1000)
+
+
+def change_saved(sender, instance, **kwargs):
+    ChangeLog.objects.create(kind=KINDS[sender], object_id=instance.pk)
+
+
+def change_deleted(sender, instance, **kwargs):
+    ChangeLog.objects.create(kind=KINDS[sender], object_id=instance.pk, action=DELETE)
+
+
+# =========================
+# Reading
+# =========================
+def _rows(model, ids):
+    """{pk: row} with every column, for the rows of ``ids`` that still exist"""
+    columns = [field.attname for field in model._meta.concrete_fields]
+    return {row['id']: row for row in model.objects.filter(pk__in=ids).values(*columns)}
+
+
+def change_page(since=0, limit=None):
+    """
+    (changes, cursor, has_more) for log entries after ``since``.
+    An object changed several times in the page appears once, at its
+    latest entry, with its current row.
+    """
+    limit = limit or page_size()
+    entries = list(
+        ChangeLog.objects.filter(pk__gt=since).order_by('pk')
+        .values_list('pk', 'kind', 'object_id', 'action')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for seq, kind, object_id, action in entries:
+        latest[(kind, object_id)] = (seq, action)
+
+    rows = {}
+    for kind, model in FEED_MODELS.items():
+        ids = [object_id for (entry_kind, object_id), (_, action) in latest.items()
+               if entry_kind == kind and action == UPSERT]
+        if ids:
+            rows[kind] = _rows(model, ids)
+
+    changes = []
+    for (kind, object_id), (seq, action) in sorted(latest.items(), key=lambda item: item[1][0]):
+        data = rows.get(kind, {}).get(object_id) if action == UPSERT else None
+        changes.append({
+            'seq': seq,
+            'type': kind,
+            'id': object_id,
+            # Deleted since it was logged (a later page has the delete entry)
+            'action': action if action == DELETE or data is not None else DELETE,
+            'data': data,
+        })
+    cursor = entries[-1][0] if entries else since
+    return changes, cursor, has_more
+
+
+def cursor_expired(since):
+    """
+    Whether entries after ``since`` may have been pruned. Pruning keeps the
+    newest entry it looked at, so any cursor from before a prune has an
+    entry older than the horizon after it.
+    """
+    if not since:
+        return False
+    return ChangeLog.objects.filter(pk__gt=since, created_at__lt=retention_horizon()).exists()
+
+
+def iter_changes(since=0, chunk_size=None):
+    """Every change after ``since``, one keyset page at a time (for streaming)"""
+    while True:
+        # Each page reads the log and the rows from one snapshot
+        with transaction.atomic():
+            changes, since, has_more = change_page(since, chunk_size)
+        yield from changes
+        if not has_more:
+            return
+
+
+# =========================
+# Retention
+# =========================
+def prune_change_log(days=None, batch_size=5000, dry_run=False):
+    """
+    Delete superseded and delete entries older than the retention horizon;
+    returns the number of entries removed (or that would be, with dry_run)
+    """
+    last = (
+        ChangeLog.objects.filter(created_at__lt=retention_horizon(days))
+        .order_by('-pk').values_list('pk', flat=True).first()
+    )
+    if last is None:
+        return 0
+
+    superseded = ChangeLog.objects.filter(
+        kind=OuterRef('kind'), object_id=OuterRef('object_id'), pk__gt=OuterRef('pk')
+    )
+    removed = 0
+    start = 0
+    # The newest old entry is kept: cursor_expired() relies on it
+    while start < last:
+        end = min(start + batch_size, last)
+        batch = ChangeLog.objects.filter(pk__gt=start, pk__lt=last, pk__lte=end).filter(
+            Exists(superseded) | Q(action=DELETE)
+        )
+        if dry_run:
+            removed += batch.count()
+        else:
+            with transaction.atomic():
+                removed += batch.delete()[0]
+        start = end
+    return removed
+
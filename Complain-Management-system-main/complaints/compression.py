@@ -0,0 +1,142 @@
+"""
+Negotiated response compression (zstd, brotli, gzip)
+
+CompressionMiddleware picks the best encoding the client accepts from
+COMPRESSION_ENCODINGS (server preference order). zstd and brotli are used
+only when the ``zstandard`` / ``brotli`` packages are installed; gzip is
+always available.
+
+Skipped:
+- streaming responses (attachments, CSV exports)
+- responses that already carry a Content-Encoding
+- bodies smaller than COMPRESSION_MIN_SIZE
+- content types that are already compressed (images, archives, PDFs)
+
+CSRF tokens in compressed HTML are masked per response by Django, which
+keeps them safe from BREACH-style length probing.
+"""
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/x-ndjson',
+    'image/svg+xml',
+)
+
+_ACCEPT_ENCODING_RE = _lazy_re_compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _brotli(data):
+    # Quality 5 is the usual trade-off for dynamic responses (11 is for static files)
+    return brotli.compress(data, quality=5)
+
+
+def _zstd(data):
+    return zstandard.ZstdCompressor(level=3).compress(data)
+
+
+def available_encoders():
+    encoders = {'gzip': _gzip}
+    if brotli is not None:
+        encoders['br'] = _brotli
+    if zstandard is not None:
+        encoders['zstd'] = _zstd
+    return encoders
+
+
+def compression_encodings():
+    return getattr(settings, 'COMPRESSION_ENCODINGS', ('zstd', 'br', 'gzip'))
+
+
+def compression_min_size():
+    return getattr(settings, 'COMPRESSION_MIN_SIZE', 500)
+
+
+def accepted_encodings(header):
+    """Encodings with q > 0 from an Accept-Encoding header (``*`` included)"""
+    accepted = set()
+    for part in header.split(','):
+        match = _ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        name, quality = match.group(1).lower(), match.group(2)
+        try:
+            if quality is not None and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name)
+    return accepted
+
+
+def negotiate_encoding(header, encoders=None):
+    """Best server-preferred encoding the client accepts, or None"""
+    encoders = encoders if encoders is not None else available_encoders()
+    accepted = accepted_encodings(header or '')
+    for name in compression_encodings():
+        if name in encoders and (name in accepted or '*' in accepted):
+            return name
+    return None
+
+
+def is_compressible(content_type):
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Place near the top of MIDDLEWARE so it runs after the body is final."""
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.encoders = available_encoders()
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not is_compressible(response.get('Content-Type')):
+            return response
+        # Whatever happens next, the response depends on Accept-Encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < compression_min_size():
+            return response
+
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.encoders)
+        if encoding is None:
+            return response
+
+        compressed = self.encoders[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # The representation changed, so a strong ETag must become weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,76 @@
+"""
+Database connection tuning
+"""
+from django.conf import settings
+from django.db import DatabaseError, connections, router
+
+
+# =========================
+# SQLite connection profile
+# =========================
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+
+def get_sqlite_pragmas():
+    """Return the PRAGMA profile applied to every new SQLite connection"""
+    return getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+
+
+def apply_sqlite_pragmas(cursor, pragmas):
+    """Run ``PRAGMA name=value`` for each entry on a DB-API cursor"""
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    connection_created receiver.
+    WAL lets readers run alongside the single writer, and busy_timeout
+    makes concurrent writers wait instead of failing with "database is locked".
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        apply_sqlite_pragmas(cursor, get_sqlite_pragmas())
+
+
+# =========================
+# Row count estimates
+# =========================
+def estimated_row_count(model):
+    """
+    Cheap table size estimate from planner statistics, or None.
+    PostgreSQL reads pg_class.reltuples; SQLite reads sqlite_stat1 (written by
+    ANALYZE) and falls back to MAX(rowid).
+    """
+    connection = connections[router.db_for_read(model)]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] >= 0 else None
+            if connection.vendor == 'sqlite':
+                try:
+                    cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                    row = cursor.fetchone()
+                except DatabaseError:
+                    row = None
+                if row:
+                    return int(row[0].split()[0])
+                cursor.execute(f'SELECT MAX(rowid) FROM "{table}"')
+                row = cursor.fetchone()
+                return int(row[0] or 0)
+    except DatabaseError:
+        return None
+    return None
@@ -0,0 +1,261 @@
+"""
+Near-duplicate complaint detection with MinHash + LSH
+
+Each complaint's title + description is reduced to character 5-gram
+shingles and a 64-value MinHash signature (ComplaintFingerprint). The
+signature is split into 16 bands of 4 values. Each band is hashed into a
+ComplaintLSHBucket row.
+
+A lookup hashes the new text the same way and fetches complaints that
+share any bucket with one indexed ``bucket IN (...)`` query. Only those
+candidates are scored. The cost depends on the number of near matches,
+not on the number of complaints. With 16x4 bands, pairs with Jaccard
+similarity above ~0.5 are found with high probability.
+"""
+import hashlib
+import random
+import re
+import struct
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from .assignment import OPEN_STATUSES
+from .changes import record_changes
+from .models import (
+    Complaint, ComplaintFingerprint, ComplaintHistory, ComplaintLSHBucket, Notification
+)
+
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+MAX_TEXT_LENGTH = 4000
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed: stored signatures must stay comparable across processes and releases
+_rng = random.Random(0x5EED)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def duplicate_threshold():
+    return getattr(settings, 'DUPLICATE_SIMILARITY_THRESHOLD', 0.5)
+
+
+def max_candidates():
+    return getattr(settings, 'DUPLICATE_MAX_CANDIDATES', 200)
+
+
+# =========================
+# Signatures
+# =========================
+def shingles(title, description):
+    text = _NON_WORD.sub(' ', f"{title} {description}".lower()).strip()[:MAX_TEXT_LENGTH]
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(title, description):
+    """64-value MinHash signature, or None for empty text"""
+    hashes = [zlib.crc32(shingle.encode()) for shingle in shingles(title, description)]
+    if not hashes:
+        return None
+    return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS]
+
+
+def pack_signature(signature):
+    return struct.pack(f'<{NUM_PERM}Q', *signature)
+
+
+def unpack_signature(data):
+    return struct.unpack(f'<{NUM_PERM}Q', bytes(data))
+
+
+def band_buckets(signature):
+    """One signed 64-bit hash per band, tagged with the band number"""
+    buckets = []
+    for band in range(BANDS):
+        values = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(struct.pack(f'<H{ROWS}Q', band, *values), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERM
+
+
+# =========================
+# Index maintenance
+# =========================
+def index_complaint(complaint):
+    """(Re)write a complaint's fingerprint and LSH buckets"""
+    signature = minhash(complaint.title, complaint.description)
+    with transaction.atomic():
+        ComplaintLSHBucket.objects.filter(complaint=complaint).delete()
+        if signature is None:
+            ComplaintFingerprint.objects.filter(complaint=complaint).delete()
+            return None
+        ComplaintFingerprint.objects.update_or_create(
+            complaint=complaint, defaults={'signature': pack_signature(signature)}
+        )
+        ComplaintLSHBucket.objects.bulk_create([
+            ComplaintLSHBucket(complaint=complaint, bucket=bucket)
+            for bucket in band_buckets(signature)
+        ])
+    return signature
+
+
+def index_objects(rows):
+    """
+    Unsaved (fingerprints, buckets) for ``(pk, title, description)`` rows
+    that have no index yet, for bulk_create
+    """
+    fingerprints = []
+    buckets = []
+    for pk, title, description in rows:
+        signature = minhash(title, description)
+        if signature is None:
+            continue
+        fingerprints.append(ComplaintFingerprint(complaint_id=pk, signature=pack_signature(signature)))
+        buckets.extend(ComplaintLSHBucket(complaint_id=pk, bucket=bucket) for bucket in band_buckets(signature))
+    return fingerprints, buckets
+
+
+def find_duplicates(title, description, exclude=None, limit=5):
+    """
+    Open, unmerged complaints similar to the given text, best first.
+    Returns a list of (complaint, similarity).
+    """
+    return find_similar(minhash(title, description), exclude=exclude, limit=limit)
+
+
+def find_similar(signature, exclude=None, limit=5):
+    """find_duplicates for an already computed signature"""
+    if signature is None:
+        return []
+
+    # Closed complaints keep their buckets, so filter them out before the
+    # cap, and take the candidates sharing the most bands first
+    candidates = ComplaintLSHBucket.objects.filter(
+        bucket__in=band_buckets(signature),
+        complaint__status__in=OPEN_STATUSES,
+        complaint__duplicate_of__isnull=True,
+    )
+    if exclude:
+        candidates = candidates.exclude(complaint_id=exclude)
+    candidate_ids = list(
+        candidates.values('complaint_id').annotate(bands=Count('id'))
+        .order_by('-bands', '-complaint_id')
+        .values_list('complaint_id', flat=True)[:max_candidates()]
+    )
+    if not candidate_ids:
+        return []
+
+    fingerprints = ComplaintFingerprint.objects.filter(
+        complaint_id__in=candidate_ids
+    ).values_list('complaint_id', 'signature')
+
+    threshold = duplicate_threshold()
+    scored = sorted(
+        ((similarity(signature, unpack_signature(data)), complaint_id) for complaint_id, data in fingerprints),
+        reverse=True
+    )
+    matches = [(score, complaint_id) for score, complaint_id in scored if score >= threshold][:limit]
+
+    complaints = Complaint.objects.in_bulk([complaint_id for _, complaint_id in matches])
+    return [(complaints[complaint_id], score) for score, complaint_id in matches if complaint_id in complaints]
+
+
+def duplicates_for(complaint, limit=5):
+    """
+    Duplicates of a saved complaint, scored with its stored fingerprint.
+    The MinHash is only computed when the complaint has none.
+    """
+    data = ComplaintFingerprint.objects.filter(complaint_id=complaint.pk).values_list('signature', flat=True).first()
+    if data is None:
+        return find_duplicates(complaint.title, complaint.description, exclude=complaint.pk, limit=limit)
+    return find_similar(unpack_signature(data), exclude=complaint.pk, limit=limit)
+
+
+# =========================
+# Merging
+# =========================
+def merge_complaints(duplicate, primary, user):
+    """
+    Close ``duplicate`` as a duplicate of ``primary``.
+    Raises ValueError when the merge does not make sense.
+    """
+    if duplicate.pk == primary.pk:
+        raise ValueError("A complaint cannot be merged into itself.")
+    if duplicate.status not in OPEN_STATUSES:
+        raise ValueError(f"{duplicate.complaint_no} is already closed.")
+    if primary.duplicate_of_id:
+        raise ValueError(f"{primary.complaint_no} is itself merged into another complaint.")
+
+    with transaction.atomic():
+        old_status = duplicate.status
+        duplicate.duplicate_of = primary
+        duplicate.status = 'REJECTED'
+        duplicate.save(update_fields=['duplicate_of', 'status', 'updated_at'])
+
+        history = ComplaintHistory.objects.bulk_create([
+            ComplaintHistory(
+                complaint=duplicate,
+                changed_by=user,
+                from_status=old_status,
+                to_status='REJECTED',
+                remarks=f"Merged into {primary.complaint_no} as a duplicate"
+            ),
+            ComplaintHistory(
+                complaint=primary,
+                changed_by=user,
+                from_status=primary.status,
+                to_status=primary.status,
+                remarks=f"Duplicate {duplicate.complaint_no} merged into this complaint"
+            ),
+        ])
+        record_changes(ComplaintHistory, [entry.pk for entry in history])
+        Notification.objects.create(
+            user=duplicate.user,
+            message=(
+                f"Your complaint {duplicate.complaint_no} was merged into {primary.complaint_no}, "
+                f"which tracks the same issue"
+            )
+        )
+        # Merged complaints are never duplicate candidates again
+        ComplaintLSHBucket.objects.filter(complaint=duplicate).delete()
+    return duplicate
+
+
+# =========================
+# Signal receivers
+# =========================
+def _indexed_text(instance):
+    fields = instance.__dict__
+    if 'title' not in fields or 'description' not in fields:
+        return None
+    return (instance.title, instance.description)
+
+
+def complaint_text_loaded(sender, instance, **kwargs):
+    """post_init: remember the text the index was built from"""
+    instance._indexed_text = _indexed_text(instance)
+
+
+def complaint_text_saved(sender, instance, created, **kwargs):
+    """post_save: index new complaints and re-index edited text"""
+    text = _indexed_text(instance)
+    if created or (text is not None and text != getattr(instance, '_indexed_text', None)):
+        index_complaint(instance)
+    instance._indexed_text = text
@@ -1,9 +1,10 @@
 from django import forms
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
+from django.db.models import F
 from .models import (
     UserProfile,
-    Complaint, Feedback
+    Complaint, Feedback, FacultyWorkload
 )
 from .models import UserProfile as ProfileModel
 
@@ -291,6 +292,17 @@ class FeedbackForm(forms.ModelForm):
         }
 
 
+class FacultyChoiceField(forms.ModelChoiceField):
+    """Faculty choice labelled with the member's current open load"""
+
+    def label_from_instance(self, obj):
+        try:
+            open_complaints = obj.workload.open_complaints
+        except FacultyWorkload.DoesNotExist:
+            open_complaints = 0
+        return f"{obj.get_full_name() or obj.username} ({open_complaints} open)"
+
+
 class ComplaintAssignmentForm(forms.Form):
     """Complaint assignment form"""
     def __init__(self, *args, **kwargs):
@@ -303,8 +315,12 @@ class ComplaintAssignmentForm(forms.Form):
         else:
             queryset = User.objects.filter(profile__role='faculty')
             empty_label = "Select Faculty Member"
+        # Load comes from the materialized table in the same query
+        queryset = queryset.select_related('workload').order_by(
+            F('workload__open_complaints').asc(nulls_first=True), 'username'
+        )
         
-        self.fields['assigned_to'] = forms.ModelChoiceField(
+        self.fields['assigned_to'] = FacultyChoiceField(
             queryset=queryset,
             empty_label=empty_label,
             widget=forms.Select(attrs={
@@ -0,0 +1,71 @@
+"""
+Keyset pagination for complaint history
+
+History is read newest first on (timestamp, id). A page is fetched with
+``WHERE (timestamp, id) < cursor ... LIMIT n``, so loading older entries
+costs the same however long the history is, unlike OFFSET paging.
+"""
+import base64
+
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import ComplaintHistory
+
+
+def history_page_size():
+    return getattr(settings, 'HISTORY_PAGE_SIZE', 10)
+
+
+def encode_cursor(entry):
+    """Opaque cursor pointing just past ``entry``"""
+    raw = f"{entry.timestamp.isoformat()}|{entry.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return (timestamp, id); raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, pk = raw.rsplit('|', 1)
+        parsed = parse_datetime(timestamp)
+        pk = int(pk)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid history cursor")
+    if parsed is None:
+        raise ValueError("Invalid history cursor")
+    return parsed, pk
+
+
+def history_page(complaint, cursor=None, limit=None):
+    """
+    One page of a complaint's history with ``changed_by`` joined.
+    Returns (entries, next_cursor); next_cursor is None on the last page.
+    """
+    limit = limit or history_page_size()
+    queryset = ComplaintHistory.objects.filter(complaint=complaint).select_related(
+        'changed_by'
+    ).order_by('-timestamp', '-id')
+
+    if cursor:
+        timestamp, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk))
+
+    entries = list(queryset[:limit + 1])
+    next_cursor = encode_cursor(entries[limit - 1]) if len(entries) > limit else None
+    return entries[:limit], next_cursor
+
+
+def recent_history_prefetch(to_attr='recent_history'):
+    """
+    Prefetch the newest page of history for many complaints in one query
+    (a window function per complaint), stored as a list on ``to_attr``.
+    """
+    return Prefetch(
+        'history',
+        queryset=ComplaintHistory.objects.select_related('changed_by').order_by(
+            '-timestamp', '-id'
+        )[:history_page_size()],
+        to_attr=to_attr,
+    )
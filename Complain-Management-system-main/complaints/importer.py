@@ -0,0 +1,399 @@
+"""
+Bulk import of complaints from CSV or JSON (import_complaints, admin upload)
+
+The file is read as a stream and handled in chunks. Per chunk:
+
+- categories, subcategories and users are resolved from in-memory maps
+  (users are looked up once per new username, one query per chunk)
+- assignees come from the same balanced pool as new complaints
+- complaint numbers are allocated as one block
+- complaints, history, notifications and the duplicate index are written
+  with bulk_create in one transaction
+
+MinHash signatures take about half of the import time; with
+``index=False`` the duplicate index is left to index_duplicates.
+
+Rows that fail validation are reported through ``on_error`` and skipped;
+the rest of the chunk is still imported. A chunk that hits an integrity
+error other than a complaint number collision is written again row by
+row, and the rows that still fail are reported the same way.
+
+Columns: title, description, category, subcategory, user (username), and
+optionally assigned_to (username), status, priority, created_at,
+resolved_at, remarks. Categories and subcategories match by name or id.
+"""
+import csv
+import json
+import re
+import time
+from datetime import datetime, time as day_start
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .analytics import bump_data_version
+from .assignment import OPEN_STATUSES, get_strategy, profile_category_for, workload_index
+from .changes import record_changes
+from .duplicates import index_objects
+from .models import (
+    Category, Complaint, ComplaintFingerprint, ComplaintHistory, ComplaintLSHBucket,
+    Notification, SubCategory
+)
+from .sla import compute_due_at, priority_for
+from .workload import complaints_created
+
+
+CHUNK_SIZE = 1000
+BATCH_SIZE = 500
+# A concurrent create can take a number from the block; the chunk is retried
+# with a new block
+NUMBER_RETRIES = 3
+
+READ_SIZE = 1 << 16
+MAX_RECORD_SIZE = 1 << 20
+
+FORMATS = ('csv', 'json')
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+# =========================
+# Readers
+# =========================
+def detect_format(filename):
+    return 'csv' if filename.lower().endswith('.csv') else 'json'
+
+
+def csv_records(stream):
+    return csv.DictReader(stream)
+
+
+_SKIP = re.compile(r'[\s,\[\]]*')
+
+
+def json_records(stream):
+    """Objects of a JSON array or of NDJSON, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    while True:
+        position = _SKIP.match(buffer, position).end()
+        if position < len(buffer):
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof or len(buffer) - position > MAX_RECORD_SIZE:
+                    raise
+            else:
+                yield record
+                continue
+        elif eof:
+            return
+        chunk = stream.read(READ_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def read_records(stream, fmt):
+    """(row number, record) for each record of a text stream"""
+    records = csv_records(stream) if fmt == 'csv' else json_records(stream)
+    return enumerate(records, start=1)
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# =========================
+# Importer
+# =========================
+class ComplaintImporter:
+    """Imports records on behalf of ``imported_by`` (recorded in the history)"""
+
+    def __init__(self, imported_by, notify=True, index=True, chunk_size=CHUNK_SIZE, on_error=None):
+        self.imported_by = imported_by
+        self.notify = notify
+        self.index = index
+        self.chunk_size = chunk_size
+        self.on_error = on_error
+        self.strategy = get_strategy()
+        # Complaint numbers of the block being written
+        self.numbers = []
+
+        categories = list(Category.objects.all())
+        self.categories = {str(category.pk): category for category in categories}
+        self.categories.update({category.name.strip().lower(): category for category in categories})
+        self.pools = {category.pk: profile_category_for(category) for category in categories}
+        self.subcategories = {}
+        for subcategory in SubCategory.objects.all():
+            for key in (str(subcategory.pk), subcategory.name.strip().lower()):
+                self.subcategories[(subcategory.category_id, key)] = subcategory
+        self.users = {}
+
+        self.statuses = {}
+        for value, label in Complaint.STATUS_CHOICES:
+            self.statuses[value.lower()] = self.statuses[label.lower()] = value
+        self.priorities = {value.lower(): value for value, _ in SubCategory.PRIORITY_CHOICES}
+
+    # ---- resolution (no queries) ----
+    def _text(self, record, name, required=False, max_length=None):
+        value = record.get(name)
+        value = '' if value is None else str(value).strip()
+        if required and not value:
+            raise ImportRowError(f"{name} is required")
+        if max_length and len(value) > max_length:
+            raise ImportRowError(f"{name} is longer than {max_length} characters")
+        return value
+
+    def _user_id(self, record, name, required=False):
+        username = self._text(record, name, required)
+        if not username:
+            return None
+        user_id = self.users.get(username)
+        if user_id is None:
+            raise ImportRowError(f"Unknown {name} '{username}'")
+        return user_id
+
+    def _datetime(self, record, name):
+        value = self._text(record, name)
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                raise ImportRowError(f"{name} '{value}' is not a date")
+            parsed = datetime.combine(date, day_start())
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    def resolve(self, record):
+        """(Complaint field values, explicit created_at) for one record"""
+        if not isinstance(record, dict):
+            raise ImportRowError("Expected an object")
+
+        category_name = self._text(record, 'category', required=True)
+        category = self.categories.get(category_name.lower())
+        if category is None:
+            raise ImportRowError(f"Unknown category '{category_name}'")
+        subcategory_name = self._text(record, 'subcategory', required=True)
+        subcategory = self.subcategories.get((category.pk, subcategory_name.lower()))
+        if subcategory is None:
+            raise ImportRowError(f"Unknown subcategory '{subcategory_name}' for {category.name}")
+
+        status_name = self._text(record, 'status') or 'PENDING'
+        status = self.statuses.get(status_name.lower())
+        if status is None:
+            raise ImportRowError(f"Unknown status '{status_name}'")
+        priority_name = self._text(record, 'priority')
+        priority = self.priorities.get(priority_name.lower()) if priority_name else priority_for(subcategory)
+        if priority is None:
+            raise ImportRowError(f"Unknown priority '{priority_name}'")
+
+        created_at = self._datetime(record, 'created_at')
+        resolved_at = self._datetime(record, 'resolved_at')
+        if status == 'RESOLVED' and resolved_at is None:
+            # Without a resolution time, count it as resolved when it was created
+            resolved_at = created_at or timezone.now()
+        if resolved_at and created_at and resolved_at < created_at:
+            raise ImportRowError("resolved_at is before created_at")
+
+        fields = {
+            'title': self._text(record, 'title', required=True, max_length=200),
+            'description': self._text(record, 'description', required=True),
+            'category': category,
+            'subcategory': subcategory,
+            'user_id': self._user_id(record, 'user', required=True),
+            'assigned_to_id': self._user_id(record, 'assigned_to'),
+            'status': status,
+            'priority': priority,
+            'remarks': self._text(record, 'remarks'),
+            'resolved_at': resolved_at,
+            'due_at': compute_due_at(priority, start=created_at),
+        }
+        if fields['assigned_to_id'] is None:
+            fields['assigned_to_id'] = self.assignee_for(category, subcategory)
+        if fields['assigned_to_id'] and status in OPEN_STATUSES:
+            # What the post_save receiver would do, so the next rows see the load
+            workload_index.adjust(fields['assigned_to_id'], 1)
+        return fields, created_at
+
+    def assignee_for(self, category, subcategory):
+        """choose_assignee() without the User lookup"""
+        key = self.pools[category.pk]
+        if key:
+            user_id = workload_index.choose(key, self.strategy)
+            if user_id is not None:
+                return user_id
+        return subcategory.faculty_id or category.faculty_id
+
+    def load_users(self, records):
+        usernames = {
+            str(record.get(name)).strip()
+            for record in records if isinstance(record, dict)
+            for name in ('user', 'assigned_to') if record.get(name)
+        } - self.users.keys()
+        if usernames:
+            self.users.update(User.objects.filter(username__in=usernames).values_list('username', 'pk'))
+
+    # ---- writing ----
+    def write(self, resolved):
+        """Insert one chunk; returns the saved complaints"""
+        numbers = self.numbers = Complaint.allocate_complaint_nos(len(resolved))
+        complaints = [Complaint(complaint_no=number, **fields) for number, (fields, _) in zip(numbers, resolved)]
+        Complaint.objects.bulk_create(complaints, batch_size=BATCH_SIZE)
+
+        # created_at is auto_now_add, so historical dates are written afterwards
+        backdated = []
+        for complaint, (_, created_at) in zip(complaints, resolved):
+            if created_at:
+                complaint.created_at = created_at
+                backdated.append(complaint)
+        if backdated:
+            Complaint.objects.bulk_update(backdated, ['created_at'], batch_size=BATCH_SIZE)
+
+        history = ComplaintHistory.objects.bulk_create([
+            ComplaintHistory(
+                complaint=complaint,
+                changed_by=self.imported_by,
+                from_status='',
+                to_status=complaint.status,
+                remarks='Complaint imported',
+            )
+            for complaint in complaints
+        ], batch_size=BATCH_SIZE)
+
+        record_changes(Complaint, [complaint.pk for complaint in complaints])
+        record_changes(ComplaintHistory, [entry.pk for entry in history])
+
+        if self.notify:
+            notifications = Notification.objects.bulk_create([
+                Notification(
+                    user_id=complaint.assigned_to_id,
+                    message=f"You have been assigned complaint {complaint.complaint_no}",
+                )
+                for complaint in complaints
+                if complaint.assigned_to_id and complaint.status in OPEN_STATUSES
+            ], batch_size=BATCH_SIZE)
+            record_changes(Notification, [notification.pk for notification in notifications])
+
+        if self.index:
+            fingerprints, buckets = index_objects(
+                (complaint.pk, complaint.title, complaint.description) for complaint in complaints
+            )
+            ComplaintFingerprint.objects.bulk_create(fingerprints, batch_size=BATCH_SIZE)
+            ComplaintLSHBucket.objects.bulk_create(buckets, batch_size=2000)
+
+        # The open load was already added to the index as the rows were resolved
+        complaints_created(complaints, index=False)
+        transaction.on_commit(bump_data_version)
+        return complaints
+
+    def numbers_taken(self):
+        """Whether the last allocated block collided with a concurrent create"""
+        return bool(self.numbers) and Complaint.objects.filter(complaint_no__in=self.numbers).exists()
+
+    def write_chunk(self, rows):
+        """Insert ``(row number, record, resolved)`` rows; returns the saved complaints"""
+        for attempt in range(NUMBER_RETRIES):
+            self.numbers = []
+            try:
+                with transaction.atomic():
+                    return self.write([resolved for _, _, resolved in rows])
+            except IntegrityError:
+                if not self.numbers_taken():
+                    return self.write_rows(rows)
+                if attempt == NUMBER_RETRIES - 1:
+                    workload_index.invalidate()
+                    raise
+
+    def write_rows(self, rows):
+        """Write a failed chunk one row at a time, reporting the rows that fail"""
+        # Rejected rows were already counted in the assignment index
+        workload_index.invalidate()
+        complaints = []
+        for row, record, resolved in rows:
+            try:
+                # Deferred constraints are checked on leaving the block
+                with transaction.atomic():
+                    saved = self.write([resolved])
+            except IntegrityError as exc:
+                self.error(row, record, f"Rejected by the database: {exc}")
+            else:
+                complaints.extend(saved)
+        return complaints
+
+    def error(self, row, record, message):
+        if self.on_error:
+            self.on_error(row, record, message)
+
+    def run(self, rows):
+        """
+        Import ``(row number, record)`` pairs.
+        Returns {'imported', 'failed', 'seconds'}.
+        """
+        start = time.perf_counter()
+        imported = failed = 0
+        for chunk in _chunks(rows, self.chunk_size):
+            self.load_users([record for _, record in chunk])
+            resolved = []
+            for row, record in chunk:
+                try:
+                    resolved.append((row, record, self.resolve(record)))
+                except ImportRowError as exc:
+                    failed += 1
+                    self.error(row, record, str(exc))
+            if resolved:
+                saved = len(self.write_chunk(resolved))
+                imported += saved
+                failed += len(resolved) - saved
+
+        if imported and self.notify:
+            notifications = Notification.objects.bulk_create([
+                Notification(
+                    user=admin,
+                    message=(
+                        f"{imported} complaint(s) imported by "
+                        f"{self.imported_by.get_full_name() or self.imported_by.username}"
+                    ),
+                )
+                for admin in User.objects.filter(profile__role='admin')
+            ])
+            record_changes(Notification, [notification.pk for notification in notifications])
+        return {'imported': imported, 'failed': failed, 'seconds': time.perf_counter() - start}
+
+
+def import_complaints(stream, fmt, imported_by, **options):
+    """Import a CSV/JSON text stream; see ComplaintImporter for ``options``"""
+    return ComplaintImporter(imported_by, **options).run(read_records(stream, fmt))
+
+
+# =========================
+# Error file
+# =========================
+class ErrorWriter:
+    """Row-level error report: row number, message and the record as JSON"""
+
+    HEADER = ['row', 'error', 'record']
+
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.count = 0
+
+    def __call__(self, row, record, message):
+        if not self.count:
+            self.writer.writerow(self.HEADER)
+        self.writer.writerow([row, message, json.dumps(record, default=str)])
+        self.count += 1
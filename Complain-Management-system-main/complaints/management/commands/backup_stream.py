@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.backup import CHUNK_SIZE, backup_models, dump
+
+
+class Command(BaseCommand):
+    help = "Back up the database as one NDJSON file per model, in constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Backup directory (created if missing)")
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            help="app_label or app_label.Model to back up (default: everything)",
+        )
+        parser.add_argument(
+            "-e",
+            "--exclude",
+            dest="exclude",
+            action="append",
+            default=[],
+            help="app_label or app_label.Model to leave out (repeatable)",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            dest="gzip",
+            help="Compress each file with gzip",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Rows fetched from the database at a time",
+        )
+
+    def handle(self, *args, **options):
+        model_list = backup_models(options["labels"], options["exclude"])
+        if not model_list:
+            raise CommandError("No models match.")
+
+        def progress(model, count):
+            self.stdout.write(f"{model._meta.label:<40}{count:>12}")
+
+        start = time.perf_counter()
+        manifest = dump(
+            options["directory"], model_list,
+            compress=options["gzip"], chunk_size=options["chunk_size"], progress=progress,
+        )
+        rows = sum(entry["count"] for entry in manifest["models"])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Backed up {rows} row(s) of {len(model_list)} model(s) in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,63 @@
+import random
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from complaints.analytics import _timestamps, grouped_distribution, resolution_report
+from complaints.models import Complaint
+
+
+class Command(BaseCommand):
+    help = "Time the resolution analytics computation for a year of synthetic complaints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            dest="rows",
+            default="10000,100000,500000",
+            help="Comma-separated resolved-complaint counts",
+        )
+        parser.add_argument(
+            "--groups",
+            dest="groups",
+            type=int,
+            default=200,
+            help="Distinct faculty members in the synthetic data",
+        )
+
+    def synthetic_rows(self, count, groups):
+        """values_list()-shaped rows spread over the last year"""
+        rng = random.Random(count)
+        now = timezone.now()
+        rows = []
+        for _ in range(count):
+            created = now - timedelta(seconds=rng.randrange(365 * 86400))
+            resolved = created + timedelta(hours=rng.lognormvariate(3, 1.2))
+            rows.append((created, resolved, rng.randrange(1, 12), rng.randrange(1, 60), rng.randrange(1, groups)))
+        return rows
+
+    def compute(self, rows):
+        """The NumPy part of resolution_report(), without the ORM"""
+        created, resolved, category_ids, subcategory_ids, faculty_ids = zip(*rows)
+        hours = np.maximum(_timestamps(resolved) - _timestamps(created), 0) / 3600
+        for ids in (category_ids, subcategory_ids, faculty_ids):
+            grouped_distribution(np.asarray(ids, dtype=np.int64), hours)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'rows':>10}{'compute ms':>12}")
+        for count in (int(n) for n in options["rows"].split(",") if n.strip()):
+            rows = self.synthetic_rows(count, options["groups"])
+            start = time.perf_counter()
+            self.compute(rows)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(self.style.SUCCESS(f"{count:>10}{elapsed:>12.1f}"))
+
+        # End to end on this database, including the values_list() fetch
+        start = time.perf_counter()
+        report = resolution_report(Complaint.objects.all())
+        elapsed = (time.perf_counter() - start) * 1000
+        count = report["overall"]["count"] if report["overall"] else 0
+        self.stdout.write(self.style.SUCCESS(f"database: {count} resolved complaint(s) in {elapsed:.1f} ms"))
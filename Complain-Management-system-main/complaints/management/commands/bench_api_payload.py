@@ -0,0 +1,67 @@
+import time
+
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from complaints import renderers
+from complaints.compression import available_encoders
+
+from .bench_complaint_list import Command as ListBenchCommand, FastListViewSet
+
+
+class Command(ListBenchCommand):
+    help = "Compare JSON render time and compressed size of one /api/complaints/ list page"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            dest="rows",
+            type=int,
+            default=1000,
+            help="Complaints seeded (rolled back afterwards)",
+        )
+        parser.add_argument(
+            "--repeat",
+            dest="repeat",
+            type=int,
+            default=200,
+            help="Times each renderer/encoder runs on the page",
+        )
+
+    def page_data(self, user):
+        request = APIRequestFactory().get("/api/complaints/", SERVER_NAME="localhost")
+        force_authenticate(request, user=user)
+        return FastListViewSet.as_view({"get": "list"})(request).data
+
+    def timed(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = func()
+        return (time.perf_counter() - start) / repeat * 1000, result
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        with transaction.atomic():
+            user = self.seed(options["rows"])
+            data = self.page_data(user)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'renderer':<10}{'ms/page':>10}{'bytes':>10}")
+        renderer_classes = [("stdlib", JSONRenderer)]
+        if renderers.orjson is not None:
+            renderer_classes.append(("orjson", renderers.FastJSONRenderer))
+        else:
+            self.stdout.write(self.style.WARNING("orjson not installed; FastJSONRenderer uses the stdlib path"))
+        body = None
+        for name, renderer_class in renderer_classes:
+            renderer = renderer_class()
+            elapsed, body = self.timed(lambda: renderer.render(data), repeat)
+            self.stdout.write(self.style.SUCCESS(f"{name:<10}{elapsed:>10.3f}{len(body):>10}"))
+
+        self.stdout.write(f"{'encoding':<10}{'ms/page':>10}{'bytes':>10}{'ratio':>8}")
+        self.stdout.write(self.style.SUCCESS(f"{'identity':<10}{0:>10.3f}{len(body):>10}{1:>8.2f}"))
+        for name, encode in available_encoders().items():
+            elapsed, compressed = self.timed(lambda: encode(body), repeat)
+            ratio = len(body) / len(compressed)
+            self.stdout.write(self.style.SUCCESS(f"{name:<10}{elapsed:>10.3f}{len(compressed):>10}{ratio:>8.2f}"))
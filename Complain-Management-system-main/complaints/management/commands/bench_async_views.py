@@ -0,0 +1,146 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from types import ModuleType
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+from rest_framework.authtoken.models import Token
+
+from complaints import async_views, views
+from complaints.models import Complaint
+
+from .bench_complaint_list import Command as ListBenchCommand
+
+
+# (name, url, sync view, async view, uses the token)
+ENDPOINTS = [
+    ("dashboard", "dashboard/", views.dashboard, async_views.dashboard, False),
+    ("list", "complaints/", views.complaint_list, async_views.complaint_list, False),
+    ("detail", "complaints/<str:complaint_no>/", views.complaint_detail, async_views.complaint_detail, False),
+    ("stats", "api/stats/", views.complaint_stats, async_views.complaint_stats, True),
+]
+
+
+def bench_urlconf():
+    """Both versions of each endpoint under /bench/<mode>/, plus the site's URLs for reverse()"""
+    urlconf = ModuleType("bench_async_urls")
+    urlconf.urlpatterns = [
+        path(f"bench/{mode}/{url}", view)
+        for _, url, sync_view, async_view, _ in ENDPOINTS
+        for mode, view in (("sync", sync_view), ("async", async_view))
+    ] + [path("", include(settings.ROOT_URLCONF))]
+    return urlconf
+
+
+@contextmanager
+def database_copy():
+    """
+    Point the default database at a throwaway copy of itself.
+    The seeded rows must be committed (the async views read them through
+    other connections), so they never touch the real database.
+    """
+    db = connections["default"]
+    if db.vendor != "sqlite":
+        raise CommandError("Only runs against a SQLite database.")
+    original = db.settings_dict["NAME"]
+    fd, path = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    source = sqlite3.connect(original)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+    connections.close_all()
+    # Shared by the connections every thread opens from here on
+    db.settings_dict["NAME"] = path
+    try:
+        yield
+    finally:
+        connections.close_all()
+        db.settings_dict["NAME"] = original
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+class Command(ListBenchCommand):
+    help = "Compare sync and async read views under concurrent ASGI requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            dest="rows",
+            type=int,
+            default=1000,
+            help="Complaints seeded into a temporary copy of the database",
+        )
+        parser.add_argument(
+            "--concurrency",
+            dest="concurrency",
+            default="1,16,64",
+            help="Comma-separated numbers of requests in flight",
+        )
+        parser.add_argument(
+            "--requests",
+            dest="requests",
+            type=int,
+            default=200,
+            help="Requests timed per endpoint, mode and concurrency",
+        )
+
+    async def run(self, client, url, headers, concurrency, requests):
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with slots:
+                response = await client.get(url, headers=headers)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} answered {response.status_code}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+    async def run_all(self, user, token, complaint_no, concurrency_levels, requests):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        headers = {"Authorization": f"Token {token.key}"}
+
+        self.stdout.write(f"{'endpoint':<10}{'in flight':>10}{'sync req/s':>12}{'async req/s':>13}{'ratio':>8}")
+        for name, url, _, _, uses_token in ENDPOINTS:
+            url = url.replace("<str:complaint_no>", complaint_no)
+            for concurrency in concurrency_levels:
+                rates = {}
+                for mode in ("sync", "async"):
+                    # Warm up, then measure
+                    await self.run(client, f"/bench/{mode}/{url}", headers if uses_token else {}, concurrency, concurrency)
+                    rates[mode] = await self.run(
+                        client, f"/bench/{mode}/{url}", headers if uses_token else {}, concurrency, requests
+                    )
+                ratio = rates["async"] / rates["sync"]
+                style = self.style.SUCCESS if ratio >= 1 else self.style.WARNING
+                self.stdout.write(style(
+                    f"{name:<10}{concurrency:>10}{rates['sync']:>12.1f}{rates['async']:>13.1f}{ratio:>8.2f}"
+                ))
+
+    def handle(self, *args, **options):
+        concurrency_levels = [int(n) for n in options["concurrency"].split(",") if n.strip()]
+        with database_copy():
+            user = self.seed(options["rows"])
+            token, _ = Token.objects.get_or_create(user=user)
+            complaint_no = Complaint.objects.filter(complaint_no__startswith="BENCH-").values_list(
+                "complaint_no", flat=True
+            ).first()
+            hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+            with override_settings(ROOT_URLCONF=bench_urlconf(), ALLOWED_HOSTS=hosts):
+                asyncio.run(self.run_all(user, token, complaint_no, concurrency_levels, options["requests"]))
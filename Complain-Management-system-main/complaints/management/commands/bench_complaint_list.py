@@ -0,0 +1,92 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework import mixins
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from complaints.models import Complaint, SubCategory
+from complaints.views import ComplaintViewSet
+
+
+class BenchPagination(PageNumberPagination):
+    page_size = 100
+
+
+class FastListViewSet(ComplaintViewSet):
+    pagination_class = BenchPagination
+
+
+class LegacyListViewSet(ComplaintViewSet):
+    """The stock ModelViewSet list: model instances through ComplaintListSerializer"""
+    pagination_class = BenchPagination
+    list = mixins.ListModelMixin.list
+
+
+class Command(BaseCommand):
+    help = "Compare /api/complaints/ list throughput for the values() fast path and the stock path"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            dest="rows",
+            type=int,
+            default=5000,
+            help="Complaints seeded (rolled back afterwards)",
+        )
+        parser.add_argument(
+            "--requests",
+            dest="requests",
+            type=int,
+            default=50,
+            help="List requests timed per path",
+        )
+
+    def seed(self, rows):
+        user = User.objects.filter(is_superuser=True).order_by("pk").first()
+        subcategory = SubCategory.objects.select_related("category").order_by("pk").first()
+        if not user or not subcategory:
+            raise CommandError("Needs a superuser and at least one subcategory.")
+        faculty = User.objects.filter(profile__role="faculty").order_by("pk").first()
+        Complaint.objects.bulk_create([
+            Complaint(
+                complaint_no=f"BENCH-{i:07d}",
+                user=user,
+                title=f"Benchmark complaint {i}",
+                description="Long complaint description. " * 40,
+                category=subcategory.category,
+                subcategory=subcategory,
+                assigned_to=faculty if i % 2 else None,
+                attachment=f"complaints/bench-{i}.png" if i % 3 == 0 else "",
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        return user
+
+    def run(self, viewset, user, requests):
+        view = viewset.as_view({"get": "list"})
+        factory = APIRequestFactory()
+        start = time.perf_counter()
+        for page in range(requests):
+            request = factory.get("/api/complaints/", {"page": page % 10 + 1}, SERVER_NAME="localhost")
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+        elapsed = time.perf_counter() - start
+        return requests / elapsed, len(response.content)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(options["rows"])
+            self.stdout.write(f"{'path':<8}{'req/s':>10}{'bytes/page':>12}")
+            results = {}
+            for name, viewset in (("stock", LegacyListViewSet), ("fast", FastListViewSet)):
+                # Warm up, then measure
+                self.run(viewset, user, 2)
+                results[name] = self.run(viewset, user, options["requests"])
+                rate, size = results[name]
+                self.stdout.write(self.style.SUCCESS(f"{name:<8}{rate:>10.1f}{size:>12}"))
+            self.stdout.write(f"speedup: {results['fast'][0] / results['stock'][0]:.1f}x")
+            transaction.set_rollback(True)
@@ -0,0 +1,152 @@
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from complaints.duplicates import (
+    NUM_PERM, band_buckets, minhash, pack_signature, similarity, unpack_signature
+)
+
+
+WORDS = (
+    "wifi router hostel block room projector lab library fan light water cooler "
+    "washroom leak broken slow internet login portal fee canteen food bus late "
+    "classroom chair desk ac noisy power cut socket printer exam hall timetable"
+).split()
+
+
+def _text(rng, words=30):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _variant(rng, text, edits=3):
+    """A near-duplicate: the same complaint with a few words changed"""
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+class Command(BaseCommand):
+    help = "Measure duplicate lookup latency as the MinHash/LSH index grows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            dest="sizes",
+            default="10000,100000,1000000",
+            help="Comma-separated index sizes, measured as the index grows",
+        )
+        parser.add_argument(
+            "--queries",
+            dest="queries",
+            type=int,
+            default=200,
+            help="Lookups timed at each size",
+        )
+        parser.add_argument(
+            "--seed",
+            dest="seed",
+            type=int,
+            default=1,
+        )
+
+    def create_schema(self, conn):
+        # Same shape and indexes as ComplaintFingerprint / ComplaintLSHBucket
+        conn.executescript(
+            "CREATE TABLE fingerprint (complaint_id INTEGER PRIMARY KEY, signature BLOB);"
+            "CREATE TABLE bucket (id INTEGER PRIMARY KEY, complaint_id INTEGER, bucket INTEGER);"
+            "CREATE INDEX bucket_bucket_idx ON bucket (bucket);"
+            "CREATE INDEX bucket_complaint_idx ON bucket (complaint_id);"
+        )
+
+    def insert(self, conn, rows):
+        conn.executemany(
+            "INSERT INTO fingerprint (complaint_id, signature) VALUES (?, ?)",
+            [(cid, pack_signature(sig)) for cid, sig in rows],
+        )
+        conn.executemany(
+            "INSERT INTO bucket (complaint_id, bucket) VALUES (?, ?)",
+            [(cid, bucket) for cid, sig in rows for bucket in band_buckets(sig)],
+        )
+        conn.commit()
+
+    def lookup(self, conn, signature):
+        """The find_duplicates() query pair: candidates by bucket, then score"""
+        buckets = band_buckets(signature)
+        marks = ",".join("?" * len(buckets))
+        candidates = [row[0] for row in conn.execute(
+            f"SELECT DISTINCT complaint_id FROM bucket WHERE bucket IN ({marks}) LIMIT 200", buckets
+        )]
+        if not candidates:
+            return candidates, []
+        marks = ",".join("?" * len(candidates))
+        scored = [
+            (similarity(signature, unpack_signature(data)), cid)
+            for cid, data in conn.execute(
+                f"SELECT complaint_id, signature FROM fingerprint WHERE complaint_id IN ({marks})", candidates
+            )
+        ]
+        return candidates, sorted(scored, reverse=True)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(n) for n in options["sizes"].split(",") if n.strip())
+        rng = random.Random(options["seed"])
+
+        # Real complaints with known near-duplicates to look up; the rest of
+        # the index is filled with random signatures (unrelated complaints),
+        # which cost the same to store but are far cheaper to generate.
+        originals = [_text(rng) for _ in range(options["queries"])]
+        planted = [(cid, minhash(text, "")) for cid, text in enumerate(originals, start=1)]
+        queries = [(cid, minhash(_variant(rng, text), "")) for cid, text in enumerate(originals, start=1)]
+
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self.create_schema(conn)
+            self.insert(conn, planted)
+            indexed = len(planted)
+
+            self.stdout.write(
+                f"{'indexed':>10}{'build s':>9}{'p50 ms':>9}{'p99 ms':>9}{'candidates':>12}{'recall':>8}"
+            )
+            for size in sizes:
+                start = time.perf_counter()
+                while indexed < size:
+                    batch = min(20000, size - indexed)
+                    self.insert(conn, [
+                        (indexed + i + 1, [rng.getrandbits(61) for _ in range(NUM_PERM)])
+                        for i in range(batch)
+                    ])
+                    indexed += batch
+                conn.execute("ANALYZE")
+                build = time.perf_counter() - start
+
+                timings = []
+                candidate_counts = []
+                found = 0
+                for cid, signature in queries:
+                    start = time.perf_counter()
+                    candidates, scored = self.lookup(conn, signature)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    candidate_counts.append(len(candidates))
+                    found += any(match == cid and score >= 0.5 for score, match in scored)
+
+                timings.sort()
+                p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+                self.stdout.write(self.style.SUCCESS(
+                    f"{indexed:>10}{build:>9.1f}{statistics.median(timings):>9.2f}{p99:>9.2f}"
+                    f"{statistics.mean(candidate_counts):>12.1f}{found / len(queries):>8.0%}"
+                ))
+        finally:
+            conn.close()
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
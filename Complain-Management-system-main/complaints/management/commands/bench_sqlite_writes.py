@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from complaints.db import apply_sqlite_pragmas, get_sqlite_pragmas
+
+
+# Django's stock SQLite setup: rollback journal, FULL sync, 5s driver timeout
+DEFAULT_PROFILE = {
+    'timeout': 5,
+    'pragmas': {},
+}
+
+
+def _writer(path, timeout, pragmas, rows, results):
+    """Insert ``rows`` complaints, one transaction each (like one request each)"""
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    apply_sqlite_pragmas(conn.cursor(), pragmas)
+
+    written = 0
+    locked = 0
+    for i in range(rows):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO bench_complaint (title, description, status, created_at) "
+                "VALUES (?, ?, 'PENDING', datetime('now'))",
+                (f"Complaint {os.getpid()}-{i}", "x" * 500),
+            )
+            conn.execute("COMMIT")
+            written += 1
+        except sqlite3.OperationalError:
+            locked += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    conn.close()
+    results.put((written, locked))
+
+
+class Command(BaseCommand):
+    help = "Compare SQLite write throughput for the default and tuned connection profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            dest="writers",
+            default="1,8,32",
+            help="Comma-separated concurrent writer counts",
+        )
+        parser.add_argument(
+            "--rows",
+            dest="rows",
+            type=int,
+            default=200,
+            help="Rows inserted by each writer",
+        )
+
+    def run_profile(self, timeout, pragmas, writers, rows):
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(path)
+            apply_sqlite_pragmas(conn.cursor(), pragmas)
+            conn.execute(
+                "CREATE TABLE bench_complaint ("
+                "id INTEGER PRIMARY KEY, title TEXT, description TEXT, "
+                "status TEXT, created_at TEXT)"
+            )
+            conn.commit()
+            conn.close()
+
+            results = multiprocessing.Queue()
+            procs = [
+                multiprocessing.Process(
+                    target=_writer, args=(path, timeout, pragmas, rows, results)
+                )
+                for _ in range(writers)
+            ]
+            start = time.perf_counter()
+            for proc in procs:
+                proc.start()
+            outcomes = [results.get() for _ in procs]
+            for proc in procs:
+                proc.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+        written = sum(w for w, _ in outcomes)
+        locked = sum(n for _, n in outcomes)
+        return written, locked, elapsed
+
+    def handle(self, *args, **options):
+        writer_counts = [int(n) for n in options["writers"].split(",") if n.strip()]
+        rows = options["rows"]
+
+        tuned_pragmas = get_sqlite_pragmas()
+        profiles = [
+            ("default", DEFAULT_PROFILE["timeout"], DEFAULT_PROFILE["pragmas"]),
+            ("tuned", tuned_pragmas.get("busy_timeout", 5000) / 1000, tuned_pragmas),
+        ]
+
+        self.stdout.write(f"{'profile':<10}{'writers':>8}{'rows/s':>12}{'written':>10}{'locked':>8}")
+        for writers in writer_counts:
+            for name, timeout, pragmas in profiles:
+                written, locked, elapsed = self.run_profile(timeout, pragmas, writers, rows)
+                rate = written / elapsed if elapsed else 0
+                line = f"{name:<10}{writers:>8}{rate:>12.0f}{written:>10}{locked:>8}"
+                style = self.style.ERROR if locked else self.style.SUCCESS
+                self.stdout.write(style(line))
@@ -0,0 +1,89 @@
+import os
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from complaints.models import Complaint, UploadSession
+from complaints.storage import ATTACHMENT_PREFIX, TMP_DIR, UPLOADS_DIR, attachment_storage
+from complaints.thumbnails import thumbnail_names
+
+
+class Command(BaseCommand):
+    help = "Delete attachment files that no complaint references any more"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            help="Only report what would be deleted",
+        )
+        parser.add_argument(
+            "--grace-hours",
+            dest="grace_hours",
+            type=float,
+            default=24,
+            help="Keep files younger than this, so in-flight uploads are not removed",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        cutoff = time.time() - options["grace_hours"] * 3600
+        storage = attachment_storage()
+        root = storage.path(ATTACHMENT_PREFIX)
+
+        # Abandoned upload sessions; their .part files are collected below
+        stale_sessions = UploadSession.objects.filter(
+            updated_at__lt=timezone.now() - timedelta(hours=options["grace_hours"])
+        ).exclude(status="ATTACHED")
+        stale_count = stale_sessions.count()
+        if not dry_run:
+            stale_sessions.delete()
+
+        referenced = set(
+            Complaint.objects.exclude(attachment__isnull=True)
+            .exclude(attachment="")
+            .values_list("attachment", flat=True)
+            .iterator(chunk_size=2000)
+        )
+        # Finalized uploads still waiting to be attached to a complaint
+        referenced.update(
+            UploadSession.objects.filter(status="COMPLETE").values_list("attachment", flat=True)
+        )
+        # Thumbnails live and die with their original
+        referenced |= {thumb for name in list(referenced) for thumb in thumbnail_names(name)}
+
+        removed = 0
+        reclaimed = 0
+        for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, storage.location).replace("\\", "/")
+                if name in referenced:
+                    continue
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+
+                removed += 1
+                reclaimed += stat.st_size
+                if dry_run:
+                    self.stdout.write(f"Would delete {name}")
+                else:
+                    os.remove(path)
+
+            # Drop now-empty hash directories (never the working dirs)
+            keep = (root, storage.path(TMP_DIR), storage.path(UPLOADS_DIR))
+            if not dry_run and dirpath not in keep:
+                if not os.listdir(dirpath):
+                    os.rmdir(dirpath)
+
+        verb = "Would reclaim" if dry_run else "Reclaimed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {reclaimed / (1024 * 1024):.1f} MB from {removed} orphaned file(s). "
+                f"Referenced: {len(referenced)}, stale upload sessions: {stale_count}"
+            )
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from complaints.models import Complaint
+from complaints.thumbnails import generate_thumbnails, is_image
+
+
+class Command(BaseCommand):
+    help = "Generate missing thumbnails for existing image attachments"
+
+    def handle(self, *args, **options):
+        names = set(
+            Complaint.objects.exclude(attachment__isnull=True)
+            .exclude(attachment="")
+            .values_list("attachment", flat=True)
+            .iterator(chunk_size=2000)
+        )
+
+        created = 0
+        failed = 0
+        for name in sorted(filter(is_image, names)):
+            try:
+                created += len(generate_thumbnails(name))
+            except Exception as exc:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"Skipped {name}: {exc}"))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done. Thumbnails created: {created}, Failed: {failed}")
+        )
@@ -0,0 +1,81 @@
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.importer import CHUNK_SIZE, FORMATS, ErrorWriter, detect_format, import_complaints
+
+
+class Command(BaseCommand):
+    help = "Import complaints from a CSV or JSON (array or NDJSON) file in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import")
+        parser.add_argument(
+            "--format",
+            dest="format",
+            choices=FORMATS,
+            help="File format (default: from the extension, .csv or JSON)",
+        )
+        parser.add_argument(
+            "--as",
+            dest="username",
+            help="User recorded in the complaint history (default: the first superuser)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Rows written per transaction",
+        )
+        parser.add_argument(
+            "--errors",
+            dest="errors",
+            help="Where to write rejected rows (default: <path>.errors.csv)",
+        )
+        parser.add_argument(
+            "--skip-index",
+            action="store_false",
+            dest="index",
+            help="Skip duplicate indexing (run index_duplicates afterwards)",
+        )
+        parser.add_argument(
+            "--no-notify",
+            action="store_false",
+            dest="notify",
+            help="Do not notify assignees and admins",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.isfile(path):
+            raise CommandError(f"{path} does not exist.")
+        if options["username"]:
+            imported_by = User.objects.filter(username=options["username"]).first()
+        else:
+            imported_by = User.objects.filter(is_superuser=True).order_by("pk").first()
+        if imported_by is None:
+            raise CommandError("Needs an existing user for --as (or a superuser).")
+
+        errors_path = options["errors"] or f"{path}.errors.csv"
+        with open(path, newline="", encoding="utf-8-sig") as stream, \
+                open(errors_path, "w", newline="", encoding="utf-8") as errors_file:
+            errors = ErrorWriter(errors_file)
+            try:
+                result = import_complaints(
+                    stream, options["format"] or detect_format(path), imported_by,
+                    notify=options["notify"], index=options["index"], chunk_size=options["chunk_size"], on_error=errors,
+                )
+            except ValueError as exc:
+                # Chunks before the unreadable part stay imported
+                raise CommandError(f"Could not read {path}: {exc}")
+        if not errors.count:
+            os.remove(errors_path)
+
+        rate = (result["imported"] + result["failed"]) / result["seconds"] if result["seconds"] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['imported']} complaint(s) in {result['seconds']:.1f}s ({rate:.0f} rows/s)"
+        ))
+        if errors.count:
+            self.stdout.write(self.style.WARNING(f"{errors.count} row(s) rejected; see {errors_path}"))
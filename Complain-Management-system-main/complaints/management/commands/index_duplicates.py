@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from complaints.duplicates import index_objects
+from complaints.models import Complaint, ComplaintFingerprint, ComplaintLSHBucket
+
+
+class Command(BaseCommand):
+    help = "Build the near-duplicate (MinHash/LSH) index for existing complaints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=1000,
+            help="Complaints indexed per transaction",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            dest="rebuild",
+            help="Drop and rebuild the whole index instead of indexing only missing complaints",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            ComplaintLSHBucket.objects.all().delete()
+            ComplaintFingerprint.objects.all().delete()
+
+        # Merged complaints are never candidates, so they are not indexed
+        pending = Complaint.objects.filter(
+            fingerprint__isnull=True, duplicate_of__isnull=True
+        ).order_by("pk").values_list("pk", "title", "description")
+
+        indexed = 0
+        last_pk = 0
+        while True:
+            rows = list(pending.filter(pk__gt=last_pk)[:options["batch_size"]])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            fingerprints, buckets = index_objects(rows)
+
+            with transaction.atomic():
+                ComplaintLSHBucket.objects.filter(complaint_id__in=[f.complaint_id for f in fingerprints]).delete()
+                ComplaintFingerprint.objects.bulk_create(fingerprints)
+                ComplaintLSHBucket.objects.bulk_create(buckets, batch_size=2000)
+            indexed += len(fingerprints)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} complaint(s)"))
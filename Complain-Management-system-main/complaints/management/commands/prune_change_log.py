@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from complaints.changes import prune_change_log, retention_days
+from complaints.models import ChangeLog
+
+
+class Command(BaseCommand):
+    help = "Drop superseded and delete entries of the change feed log past its retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            dest="days",
+            type=int,
+            default=None,
+            help="Retention in days (default: CHANGE_FEED_RETENTION_DAYS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=5000,
+            help="Log ids covered per delete transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            help="Only report how many entries would be deleted",
+        )
+
+    def handle(self, *args, **options):
+        days = retention_days() if options["days"] is None else options["days"]
+        removed = prune_change_log(days, options["batch_size"], options["dry_run"])
+        verb = "Would remove" if options["dry_run"] else "Removed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {removed} change log entries older than {days} day(s). "
+                f"Entries kept: {ChangeLog.objects.count() - (removed if options['dry_run'] else 0)}"
+            )
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from complaints.models import Complaint, FacultyWorkload, UserProfile
+from complaints.workload import refresh_workloads
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized FacultyWorkload table from complaints and feedback"
+
+    def handle(self, *args, **options):
+        user_ids = set(
+            UserProfile.objects.filter(role__in=["faculty", "hod"]).values_list("user_id", flat=True)
+        )
+        user_ids.update(
+            Complaint.objects.filter(assigned_to__isnull=False)
+            .values_list("assigned_to_id", flat=True).distinct()
+        )
+
+        with transaction.atomic():
+            FacultyWorkload.objects.exclude(user_id__in=user_ids).delete()
+            refresh_workloads(user_ids)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt workload for {len(user_ids)} user(s)"))
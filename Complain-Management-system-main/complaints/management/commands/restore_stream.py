@@ -0,0 +1,47 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from complaints.backup import CHUNK_SIZE, BackupError, restore
+
+
+class Command(BaseCommand):
+    help = "Restore a backup_stream directory with bulk inserts, in constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory written by backup_stream")
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            dest="replace",
+            help="Empty the tables in the backup first (e.g. after a fresh migrate)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            dest="chunk_size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Rows inserted per bulk_create",
+        )
+
+    def handle(self, *args, **options):
+        def progress(model, count):
+            self.stdout.write(f"{model._meta.label:<40}{count:>12}")
+
+        start = time.perf_counter()
+        try:
+            restored = restore(
+                options["directory"], replace=options["replace"],
+                chunk_size=options["chunk_size"], progress=progress,
+            )
+        except (BackupError, IntegrityError) as exc:
+            raise CommandError(f"Restore failed, nothing was changed: {exc}")
+
+        # Cached users, reports, sessions and counters describe the old data
+        cache.clear()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Restored {sum(restored.values())} row(s) of {len(restored)} model(s) in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,167 @@
+import time
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from complaints.analytics import bump_data_version
+from complaints.assignment import OPEN_STATUSES, profile_category_for, workload_index
+from complaints.changes import record_changes
+from complaints.models import Category, Complaint, ComplaintHistory, Notification, UserProfile
+from complaints.workload import refresh_workloads_on_commit
+
+
+class Command(BaseCommand):
+    help = "Escalate open complaints past their SLA due date to the HOD"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=1000,
+            help="Complaints escalated per transaction",
+        )
+        parser.add_argument(
+            "--interval",
+            dest="interval",
+            type=int,
+            default=0,
+            help="Keep running and check every N seconds (default: run once, e.g. from cron)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            dest="dry_run",
+            help="Only report how many complaints are in breach",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            if options["dry_run"]:
+                count = self.breached(timezone.now()).count()
+                self.stdout.write(self.style.SUCCESS(f"{count} complaint(s) in SLA breach"))
+                return
+
+            escalated = self.run_once(timezone.now(), options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Escalated {escalated} complaint(s)"))
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
+
+    def breached(self, now):
+        # Served by complaint_sla_due_idx: a due_at range scan per open status,
+        # touching only breached rows. Unordered, so LIMIT stops early.
+        return Complaint.objects.filter(
+            due_at__lte=now, status__in=OPEN_STATUSES, escalated_at__isnull=True
+        )
+
+    def run_once(self, now, batch_size):
+        self.load_hods()
+        total = 0
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    self.breached(now)
+                    .select_for_update(skip_locked=True)
+                    .values("id", "complaint_no", "status", "category_id", "assigned_to_id", "due_at")[:batch_size]
+                )
+                if not rows:
+                    break
+                self.escalate(rows, now)
+            total += len(rows)
+        if total:
+            workload_index.invalidate()
+            bump_data_version()
+        return total
+
+    # =========================
+    # Escalation targets
+    # =========================
+    def load_hods(self):
+        """HOD per UserProfile.category key, plus a default for unmatched categories"""
+        self.hods = {}
+        self.default_hod = None
+        for user_id, key in UserProfile.objects.filter(
+            role="hod", user__is_active=True
+        ).order_by("user_id").values_list("user_id", "category"):
+            self.default_hod = self.default_hod or user_id
+            if key:
+                self.hods.setdefault(key, user_id)
+        self.category_hods = {}
+        self.fallback_actor = User.objects.filter(is_superuser=True).order_by("pk").values_list("pk", flat=True).first()
+
+    def hod_for(self, category_id):
+        if category_id not in self.category_hods:
+            category = Category.objects.filter(pk=category_id).first()
+            key = profile_category_for(category) if category else None
+            self.category_hods[category_id] = self.hods.get(key, self.default_hod)
+        return self.category_hods[category_id]
+
+    # =========================
+    # One batch
+    # =========================
+    def escalate(self, rows, now):
+        by_hod = defaultdict(list)
+        for row in rows:
+            by_hod[self.hod_for(row["category_id"])].append(row)
+
+        names = dict(
+            (user.pk, user.get_full_name() or user.username)
+            for user in User.objects.filter(pk__in=[hod for hod in by_hod if hod])
+        )
+        history = []
+        notifications = []
+        previous_assignees = defaultdict(list)
+
+        for hod, group in by_hod.items():
+            ids = [row["id"] for row in group]
+            update = {"escalated_at": now, "updated_at": now}
+            if hod:
+                update["assigned_to_id"] = hod
+            Complaint.objects.filter(pk__in=ids, escalated_at__isnull=True).update(**update)
+            record_changes(Complaint, ids)
+
+            actor = hod or self.fallback_actor
+            target = names.get(hod, "HOD") if hod else "no HOD available"
+            for row in group:
+                if actor:
+                    history.append(ComplaintHistory(
+                        complaint_id=row["id"],
+                        changed_by_id=actor,
+                        from_status=row["status"],
+                        to_status=row["status"],
+                        remarks=f"SLA breached (due {row['due_at']:%Y-%m-%d %H:%M}); escalated to {target}",
+                    ))
+                if row["assigned_to_id"] and row["assigned_to_id"] != hod:
+                    previous_assignees[row["assigned_to_id"]].append(row["complaint_no"])
+
+            if hod:
+                notifications.append(Notification(
+                    user_id=hod,
+                    message=self.summary(
+                        "complaint(s) breached their SLA and were escalated to you",
+                        [row["complaint_no"] for row in group],
+                    ),
+                ))
+
+        for user_id, numbers in previous_assignees.items():
+            notifications.append(Notification(
+                user_id=user_id,
+                message=self.summary("of your complaint(s) breached their SLA and were escalated", numbers),
+            ))
+
+        ComplaintHistory.objects.bulk_create(history, batch_size=500)
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        record_changes(ComplaintHistory, [entry.pk for entry in history])
+        record_changes(Notification, [notification.pk for notification in notifications])
+        refresh_workloads_on_commit(
+            [hod for hod in by_hod if hod] + [row["assigned_to_id"] for row in rows]
+        )
+
+    def summary(self, text, numbers, shown=10):
+        listed = ", ".join(numbers[:shown])
+        more = f" and {len(numbers) - shown} more" if len(numbers) > shown else ""
+        return f"{len(numbers)} {text}: {listed}{more}"
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:45
+
+import complaints.models
+import complaints.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0005_remove_feedback_rating_alter_feedback_comments'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='complaint',
+            name='attachment',
+            field=models.FileField(blank=True, null=True, storage=complaints.storage.attachment_storage, upload_to=complaints.models.upload_to, validators=[django.core.validators.FileExtensionValidator(['pdf', 'jpg', 'jpeg', 'png', 'docx'])]),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0007_uploadsession'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['created_at'], name='complaint_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['status', 'created_at'], name='complaint_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0008_complaint_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complainthistory',
+            index=models.Index(fields=['complaint', 'timestamp', 'id'], name='history_complaint_ts_idx'),
+        ),
+    ]
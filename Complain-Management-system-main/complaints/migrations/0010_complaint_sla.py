@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:58
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_due_at(apps, schema_editor):
+    """due_at = created_at + SLA window, one UPDATE per priority"""
+    from complaints.sla import sla_hours
+
+    Complaint = apps.get_model('complaints', 'Complaint')
+    priorities = Complaint.objects.values_list('priority', flat=True).distinct()
+    for priority in list(priorities):
+        Complaint.objects.filter(priority=priority, due_at__isnull=True).update(
+            due_at=models.F('created_at') + timedelta(hours=sla_hours(priority))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0009_history_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complaint',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='complaint',
+            name='escalated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['status', 'escalated_at', 'due_at'], name='complaint_sla_due_idx'),
+        ),
+        migrations.RunPython(backfill_due_at, migrations.RunPython.noop),
+    ]
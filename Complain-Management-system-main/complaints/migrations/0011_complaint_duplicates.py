@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0010_complaint_sla'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplaintFingerprint',
+            fields=[
+                ('complaint', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='fingerprint', serialize=False, to='complaints.complaint')),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='complaint',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='complaints.complaint'),
+        ),
+        migrations.CreateModel(
+            name='ComplaintLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('complaint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='complaints.complaint')),
+            ],
+        ),
+    ]
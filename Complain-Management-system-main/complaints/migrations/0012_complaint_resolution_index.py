@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0011_complaint_duplicates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['resolved_at', 'created_at', 'category', 'subcategory', 'assigned_to'], name='complaint_resolution_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_workload(apps, schema_editor):
+    Complaint = apps.get_model('complaints', 'Complaint')
+    Feedback = apps.get_model('complaints', 'Feedback')
+    FacultyWorkload = apps.get_model('complaints', 'FacultyWorkload')
+
+    totals = {}
+
+    def row(user_id):
+        return totals.setdefault(user_id, {
+            'open_complaints': 0, 'resolved_complaints': 0, 'resolution_seconds': 0, 'feedback_count': 0,
+        })
+
+    complaints = Complaint.objects.filter(assigned_to__isnull=False).values_list(
+        'assigned_to_id', 'status', 'created_at', 'resolved_at'
+    )
+    for user_id, status, created_at, resolved_at in complaints.iterator(chunk_size=2000):
+        counters = row(user_id)
+        if status in ('PENDING', 'PROCESSING'):
+            counters['open_complaints'] += 1
+        if resolved_at and created_at:
+            counters['resolved_complaints'] += 1
+            counters['resolution_seconds'] += max(int((resolved_at - created_at).total_seconds()), 0)
+
+    for user_id in Feedback.objects.filter(
+        complaint__assigned_to__isnull=False
+    ).values_list('complaint__assigned_to_id', flat=True).iterator(chunk_size=2000):
+        row(user_id)['feedback_count'] += 1
+
+    FacultyWorkload.objects.bulk_create(
+        [FacultyWorkload(user_id=user_id, **counters) for user_id, counters in totals.items()],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('complaints', '0012_complaint_resolution_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyWorkload',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_complaints', models.IntegerField(default=0)),
+                ('resolved_complaints', models.IntegerField(default=0)),
+                ('resolution_seconds', models.BigIntegerField(default=0)),
+                ('feedback_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_workload, migrations.RunPython.noop),
+    ]
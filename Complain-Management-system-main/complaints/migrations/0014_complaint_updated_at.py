@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:08
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Last known change: resolution time, else creation time"""
+    Complaint = apps.get_model('complaints', 'Complaint')
+    Complaint.objects.update(updated_at=Coalesce('resolved_at', 'created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0013_faculty_workload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complaint',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:38
+
+from django.db import migrations, models
+
+
+FED_MODELS = [
+    ('complaint', 'Complaint'),
+    ('history', 'ComplaintHistory'),
+    ('feedback', 'Feedback'),
+    ('notification', 'Notification'),
+]
+
+
+def backfill_change_log(apps, schema_editor):
+    """Log every existing row once, so since=0 yields a full snapshot"""
+    log_table = apps.get_model('complaints', 'ChangeLog')._meta.db_table
+    quote = schema_editor.quote_name
+    with schema_editor.connection.cursor() as cursor:
+        for kind, model_name in FED_MODELS:
+            table = apps.get_model('complaints', model_name)._meta.db_table
+            cursor.execute(
+                f"INSERT INTO {quote(log_table)} (kind, object_id, action, created_at) "
+                f"SELECT %s, id, 'upsert', CURRENT_TIMESTAMP FROM {quote(table)} ORDER BY id",
+                [kind]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0014_complaint_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('complaint', 'Complaint'), ('history', 'Complaint history'), ('feedback', 'Feedback'), ('notification', 'Notification')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('upsert', 'Created or updated'), ('delete', 'Deleted')], default='upsert', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_change_log, migrations.RunPython.noop),
+    ]
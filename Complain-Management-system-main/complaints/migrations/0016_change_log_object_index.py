@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0015_change_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['kind', 'object_id', 'id'], name='changelog_object_idx'),
+        ),
+    ]
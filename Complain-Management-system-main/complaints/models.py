@@ -1,5 +1,5 @@
-import uuid
 import os
+import uuid
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -7,14 +7,18 @@ from django.core.validators import FileExtensionValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.db.models import Max
+from django.db.models.functions import Cast, Substr
+
+from .sla import compute_due_at
+from .storage import attachment_storage
 
 
 # =========================
 # File upload helper
 # =========================
 def upload_to(instance, filename):
-    ext = filename.split('.')[-1]
-    filename = f"{uuid.uuid4()}.{ext}"
+    # Final path is chosen by ContentAddressedStorage from the file's SHA-256;
+    # only the extension of this name is kept.
     return os.path.join('complaints', filename)
 
 
@@ -60,12 +64,6 @@ class UserProfile(models.Model):
 # =========================
 
 
-
-def upload_to(instance, filename):
-    return f"complaints/{instance.user.username}/{filename}"
-
-from django.contrib.auth.models import User
-
 class Category(models.Model):
     name = models.CharField(max_length=100)
     faculty = models.ForeignKey(
@@ -142,6 +140,7 @@ class Complaint(models.Model):
 
     attachment = models.FileField(
         upload_to=upload_to,
+        storage=attachment_storage,
         blank=True,
         null=True,
         validators=[
@@ -191,8 +190,40 @@ class Complaint(models.Model):
     admin_remarks = models.TextField(blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
 
+    # ==========================
+    # SLA
+    # ==========================
+    due_at = models.DateTimeField(null=True, blank=True)
+    escalated_at = models.DateTimeField(null=True, blank=True)
+
+    # ==========================
+    # DUPLICATES
+    # ==========================
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='duplicates'
+    )
+
+    class Meta:
+        indexes = [
+            # Newest-first lists (scanned backwards, so -created_at, -pk needs no sort)
+            models.Index(fields=['created_at'], name='complaint_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='complaint_status_created_idx'),
+            # SLA scheduler: status / escalated_at equality, then a range scan on due_at
+            models.Index(fields=['status', 'escalated_at', 'due_at'], name='complaint_sla_due_idx'),
+            # Resolution analytics: range on resolved_at, covering every column it reads
+            models.Index(
+                fields=['resolved_at', 'created_at', 'category', 'subcategory', 'assigned_to'],
+                name='complaint_resolution_idx'
+            ),
+        ]
+
     # ==========================
     # STRING
     # ==========================
@@ -207,6 +238,8 @@ class Complaint(models.Model):
     def save(self, *args, **kwargs):
         if not self.pk and not self.complaint_no:
             self.complaint_no = self.generate_complaint_no()
+        if not self.pk and not self.due_at:
+            self.due_at = compute_due_at(self.priority)
         super().save(*args, **kwargs)
 
 
@@ -216,18 +249,19 @@ class Complaint(models.Model):
     # ==========================
 
     def generate_complaint_no(self):
-        today = timezone.now().strftime('%Y%m%d')
-        last = Complaint.objects.filter(
-            complaint_no__startswith=f"CMP-{today}"
-        ).aggregate(Max('complaint_no'))['complaint_no__max']
-
-        if last:
-            last_number = int(last.split('-')[-1])
-            next_number = last_number + 1
-        else:
-            next_number = 1
+        return self.allocate_complaint_nos(1)[0]
 
-        return f"CMP-{today}-{next_number:04d}"
+    @classmethod
+    def allocate_complaint_nos(cls, count):
+        """
+        ``count`` consecutive numbers for today, with one query.
+        Suffixes are compared as integers, so numbering continues past 9999.
+        """
+        prefix = f"CMP-{timezone.now().strftime('%Y%m%d')}-"
+        last = cls.objects.filter(complaint_no__startswith=prefix).aggregate(
+            last=Max(Cast(Substr('complaint_no', len(prefix) + 1), models.IntegerField()))
+        )['last'] or 0
+        return [f"{prefix}{number:04d}" for number in range(last + 1, last + count + 1)]
 
 
 
@@ -245,6 +279,10 @@ class ComplaintHistory(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Keyset paging of one complaint's history
+            models.Index(fields=['complaint', 'timestamp', 'id'], name='history_complaint_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.complaint.complaint_no}: {self.from_status} → {self.to_status}"
@@ -277,5 +315,114 @@ class Notification(models.Model):
         return f"Notification for {self.user.username}"
 
 
+# =========================
+# Chunked Upload Session
+# =========================
+class UploadSession(models.Model):
+    """Resumable attachment upload: initiate, PUT chunks, finalize"""
+
+    STATUS_CHOICES = [
+        ('OPEN', 'Open'),
+        ('COMPLETE', 'Complete'),
+        ('ATTACHED', 'Attached'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='OPEN')
+    # Stored attachment name once finalized
+    attachment = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.filename}, {self.offset}/{self.size})"
+
+
+# =========================
+# Near-duplicate Index
+# =========================
+class ComplaintFingerprint(models.Model):
+    """MinHash signature of a complaint's title + description"""
+
+    complaint = models.OneToOneField(
+        Complaint, on_delete=models.CASCADE, primary_key=True, related_name='fingerprint'
+    )
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return f"Fingerprint for complaint {self.complaint_id}"
+
+
+class ComplaintLSHBucket(models.Model):
+    """One LSH band hash of a fingerprint; equal buckets mark duplicate candidates"""
+
+    complaint = models.ForeignKey(Complaint, on_delete=models.CASCADE, related_name='lsh_buckets')
+    bucket = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"Bucket {self.bucket} of complaint {self.complaint_id}"
+
+
+# =========================
+# Faculty Workload
+# =========================
+class FacultyWorkload(models.Model):
+    """Per-assignee counters, maintained incrementally by complaints.workload"""
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='workload'
+    )
+    open_complaints = models.IntegerField(default=0)
+    resolved_complaints = models.IntegerField(default=0)
+    # Sum of resolved_at - created_at over resolved complaints, for the average
+    resolution_seconds = models.BigIntegerField(default=0)
+    feedback_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def avg_resolution_hours(self):
+        if not self.resolved_complaints:
+            return None
+        return self.resolution_seconds / self.resolved_complaints / 3600
+
+    def __str__(self):
+        return f"Workload of {self.user.username} ({self.open_complaints} open)"
+
+
+# =========================
+# Change Log
+# =========================
+class ChangeLog(models.Model):
+    """
+    Sequence log behind /api/changes/: one row per write to a fed model.
+    The id is the feed cursor (see complaints.changes).
+    """
+
+    KIND_CHOICES = [
+        ('complaint', 'Complaint'),
+        ('history', 'Complaint history'),
+        ('feedback', 'Feedback'),
+        ('notification', 'Notification'),
+    ]
+    ACTION_CHOICES = [
+        ('upsert', 'Created or updated'),
+        ('delete', 'Deleted'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, default='upsert')
+    created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # prune_change_log: later entries for the same object
+            models.Index(fields=['kind', 'object_id', 'id'], name='changelog_object_idx'),
+        ]
 
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.kind} {self.object_id}"
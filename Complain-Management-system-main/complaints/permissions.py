@@ -0,0 +1,43 @@
+"""
+Shared permission checks for complaint views
+"""
+from .actor import actor_for
+
+
+def can_view_complaint(user, complaint):
+    """
+    Visibility rules of the complaint detail page:
+    - staff/superusers, admins and HODs see every complaint
+    - faculty see complaints assigned to them and their own
+    - students see only their own
+    """
+    actor = actor_for(user)
+    if actor.is_admin:
+        return True
+
+    role = actor.role
+
+    if role == 'student':
+        return complaint.user_id == user.id
+    if role == 'faculty':
+        return complaint.assigned_to_id == user.id or complaint.user_id == user.id
+    return True
+
+
+def can_merge_complaint(user, complaint):
+    """
+    Who may close a complaint as a duplicate of another:
+    - staff/superusers, admins and HODs
+    - faculty assigned to the complaint
+    """
+    actor = actor_for(user)
+    if actor.is_admin:
+        return True
+
+    role = actor.role
+
+    if role in ('admin', 'hod'):
+        return True
+    if role == 'faculty':
+        return complaint.assigned_to_id == user.id
+    return False
@@ -0,0 +1,71 @@
+"""
+Fast JSON rendering and parsing for the API
+
+FastJSONRenderer / FastJSONParser use orjson when it is installed and fall
+back to DRF's stdlib-based JSONRenderer / JSONParser otherwise, so enabling
+them (API_FAST_JSON=True) never breaks a deployment without orjson.
+NDJSONRenderer writes one such document per line.
+
+Output matches the stock renderer: DRF's encoder still formats datetimes,
+decimals, UUIDs and lazy strings, and an ``indent`` request (browsable API,
+``; indent=4`` in Accept) is served by the stock renderer.
+"""
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Datetimes go through DRF's encoder so the format stays the same
+        return orjson.dumps(
+            data,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """Newline-delimited JSON, one compact document per line (streamed feeds)"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def __init__(self):
+        self.json = FastJSONRenderer()
+
+    def lines(self, items):
+        for item in items:
+            yield self.json.render(item) + b'\n'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Non-streamed responses (errors) are a single line
+        return b''.join(self.lines([data]))
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -1,9 +1,21 @@
+from operator import itemgetter
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Length, Substr, Trim
+from django.db.models.lookups import GreaterThan
+from django.urls import reverse
 from .models import (
     UserProfile,
-    Complaint, ComplaintHistory, Feedback, Notification
+    SubCategory, Complaint, ComplaintHistory, Feedback, Notification, UploadSession
+)
+from .uploads import (
+    ALLOWED_EXTENSIONS, UploadError, claim_upload, file_extension, max_attachment_size
 )
+from .bulk import BULK_FILTER_FIELDS
+from .history import history_page_size, recent_history_prefetch
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -17,9 +29,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = UserProfile
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name',
-            'role', 'phone', 'department', 'category', 'created_at', 'updated_at'
+            'role', 'phone', 'department', 'category'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id']
     
     def validate_role(self, value):
         """Prevent non-superusers from setting role to HOD"""
@@ -29,31 +41,212 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return value
 
 
-class ComplaintListSerializer(serializers.ModelSerializer):
-    """Serializer for complaint list view"""
+class SparseFieldsMixin:
+    """
+    ``fields`` keeps only the named fields; ``expand`` limits which nested
+    objects (expandable_fields) are embedded. None means no restriction,
+    except for opt_in_fields, which are only sent when named in ``fields``.
+    """
+    expandable_fields = ()
+    opt_in_fields = ()
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.selected_fields(fields, expand)
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, fields=None, expand=None):
+        return [
+            name for name in cls.Meta.fields
+            if (name in fields if fields is not None else name not in cls.opt_in_fields)
+            and (expand is None or name not in cls.expandable_fields or name in expand)
+        ]
+
+    @classmethod
+    def validate_sparse_params(cls, fields=None, expand=None):
+        """Reject unknown names the way the bulk filters do"""
+        errors = {}
+        unknown = set(fields or ()) - set(cls.Meta.fields)
+        if unknown:
+            errors['fields'] = (
+                f"Unsupported fields: {', '.join(sorted(unknown))}. "
+                f"Allowed: {', '.join(cls.Meta.fields)}"
+            )
+        unknown = set(expand or ()) - set(cls.expandable_fields)
+        if unknown:
+            errors['expand'] = (
+                f"Unsupported expansions: {', '.join(sorted(unknown))}. "
+                f"Allowed: {', '.join(cls.expandable_fields) or 'none'}"
+            )
+        if errors:
+            raise serializers.ValidationError(errors)
+
+
+# ?fields=description_preview,description_truncated sends a cut description
+# instead of the full text
+LIST_DESCRIPTION_LENGTH = 200
+_list_datetime = serializers.DateTimeField()
+
+# values() columns each list field is built from
+LIST_FIELD_COLUMNS = {
+    'complaint_no': ('complaint_no',),
+    'title': ('title',),
+    'description': ('description',),
+    'description_preview': ('description_preview',),
+    'description_truncated': ('description_truncated',),
+    'category': ('category_id',),
+    'status': ('status',),
+    'user_name': ('user_name',),
+    'user_username': ('user_username',),
+    'assigned_to_name': ('assigned_to_id', 'assigned_to_name'),
+    'attachment_url': ('complaint_no', 'attachment'),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+    'resolved_at': ('resolved_at',),
+}
+
+
+def _list_annotations():
+    """SQL-computed list columns; the user joins only happen when one is selected"""
+    return {
+        'user_name': Trim(Concat('user__first_name', Value(' '), 'user__last_name')),
+        'user_username': F('user__username'),
+        'assigned_to_name': Trim(Concat('assigned_to__first_name', Value(' '), 'assigned_to__last_name')),
+        'description_preview': Substr('description', 1, LIST_DESCRIPTION_LENGTH),
+        'description_truncated': GreaterThan(Length('description'), LIST_DESCRIPTION_LENGTH),
+    }
+
+
+class ComplaintListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Serializer for complaint list view.
+
+    Model instances go through the regular field machinery. Rows from
+    list_values() are plain dicts with the display names already
+    computed in SQL, and are rendered directly without per-field overhead.
+    """
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     user_username = serializers.CharField(source='user.username', read_only=True)
     assigned_to_name = serializers.CharField(source='assigned_to.get_full_name', read_only=True)
     attachment_url = serializers.SerializerMethodField()
+    description_preview = serializers.SerializerMethodField()
+    description_truncated = serializers.SerializerMethodField()
+    opt_in_fields = ('description_preview', 'description_truncated')
     
     class Meta:
         model = Complaint
         fields = [
-            'complaint_no', 'title', 'description', 'category', 'status',
-            'user_name', 'user_username', 'assigned_to_name',
+            'complaint_no', 'title', 'description', 'description_preview', 'description_truncated',
+            'category', 'status', 'user_name', 'user_username', 'assigned_to_name',
             'attachment_url', 'created_at', 'updated_at', 'resolved_at'
         ]
         read_only_fields = ['complaint_no', 'created_at', 'updated_at', 'resolved_at']
     
+    @staticmethod
+    def list_values(queryset, fields=None):
+        """Only the columns ``fields`` (default: all list fields) are built from"""
+        columns = []
+        for name in fields or ComplaintListSerializer.selected_fields():
+            for column in LIST_FIELD_COLUMNS[name]:
+                if column not in columns:
+                    columns.append(column)
+        annotations = {name: expression for name, expression in _list_annotations().items() if name in columns}
+        return queryset.annotate(**annotations).values(*columns)
+    
+    def attachment_url_parts(self):
+        """Absolute attachment URL around the complaint number, built once per response"""
+        if not hasattr(self, '_attachment_url_parts'):
+            request = self.context.get('request')
+            self._attachment_url_parts = None
+            if request:
+                url = request.build_absolute_uri(reverse('complaint_attachment', args=['COMPLAINT_NO']))
+                self._attachment_url_parts = tuple(url.split('COMPLAINT_NO', 1))
+        return self._attachment_url_parts
+    
+    def row_readers(self):
+        """(field, function of a values() row) for the selected fields, built once per response"""
+        if not hasattr(self, '_row_readers'):
+            url_parts = self.attachment_url_parts()
+            datetime = _list_datetime.to_representation
+            readers = {
+                'complaint_no': itemgetter('complaint_no'),
+                'title': itemgetter('title'),
+                'description': itemgetter('description'),
+                'description_preview': itemgetter('description_preview'),
+                'description_truncated': itemgetter('description_truncated'),
+                'category': itemgetter('category_id'),
+                'status': itemgetter('status'),
+                'user_name': itemgetter('user_name'),
+                'user_username': itemgetter('user_username'),
+                'assigned_to_name': itemgetter('assigned_to_name'),
+                'attachment_url': lambda row: (
+                    f"{url_parts[0]}{row['complaint_no']}{url_parts[1]}" if row['attachment'] and url_parts else None
+                ),
+                'created_at': lambda row: datetime(row['created_at']),
+                'updated_at': lambda row: datetime(row['updated_at']),
+                'resolved_at': lambda row: datetime(row['resolved_at']),
+            }
+            self._row_readers = [(name, readers[name]) for name in self.fields]
+        return self._row_readers
+    
+    def to_representation(self, instance):
+        if not isinstance(instance, dict):
+            return super().to_representation(instance)
+        
+        row = instance
+        data = {name: read(row) for name, read in self.row_readers()}
+        if 'assigned_to_name' in data and not row['assigned_to_id']:
+            # Matches the instance path, which skips names through a null relation
+            del data['assigned_to_name']
+        return data
+    
     def get_attachment_url(self, obj):
         if obj.attachment:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.attachment.url)
+                return request.build_absolute_uri(
+                    reverse('complaint_attachment', args=[obj.complaint_no])
+                )
         return None
+    
+    def get_description_preview(self, obj):
+        return obj.description[:LIST_DESCRIPTION_LENGTH]
+    
+    def get_description_truncated(self, obj):
+        return len(obj.description) > LIST_DESCRIPTION_LENGTH
+
 
+# Complaint columns each detail field reads (joined relations must be listed too)
+DETAIL_FIELD_COLUMNS = {
+    'complaint_no': ('complaint_no',),
+    'title': ('title',),
+    'description': ('description',),
+    'category': ('category',),
+    'status': ('status',),
+    'user_profile': ('user',),
+    'assigned_to_profile': ('assigned_to',),
+    'attachment_url': ('complaint_no', 'attachment'),
+    'remarks': ('remarks',),
+    'admin_remarks': ('admin_remarks',),
+    'history': (),
+    'feedback': ('feedback',),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+    'resolved_at': ('resolved_at',),
+    'due_at': ('due_at',),
+    'escalated_at': ('escalated_at',),
+}
+DETAIL_FIELD_RELATIONS = {
+    'user_profile': 'user__profile',
+    'assigned_to_profile': 'assigned_to__profile',
+    'feedback': 'feedback__user',
+}
 
-class ComplaintDetailSerializer(serializers.ModelSerializer):
+
+class ComplaintDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for complaint detail view"""
     user_profile = UserProfileSerializer(source='user.profile', read_only=True)
     assigned_to_profile = UserProfileSerializer(source='assigned_to.profile', read_only=True)
@@ -61,25 +254,49 @@ class ComplaintDetailSerializer(serializers.ModelSerializer):
     history = serializers.SerializerMethodField()
     feedback = serializers.SerializerMethodField()
     
+    expandable_fields = ('user_profile', 'assigned_to_profile', 'history', 'feedback')
+    
     class Meta:
         model = Complaint
         fields = [
             'complaint_no', 'title', 'description', 'category', 'status',
             'user_profile', 'assigned_to_profile',
             'attachment_url', 'remarks', 'admin_remarks', 'history', 'feedback',
-            'created_at', 'updated_at', 'resolved_at'
+            'created_at', 'updated_at', 'resolved_at', 'due_at', 'escalated_at'
         ]
-        read_only_fields = ['complaint_no', 'created_at', 'updated_at', 'resolved_at']
+        read_only_fields = ['complaint_no', 'created_at', 'updated_at', 'resolved_at', 'due_at', 'escalated_at']
+    
+    @staticmethod
+    def setup_queryset(queryset, fields=None):
+        """
+        Load what ``fields`` (default: all) render up front: their columns,
+        the profile/feedback joins and the newest history, in a fixed
+        number of queries.
+        """
+        if fields is None:
+            fields = ComplaintDetailSerializer.Meta.fields
+        columns = {column for name in fields for column in DETAIL_FIELD_COLUMNS[name]}
+        relations = [DETAIL_FIELD_RELATIONS[name] for name in fields if name in DETAIL_FIELD_RELATIONS]
+        queryset = queryset.only('id', *columns)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        if 'history' in fields:
+            queryset = queryset.prefetch_related(recent_history_prefetch())
+        return queryset
     
     def get_attachment_url(self, obj):
         if obj.attachment:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.attachment.url)
+                return request.build_absolute_uri(
+                    reverse('complaint_attachment', args=[obj.complaint_no])
+                )
         return None
     
     def get_history(self, obj):
-        history = obj.history.all()[:10]  # Last 10 entries
+        history = getattr(obj, 'recent_history', None)
+        if history is None:
+            history = obj.history.select_related('changed_by').order_by('-timestamp', '-id')[:history_page_size()]
         return ComplaintHistorySerializer(history, many=True, context=self.context).data
     
     def get_feedback(self, obj):
@@ -92,13 +309,46 @@ class ComplaintDetailSerializer(serializers.ModelSerializer):
 
 class ComplaintCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating complaints"""
+    upload_id = serializers.UUIDField(write_only=True, required=False)
     
     class Meta:
         model = Complaint
         fields = [
-            'title', 'description', 'category',
-            'attachment', 'remarks'
+            'title', 'description', 'category', 'subcategory',
+            'attachment', 'upload_id', 'remarks'
         ]
+        # Stored files are not served from MEDIA_URL; use the detail's attachment_url
+        extra_kwargs = {'attachment': {'write_only': True}}
+    
+    def validate_upload_id(self, value):
+        """Finalized chunked upload owned by the requesting user"""
+        request = self.context.get('request')
+        try:
+            return UploadSession.objects.exclude(attachment='').get(
+                pk=value, user=request.user, status='COMPLETE'
+            )
+        except UploadSession.DoesNotExist:
+            raise serializers.ValidationError("No finalized upload with this id.")
+    
+    def validate(self, attrs):
+        if attrs.get('attachment') and attrs.get('upload_id'):
+            raise serializers.ValidationError("Send either an attachment or an upload_id, not both.")
+        category, subcategory = attrs.get('category'), attrs.get('subcategory')
+        if subcategory and subcategory.category_id != getattr(category, 'pk', None):
+            raise serializers.ValidationError({'subcategory': ["Subcategory does not belong to the selected category."]})
+        return attrs
+    
+    def create(self, validated_data):
+        upload = validated_data.pop('upload_id', None)
+        # Claim the upload and save the complaint together: a create that
+        # loses a race for the same upload_id leaves nothing behind
+        with transaction.atomic():
+            if upload:
+                try:
+                    validated_data['attachment'] = claim_upload(upload)
+                except UploadError as exc:
+                    raise serializers.ValidationError({'upload_id': [exc.message]})
+            return super().create(validated_data)
     
     def validate_attachment(self, value):
         """Validate file upload"""
@@ -118,6 +368,35 @@ class ComplaintCreateSerializer(serializers.ModelSerializer):
         return value
 
 
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Serializer for chunked upload sessions"""
+    
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'filename', 'size', 'offset', 'status', 'attachment',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'offset', 'status', 'attachment', 'created_at', 'updated_at']
+    
+    def validate_filename(self, value):
+        value = value.replace('\\', '/').rsplit('/', 1)[-1]
+        if file_extension(value) not in ALLOWED_EXTENSIONS:
+            raise serializers.ValidationError(
+                f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+            )
+        return value
+    
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("File size must be greater than zero")
+        if value > max_attachment_size():
+            raise serializers.ValidationError(
+                f"File size cannot exceed {max_attachment_size() // (1024 * 1024)}MB"
+            )
+        return value
+
+
 class ComplaintUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating complaints"""
     
@@ -166,14 +445,65 @@ class ComplaintAssignmentSerializer(serializers.Serializer):
         return value
 
 
+class ComplaintBulkFilterSerializer(serializers.Serializer):
+    """Whitelisted, typed filters for selecting complaints in a bulk action"""
+    status = serializers.ChoiceField(choices=Complaint.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=SubCategory.PRIORITY_CHOICES, required=False)
+    category = serializers.IntegerField(min_value=1, required=False)
+    subcategory = serializers.IntegerField(min_value=1, required=False)
+    # null selects unassigned complaints
+    assigned_to = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    user = serializers.IntegerField(min_value=1, required=False)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            unknown = set(data) - set(BULK_FILTER_FIELDS)
+            if unknown:
+                raise serializers.ValidationError(
+                    f"Unsupported filters: {', '.join(sorted(unknown))}. "
+                    f"Allowed: {', '.join(BULK_FILTER_FIELDS)}"
+                )
+        value = super().to_internal_value(data)
+        if not value:
+            raise serializers.ValidationError("At least one filter is required.")
+        return value
+
+
+class ComplaintBulkSelectionSerializer(serializers.Serializer):
+    """Selects complaints for a bulk action by id list or filters"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=5000
+    )
+    filters = ComplaintBulkFilterSerializer(required=False)
+
+    def validate(self, data):
+        if bool(data.get('ids')) == bool(data.get('filters')):
+            raise serializers.ValidationError("Provide either 'ids' or 'filters'.")
+        return data
+
+
+class ComplaintBulkStatusSerializer(ComplaintBulkSelectionSerializer):
+    """Serializer for bulk status updates"""
+    status = serializers.ChoiceField(choices=Complaint.STATUS_CHOICES)
+    remarks = serializers.CharField(required=False, allow_blank=True)
+
+
+class ComplaintBulkAssignSerializer(ComplaintBulkSelectionSerializer, ComplaintAssignmentSerializer):
+    """Serializer for bulk assignment"""
+
+
 class ComplaintHistorySerializer(serializers.ModelSerializer):
     """Serializer for complaint history"""
     changed_by_name = serializers.CharField(source='changed_by.get_full_name', read_only=True)
+    changed_by_username = serializers.CharField(source='changed_by.username', read_only=True)
     
     class Meta:
         model = ComplaintHistory
         fields = [
-            'id', 'changed_by_name', 'from_status', 'to_status',
+            'id', 'changed_by_name', 'changed_by_username', 'from_status', 'to_status',
             'remarks', 'timestamp'
         ]
         read_only_fields = ['id', 'timestamp']
@@ -187,15 +517,9 @@ class FeedbackSerializer(serializers.ModelSerializer):
     class Meta:
         model = Feedback
         fields = [
-            'id', 'complaint_no', 'rating', 'comments', 'user_name', 'created_at'
+            'id', 'complaint_no', 'comments', 'user_name', 'created_at'
         ]
         read_only_fields = ['id', 'user_name', 'complaint_no', 'created_at']
-    
-    def validate_rating(self, value):
-        """Validate rating"""
-        if not 1 <= value <= 5:
-            raise serializers.ValidationError("Rating must be between 1 and 5")
-        return value
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -0,0 +1,42 @@
+"""
+Per-priority SLA policies
+
+A complaint's ``due_at`` is fixed when it is created, from its priority
+(taken from the subcategory, see priority_for), and recomputed when an
+admin changes the priority of a complaint that has not been escalated.
+The run_sla_scheduler command escalates open complaints whose ``due_at``
+has passed.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+# Hours allowed before an open complaint is escalated
+DEFAULT_SLA_POLICIES = {
+    'Critical': 4,
+    'High': 24,
+    'Medium': 72,
+    'Low': 168,
+}
+DEFAULT_SLA_PRIORITY = 'Medium'
+
+
+def get_sla_policies():
+    return getattr(settings, 'SLA_POLICIES', DEFAULT_SLA_POLICIES)
+
+
+def sla_hours(priority):
+    """Resolution window for a priority; blank/unknown priorities use Medium"""
+    policies = get_sla_policies()
+    return policies.get(priority) or policies.get(DEFAULT_SLA_PRIORITY, DEFAULT_SLA_POLICIES[DEFAULT_SLA_PRIORITY])
+
+
+def priority_for(subcategory):
+    """Priority a new complaint gets from its subcategory; Medium without one"""
+    return getattr(subcategory, 'priority', '') or DEFAULT_SLA_PRIORITY
+
+
+def compute_due_at(priority, start=None):
+    return (start or timezone.now()) + timedelta(hours=sla_hours(priority))
@@ -0,0 +1,123 @@
+"""
+Content-addressed attachment storage
+
+Uploads are streamed through SHA-256 while being written to a temporary
+file, then moved to ``complaints/<ab>/<cd>/<sha256>.<ext>``. Identical
+evidence uploaded twice ends up as two references to one file on disk.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+ATTACHMENT_PREFIX = 'complaints'
+TMP_DIR = os.path.join(ATTACHMENT_PREFIX, '.tmp')
+UPLOADS_DIR = os.path.join(ATTACHMENT_PREFIX, '.uploads')
+CHUNK_SIZE = 64 * 1024
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by the SHA-256 of their content"""
+
+    def hashed_name(self, digest, ext):
+        return os.path.join(ATTACHMENT_PREFIX, digest[:2], digest[2:4], f"{digest}{ext}")
+
+    def get_available_name(self, name, max_length=None):
+        # Final names come from the content hash, so collisions are duplicates
+        return name
+
+    def _stream_to_tmp(self, content, digest=None):
+        """Write ``content`` chunk by chunk to a temp file, optionally hashing it"""
+        tmp_dir = self.path(TMP_DIR)
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    if digest is not None:
+                        digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path
+
+    def _move_into_place(self, tmp_path, name):
+        final_path = self.path(name)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(tmp_path, self.file_permissions_mode)
+        os.replace(tmp_path, final_path)
+
+    def _reuse(self, name):
+        # Refresh the mtime so gc_attachments treats the file as new again:
+        # an old orphan re-uploaded now must outlive the grace period
+        os.utime(self.path(name))
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        digest = hashlib.sha256()
+        tmp_path = self._stream_to_tmp(content, digest)
+        try:
+            final_name = self.hashed_name(digest.hexdigest(), ext)
+            if self.exists(final_name):
+                # Duplicate upload: reuse the stored copy
+                os.remove(tmp_path)
+                self._reuse(final_name)
+            else:
+                self._move_into_place(tmp_path, final_name)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return final_name.replace('\\', '/')
+
+    def save_local_file(self, name, path, expected_sha256=None):
+        """
+        Adopt a complete file already on this filesystem (e.g. an assembled
+        chunked upload): hash it in place and move it, without copying.
+        Raises ValueError if ``expected_sha256`` is given and does not match.
+        """
+        ext = os.path.splitext(name)[1].lower()
+        digest = hashlib.sha256()
+        with open(path, 'rb') as source:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+
+        if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+            raise ValueError("SHA-256 checksum mismatch")
+
+        final_name = self.hashed_name(digest.hexdigest(), ext)
+        if self.exists(final_name):
+            os.remove(path)
+            self._reuse(final_name)
+        else:
+            self._move_into_place(path, final_name)
+        return final_name.replace('\\', '/')
+
+    def save_derived(self, name, content):
+        """
+        Store a file derived from an attachment (e.g. a thumbnail) under the
+        exact ``name`` given, replacing any previous copy atomically.
+        """
+        tmp_path = self._stream_to_tmp(content)
+        try:
+            self._move_into_place(tmp_path, name)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name
+
+
+def attachment_storage():
+    """Storage callable for Complaint.attachment (keeps migrations stable)"""
+    return ContentAddressedStorage()
@@ -0,0 +1,20 @@
+from django import template
+from django.urls import reverse
+
+from ..thumbnails import has_thumbnail
+
+register = template.Library()
+
+
+@register.filter
+def attachment_thumbnail(complaint, size='small'):
+    """
+    Protected URL of a generated thumbnail for the complaint's image
+    attachment, or '' if there is none yet (non-image file, or still being
+    generated in the background).
+    Usage: {{ complaint|attachment_thumbnail:"preview" }}
+    """
+    if not complaint.attachment or not has_thumbnail(complaint.attachment.name, size):
+        return ''
+    url = reverse('complaint_attachment', args=[complaint.complaint_no])
+    return f"{url}?size={size}"
@@ -0,0 +1,225 @@
+"""
+Token-bucket rate limits shared by every worker (THROTTLE_RATES)
+
+Each (scope, client) pair has a bucket holding up to N tokens that refills
+at N per period, for a rate written like DRF's: '10/hour', '300/min'.
+Rates are set per scope and role; None means unlimited.
+
+The bucket is stored as one integer in the cache: the time (ms) at which
+it will be full again (GCRA). A request adds one token interval and is
+refused if that pushes the time more than a full bucket ahead. The key
+expires once the bucket is full, so idle clients start over with a full
+bucket. On the SQLite cache the whole check is one cache.transform() write
+transaction; other backends use add()/incr() with a refund.
+
+Clients are identified by user, or when anonymous by the IP address DRF's
+get_ident() reports (honouring NUM_PROXIES), in the API and views alike.
+
+- TokenBucketThrottle: DRF throttle for the whole API ('api' scope)
+- ComplaintSubmitThrottle: complaint creation through the API
+- throttle(): the same limits for template views, answering 429; with
+  charge=False it only checks, and the view calls charge() once the
+  request succeeded (invalid form posts cost nothing)
+"""
+import logging
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+from rest_framework.throttling import BaseThrottle
+
+from .actor import actor_for
+
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+DEFAULT_THROTTLE_RATES = {
+    'api': {'admin': None, 'hod': '1200/min', 'faculty': '600/min', 'student': '300/min', 'anon': '60/min'},
+    'complaint_submit': {'admin': None, 'hod': None, 'faculty': '20/hour', 'student': '10/hour', 'anon': '10/hour'},
+}
+
+
+# =========================
+# Rates
+# =========================
+def throttle_rates():
+    return getattr(settings, 'THROTTLE_RATES', DEFAULT_THROTTLE_RATES)
+
+
+def parse_rate(rate):
+    """'10/hour' -> (10, 3600)"""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period.strip()[0]]
+
+
+def request_role(request):
+    return actor_for(request.user).role
+
+
+def rate_for(scope, role):
+    rates = throttle_rates().get(scope, {})
+    rate = rates.get(role, rates.get('default'))
+    return parse_rate(rate) if rate else None
+
+
+# =========================
+# Buckets
+# =========================
+def _gcra(full_at, now, interval, burst):
+    """cache.transform() step: (new full-at time, timeout, seconds to wait)"""
+    full_at = max(full_at or now, now) + interval
+    if full_at - now > burst:
+        return None, None, (full_at - now - burst) / 1000
+    return full_at, math.ceil((full_at - now) / 1000), 0
+
+
+def _interval(rate):
+    """Milliseconds per token, or None for a zero-capacity rate"""
+    capacity, period = rate
+    return max(period * 1000 // capacity, 1) if capacity else None
+
+
+def consume(key, rate):
+    """Take one token; returns 0 if allowed, else the seconds until one is free"""
+    capacity, period = rate
+    interval = _interval(rate)
+    if interval is None:
+        return period
+    now = int(time.time() * 1000)
+    burst = capacity * interval
+
+    if hasattr(cache, 'transform'):
+        return cache.transform(key, lambda full_at: _gcra(full_at, now, interval, burst))
+
+    if cache.add(key, now + interval, timeout=math.ceil(interval / 1000)):
+        return 0
+    try:
+        full_at = cache.incr(key, interval)
+    except ValueError:
+        # Expired between add() and incr(): the bucket is full again
+        cache.add(key, now + interval, timeout=math.ceil(interval / 1000))
+        return 0
+    if full_at - now > burst:
+        try:
+            cache.decr(key, interval)
+        except ValueError:
+            pass
+        return (full_at - now - burst) / 1000
+    cache.touch(key, timeout=math.ceil((full_at - now) / 1000))
+    return 0
+
+
+def peek(key, rate):
+    """consume() without taking the token"""
+    capacity, period = rate
+    interval = _interval(rate)
+    if interval is None:
+        return period
+    return _gcra(cache.get(key), int(time.time() * 1000), interval, capacity * interval)[2]
+
+
+def bucket_key(scope, ident):
+    return f'throttle:{scope}:{ident}'
+
+
+def client_ident(request):
+    """The user, or the client IP as DRF resolves it (NUM_PROXIES)"""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{BaseThrottle().get_ident(request)}'
+
+
+# =========================
+# Metrics
+# =========================
+def metric_key(scope, role):
+    return f'throttle:fired:{scope}:{role}'
+
+
+def record_throttled(scope, role):
+    key = metric_key(scope, role)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+    logger.info("Throttled %s request (%s)", scope, role)
+
+
+def throttle_metrics():
+    """{scope: {role: times throttled}} since the counters were last reset"""
+    rates = throttle_rates()
+    keys = {metric_key(scope, role): (scope, role) for scope, roles in rates.items() for role in roles}
+    counts = cache.get_many(list(keys))
+    metrics = {scope: dict.fromkeys(roles, 0) for scope, roles in rates.items()}
+    for key, count in counts.items():
+        scope, role = keys[key]
+        metrics[scope][role] = count
+    return metrics
+
+
+def check(scope, request, ident, take=True):
+    """Seconds to wait before ``request`` may proceed (0 = allowed now)"""
+    role = request_role(request)
+    rate = rate_for(scope, role)
+    if rate is None:
+        return 0
+    wait = (consume if take else peek)(bucket_key(scope, ident), rate)
+    if wait:
+        record_throttled(scope, role)
+    return wait
+
+
+def charge(scope, request):
+    """Take the token a throttle(charge=False) view only checked for"""
+    rate = rate_for(scope, request_role(request))
+    if rate is not None:
+        consume(bucket_key(scope, client_ident(request)), rate)
+
+
+# =========================
+# DRF
+# =========================
+class TokenBucketThrottle(BaseThrottle):
+    """Per-user (per-IP when anonymous) bucket for ``scope``"""
+    scope = 'api'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = check(self.scope, request, client_ident(request))
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class ComplaintSubmitThrottle(TokenBucketThrottle):
+    scope = 'complaint_submit'
+
+
+# =========================
+# Template views
+# =========================
+def throttle(scope, methods=('POST',), charge=True):
+    """
+    Rate-limit a template view; place it below @login_required.
+    With charge=False an exhausted bucket still answers 429, but the view
+    takes the token itself with charge(scope, request).
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                wait = check(scope, request, client_ident(request), take=charge)
+                if wait:
+                    retry_after = math.ceil(wait)
+                    response = render(request, 'complaints/throttled.html', {'retry_after': retry_after}, status=429)
+                    response['Retry-After'] = str(retry_after)
+                    return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
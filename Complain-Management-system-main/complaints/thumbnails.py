@@ -0,0 +1,131 @@
+"""
+Thumbnail and preview generation for image attachments
+
+Thumbnails are written next to the original as
+``<original>.thumb-<w>x<h>.<webp|jpg>``. Originals are content-addressed,
+so a thumbnail is generated once per distinct image and never goes stale.
+"""
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from .storage import attachment_storage
+
+logger = logging.getLogger(__name__)
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+DEFAULT_THUMBNAIL_SIZES = {
+    'small': (96, 96),      # list pages
+    'preview': (640, 640),  # detail page
+}
+
+_executor = None
+
+
+def get_thumbnail_sizes():
+    return getattr(settings, 'ATTACHMENT_THUMBNAIL_SIZES', DEFAULT_THUMBNAIL_SIZES)
+
+
+def thumbnail_format():
+    """WebP when Pillow was built with it, JPEG otherwise"""
+    from PIL import features
+
+    if features.check('webp'):
+        return 'WEBP', 'webp'
+    return 'JPEG', 'jpg'
+
+
+def is_image(name):
+    return bool(name) and os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def thumbnail_name(name, size):
+    width, height = get_thumbnail_sizes()[size]
+    return f"{name}.thumb-{width}x{height}.{thumbnail_format()[1]}"
+
+
+def thumbnail_names(name):
+    """All thumbnail names derived from one original (used by gc_attachments)"""
+    if not is_image(name):
+        return []
+    return [thumbnail_name(name, size) for size in get_thumbnail_sizes()]
+
+
+def has_thumbnail(name, size):
+    """True once the thumbnail has been generated"""
+    if not is_image(name):
+        return False
+    return attachment_storage().exists(thumbnail_name(name, size))
+
+
+def generate_thumbnails(name):
+    """Create every configured thumbnail size for one stored image"""
+    from PIL import Image, ImageOps
+
+    if not is_image(name):
+        return []
+
+    storage = attachment_storage()
+    pending = {
+        size: thumbnail_name(name, size)
+        for size in get_thumbnail_sizes()
+        if not storage.exists(thumbnail_name(name, size))
+    }
+    if not pending:
+        return []
+
+    pil_format, _ = thumbnail_format()
+    created = []
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        # Decode a downscaled version straight away for large JPEGs
+        largest = max(max(get_thumbnail_sizes()[size]) for size in pending)
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image).convert('RGB')
+
+        for size, thumb in pending.items():
+            copy = image.copy()
+            copy.thumbnail(get_thumbnail_sizes()[size], Image.LANCZOS)
+            buffer = io.BytesIO()
+            copy.save(buffer, pil_format, quality=80)
+            storage.save_derived(thumb, ContentFile(buffer.getvalue()))
+            created.append(thumb)
+    return created
+
+
+def _generate_safely(name):
+    try:
+        generate_thumbnails(name)
+    except Exception:
+        logger.exception("Thumbnail generation failed for %s", name)
+
+
+def schedule_thumbnails(name):
+    """Generate thumbnails in a background thread once the transaction commits"""
+    global _executor
+
+    if not is_image(name):
+        return
+    if not getattr(settings, 'ATTACHMENT_THUMBNAILS_ASYNC', True):
+        transaction.on_commit(lambda: _generate_safely(name))
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='thumbnails')
+    transaction.on_commit(lambda: _executor.submit(_generate_safely, name))
+
+
+def complaint_saved(sender, instance, **kwargs):
+    """post_save receiver for Complaint: thumbnail new or replaced images"""
+    name = instance.attachment.name if instance.attachment else ''
+    if not is_image(name):
+        return
+    storage = attachment_storage()
+    if not all(storage.exists(thumb) for thumb in thumbnail_names(name)):
+        schedule_thumbnails(name)
@@ -0,0 +1,192 @@
+"""
+Chunked, resumable attachment uploads
+
+1. POST   /api/uploads/                  {filename, size}  -> session id
+2. PUT    /api/uploads/<id>/?offset=N    raw chunk bytes   (repeat)
+3. GET    /api/uploads/<id>/             current offset, to resume after a drop
+4. POST   /api/uploads/<id>/finalize/    {sha256?}         -> validated attachment
+5. POST   /api/complaints/               {..., upload_id}
+
+Chunks are appended straight to ``complaints/.uploads/<id>.part`` on disk;
+nothing is buffered in memory beyond one read block.
+"""
+import os
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import UploadSession, upload_to
+from .storage import CHUNK_SIZE, UPLOADS_DIR, attachment_storage
+
+
+ALLOWED_EXTENSIONS = ['pdf', 'jpg', 'jpeg', 'png', 'docx']
+
+# Leading bytes expected for each allowed extension
+FILE_SIGNATURES = {
+    'pdf': [b'%PDF'],
+    'jpg': [b'\xff\xd8\xff'],
+    'jpeg': [b'\xff\xd8\xff'],
+    'png': [b'\x89PNG\r\n\x1a\n'],
+    'docx': [b'PK\x03\x04'],
+}
+
+
+class UploadError(Exception):
+    """Chunk or finalize request that cannot be applied to the session"""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.offset = offset
+
+
+def max_attachment_size():
+    return getattr(settings, 'ATTACHMENT_MAX_SIZE', 10 * 1024 * 1024)
+
+
+def max_chunk_size():
+    return getattr(settings, 'UPLOAD_CHUNK_MAX_SIZE', 2 * 1024 * 1024)
+
+
+def part_path(session):
+    return attachment_storage().path(os.path.join(UPLOADS_DIR, f"{session.pk}.part"))
+
+
+def file_extension(filename):
+    return filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+
+def write_chunk(session, offset, stream, length):
+    """
+    Append ``length`` bytes from ``stream`` at ``offset``.
+    The offset must equal the bytes already received, so a client that lost
+    a response can GET the session and resume from the reported offset.
+    """
+    if session.status != 'OPEN':
+        raise UploadError("Upload session is already finalized", status=409)
+    if offset != session.offset:
+        raise UploadError("Offset does not match received bytes", status=409, offset=session.offset)
+    if length <= 0:
+        raise UploadError("Empty chunk")
+    if length > max_chunk_size():
+        raise UploadError(f"Chunk cannot exceed {max_chunk_size()} bytes", status=413)
+    if offset + length > session.size:
+        raise UploadError("Chunk extends past the declared file size")
+
+    # Claim the byte range before touching the file, so two requests at the
+    # same offset cannot both write: the loser gets a 409 and writes nothing
+    new_offset = offset + length
+    claimed = UploadSession.objects.filter(pk=session.pk, offset=offset, status='OPEN').update(
+        offset=new_offset, updated_at=timezone.now()
+    )
+    if not claimed:
+        session.refresh_from_db()
+        raise UploadError("Concurrent chunk upload", status=409, offset=session.offset)
+
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    on_disk = os.path.getsize(path) if os.path.exists(path) else 0
+    if on_disk < offset:
+        # An earlier claimed chunk never reached the disk (the worker died)
+        release_chunk(session, new_offset, on_disk)
+        raise UploadError("Received data is incomplete; resume from offset", status=409, offset=on_disk)
+
+    written = 0
+    try:
+        with open(path, 'r+b' if on_disk else 'wb') as out:
+            # Drop any tail left by an interrupted chunk
+            out.seek(offset)
+            out.truncate()
+            while written < length:
+                block = stream.read(min(CHUNK_SIZE, length - written))
+                if not block:
+                    break
+                out.write(block)
+                written += len(block)
+    finally:
+        if written < length:
+            release_chunk(session, new_offset, offset + written)
+
+    new_offset = offset + written
+    session.offset = new_offset
+    if written < length:
+        raise UploadError("Chunk truncated; resume from offset", offset=new_offset)
+    return session
+
+
+def release_chunk(session, claimed_offset, offset):
+    """Hand back the unwritten part of a claimed range"""
+    UploadSession.objects.filter(pk=session.pk, offset=claimed_offset, status='OPEN').update(
+        offset=offset, updated_at=timezone.now()
+    )
+    session.offset = offset
+
+
+def finalize_upload(session, sha256=None):
+    """Validate the assembled file and move it into attachment storage"""
+    if session.status != 'OPEN':
+        raise UploadError("Upload session is already finalized", status=409)
+    if session.offset != session.size:
+        raise UploadError("Upload is incomplete", status=409, offset=session.offset)
+
+    # Claim the session first so a retried finalize cannot move the file twice;
+    # claim_upload() ignores COMPLETE sessions until the attachment is set
+    claimed = UploadSession.objects.filter(pk=session.pk, status='OPEN', offset=session.size).update(
+        status='COMPLETE', attachment='', updated_at=timezone.now()
+    )
+    if not claimed:
+        raise UploadError("Upload session is already finalized", status=409)
+
+    try:
+        name = _store_upload(session, sha256)
+    except BaseException:
+        UploadSession.objects.filter(pk=session.pk, status='COMPLETE', attachment='').update(
+            status='OPEN', updated_at=timezone.now()
+        )
+        raise
+
+    session.attachment = name
+    session.status = 'COMPLETE'
+    session.save(update_fields=['attachment', 'status', 'updated_at'])
+    return session
+
+
+def _store_upload(session, sha256):
+    path = part_path(session)
+    if not os.path.exists(path) or os.path.getsize(path) != session.size:
+        raise UploadError("Uploaded data is missing; restart the upload", status=410)
+
+    ext = file_extension(session.filename)
+    with open(path, 'rb') as assembled:
+        head = assembled.read(16)
+    if not any(head.startswith(sig) for sig in FILE_SIGNATURES.get(ext, [])):
+        raise UploadError("File content does not match its extension")
+
+    try:
+        return attachment_storage().save_local_file(
+            upload_to(None, session.filename), path, expected_sha256=sha256
+        )
+    except ValueError as exc:
+        raise UploadError(str(exc))
+
+
+def claim_upload(session):
+    """
+    Mark a finalized upload as attached and return its stored name.
+    The conditional UPDATE lets only one complaint claim a session.
+    """
+    claimed = UploadSession.objects.filter(pk=session.pk, status='COMPLETE').exclude(attachment='').update(
+        status='ATTACHED', updated_at=timezone.now()
+    )
+    if not claimed:
+        raise UploadError("Upload is not finalized or already attached", status=409)
+    return session.attachment
+
+
+def discard_upload(session):
+    """Abort a session and remove any partial data"""
+    path = part_path(session)
+    if os.path.exists(path):
+        os.remove(path)
+    session.delete()
@@ -1,26 +1,35 @@
+from django.conf import settings
 from django.urls import path,include
 from rest_framework.routers import DefaultRouter
 from rest_framework.authtoken.views import obtain_auth_token
-from . import views
+from . import async_views, views
+
+# Async versions of the read-heavy views, for ASGI deployments
+read_views = async_views if getattr(settings, 'ASYNC_READ_VIEWS', False) else views
 # API Router
 router = DefaultRouter()
 router.register(r'complaints', views.ComplaintViewSet, basename='complaint')
 router.register(r'feedback', views.FeedbackViewSet)
 router.register(r'notifications', views.NotificationViewSet)
+router.register(r'uploads', views.UploadSessionViewSet, basename='upload')
 
 urlpatterns = [
     # Web URLs
-    path('', views.dashboard, name='dashboard'),
-    path('dashboard/', views.dashboard, name='dashboard'),
-    path('complaints/', views.complaint_list, name='complaint_list'),
+    path('', read_views.dashboard, name='dashboard'),
+    path('dashboard/', read_views.dashboard, name='dashboard'),
+    path('complaints/', read_views.complaint_list, name='complaint_list'),
     path('complaints/new/', views.create_complaint, name='create_complaint'),
-    path('complaints/<str:complaint_no>/', views.complaint_detail, name='complaint_detail'),
+    path('complaints/<str:complaint_no>/', read_views.complaint_detail, name='complaint_detail'),
     path('complaints/<str:complaint_no>/edit/', views.update_complaint, name='update_complaint'),
+    path('complaints/<str:complaint_no>/attachment/', views.complaint_attachment, name='complaint_attachment'),
+    path('complaints/<str:complaint_no>/history/', views.complaint_history, name='complaint_history'),
     path('complaints/<str:complaint_no>/assign/', views.assign_complaint, name='assign_complaint'),
+    path('complaints/<str:complaint_no>/merge/', views.merge_complaint, name='merge_complaint'),
     path('complaints/<str:complaint_no>/feedback/', views.add_feedback, name='add_feedback'),
     path('complaints/<str:complaint_no>/update-status/', views.update_complaint_status, name='update_complaint_status'),
     path('register/', views.register, name='register'),
     path('faculty-directory/', views.faculty_directory, name='faculty_directory'),
+    path('faculty-leaderboard/', views.faculty_leaderboard, name='faculty_leaderboard'),
     path('reports/', views.complaint_report, name='complaint_report'),
     path('reports/pdf/', views.complaint_report_pdf, name='complaint_report_pdf'),
 
@@ -33,9 +42,15 @@ urlpatterns = [
     path('complaints/<str:complaint_no>/assign/',views.assign_complaint,name='assign_complaint'),
 
     # API URLs
+    *([
+        path('api/notifications/', async_views.notification_list, name='notification-list'),
+    ] if read_views is async_views else []),
     path('api/', include(router.urls)),
     path('api/auth/token/', obtain_auth_token, name='api_token_auth'),
-    path('api/stats/', views.complaint_stats, name='complaint_stats'),
+    path('api/stats/', read_views.complaint_stats, name='complaint_stats'),
+    path('api/analytics/resolution/', views.resolution_analytics, name='resolution_analytics'),
+    path('api/throttles/', views.throttle_stats, name='throttle_stats'),
+    path('api/changes/', views.change_feed, name='change_feed'),
     path('api/export/', views.export_complaints, name='export_complaints'),
     path('api/schema/', include('rest_framework.urls')),
     path('ajax/load-subcategories/', views.load_subcategories, name='ajax_load_subcategories'),
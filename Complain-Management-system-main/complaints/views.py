@@ -6,7 +6,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User, Group
 from django.contrib.auth import login, logout
 from django.contrib import messages
-from django.http import HttpResponse, JsonResponse, HttpResponseRedirect
+from django.http import HttpResponse, JsonResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.core.paginator import Paginator
 from django.db.models import Q, Count, Avg
 from django.utils import timezone
@@ -17,6 +17,7 @@ from django.views.decorators.http import require_http_methods
 from django.db import transaction
 from django.urls import reverse
 from django.http import Http404
+from django.core.exceptions import ValidationError as DjangoValidationError
 from .forms import ComplaintAssignmentForm
 from .forms import StudentComplaintEditForm
 from datetime import timedelta
@@ -29,122 +30,107 @@ from reportlab.pdfgen import canvas
 from django.http import HttpResponse
 
 # REST Framework imports
-from rest_framework import viewsets, status, permissions, filters
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework import viewsets, mixins, status, permissions, filters
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.authtoken.models import Token
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
 
 # Local imports
 from .models import (
     UserProfile,
-    Complaint, ComplaintHistory, Feedback, Notification
+    Complaint, ComplaintHistory, Feedback, Notification, UploadSession, FacultyWorkload
 )
+from .sla import priority_for
+from .uploads import UploadError, write_chunk, finalize_upload, discard_upload
+from .permissions import can_view_complaint, can_merge_complaint
+from .attachments import serve_attachment
+from .bulk import select_complaints, bulk_update_status, bulk_assign
+from .history import history_page
+from .analytics import cached_resolution_report
+from .assignment import choose_assignee
+from .duplicates import duplicates_for, merge_complaints
+from .throttling import ComplaintSubmitThrottle, charge as charge_throttle, throttle, throttle_metrics
+from .changes import change_page, cursor_expired, iter_changes, max_page_size, page_size
+from .renderers import NDJSONRenderer
 from .forms import UserRegisterForm, ComplaintForm, FeedbackForm
 from .serializers import (
     UserProfileSerializer,
     ComplaintListSerializer, ComplaintDetailSerializer,
     ComplaintCreateSerializer, ComplaintUpdateSerializer, ComplaintAssignmentSerializer,
     ComplaintHistorySerializer, FeedbackSerializer, NotificationSerializer,
-    UserSerializer, ComplaintStatsSerializer
+    UserSerializer, ComplaintStatsSerializer, UploadSessionSerializer,
+    ComplaintBulkStatusSerializer, ComplaintBulkAssignSerializer
 )
 
 logger = logging.getLogger(__name__)
 
 
 # Template Views
-@login_required
-def dashboard(request):
-    """Role-aware dashboard"""
-    user_profile = getattr(request.user, 'profile', None)
-    
-    # Admin users (staff/superuser) have full access even without profile
-    is_admin = request.user.is_staff or request.user.is_superuser
-    
-    if not user_profile and not is_admin:
-        messages.error(request, "User profile not found. Please contact administrator.")
-        return redirect('logout')
-    
-    role = user_profile.role if user_profile else ('admin' if is_admin else 'student')
+# The querysets and contexts below are shared with async_views.py
+def dashboard_querysets(actor, user):
+    """(role, {stat: queryset}, recent complaints) for the role-aware dashboard"""
+    role = actor.role if actor.has_profile else 'admin'
     
     # Get complaint statistics based on role
-    if role == 'admin' or is_admin:
+    if role == 'admin' or actor.is_admin:
         complaints = Complaint.objects.all()
-        stats = {
-            'total': complaints.count(),
-            'pending': complaints.filter(status='PENDING').count(),
-            'in_progress': complaints.filter(status='PROCESSING').count(),
-            'resolved': complaints.filter(status='RESOLVED').count(),
-            'closed': complaints.filter(status='COMPLETED').count(),
-        }
-        recent_complaints = complaints.order_by('-created_at')[:10]
-        
     elif role == 'hod':
         complaints = Complaint.objects.all()
-
-        stats = {
-            'total': complaints.count(),
-            'pending': complaints.filter(status='PENDING').count(),
-            'in_progress': complaints.filter(status='PROCESSING').count(),
-            'resolved': complaints.filter(status='RESOLVED').count(),
-        }
-
-        recent_complaints = complaints.order_by('-created_at')[:10]
-    
     elif role == 'faculty':
-        assigned_complaints = Complaint.objects.filter(
-            assigned_to=request.user
-        )
-
-        my_complaints = Complaint.objects.filter(
-            user=request.user
+        complaints = Complaint.objects.filter(
+            assigned_to=user
         )
+    else:  # student
+        complaints = Complaint.objects.filter(user=user)
+    
+    stats = {
+        'total': complaints,
+        'pending': complaints.filter(status='PENDING'),
+        'in_progress': complaints.filter(status='PROCESSING'),
+        'resolved': complaints.filter(status='RESOLVED'),
+    }
+    if role not in ('hod', 'faculty') or actor.is_admin:
+        stats['closed'] = complaints.filter(status='COMPLETED')
+    
+    recent_complaints = complaints.order_by('-created_at')[:10]
+    return role, stats, recent_complaints
 
-        stats = {
-            'total': assigned_complaints.count(),
-            'pending': assigned_complaints.filter(status='PENDING').count(),
-            'in_progress': assigned_complaints.filter(status='PROCESSING').count(),
-            'resolved': assigned_complaints.filter(status='RESOLVED').count(),
-        }
-
-        recent_complaints = assigned_complaints.order_by('-created_at')[:10]
 
+@login_required
+def dashboard(request):
+    """Role-aware dashboard"""
+    actor = request.actor
     
-    else:  # student
-        complaints = Complaint.objects.filter(user=request.user)
-        stats = {
-            'total': complaints.count(),
-            'pending': complaints.filter(status='PENDING').count(),
-            'in_progress': complaints.filter(status='PROCESSING').count(),
-            'resolved': complaints.filter(status='RESOLVED').count(),
-            'closed': complaints.filter(status='COMPLETED').count(),
-        }
-        recent_complaints = complaints.order_by('-created_at')[:10]
+    # Admin users (staff/superuser) have full access even without profile
+    if not actor.has_profile and not actor.is_admin:
+        messages.error(request, "User profile not found. Please contact administrator.")
+        return redirect('logout')
+    
+    role, stats, recent_complaints = dashboard_querysets(actor, request.user)
     
     context = {
         'role': role,
-        'stats': stats,
+        'stats': {name: queryset.count() for name, queryset in stats.items()},
         'recent_complaints': recent_complaints,
     }
     
     return render(request, 'complaints/dashboard.html', context)
 
 
-@login_required
-def complaint_list(request):
-    user_profile = getattr(request.user, 'profile', None)
-    is_admin = request.user.is_staff or request.user.is_superuser
-    role = user_profile.role if user_profile else 'student'
+def complaint_list_queryset(actor, user, tab):
+    """(complaints, tab) listed for ``actor``; ``tab`` is the ?tab= value or None"""
+    role = actor.role
 
-    tab = request.GET.get('tab', 'assigned')
-
-    if role == 'admin' or is_admin:
+    if role == 'admin' or actor.is_admin:
         complaints = Complaint.objects.all()
 
     elif role == 'hod':
-        tab = request.GET.get('tab', 'student')
+        tab = tab or 'student'
 
         if tab == 'faculty':
             complaints = Complaint.objects.filter(
@@ -158,48 +144,56 @@ def complaint_list(request):
 
     elif role == 'faculty':
         if tab == 'mine':
-            complaints = Complaint.objects.filter(user=request.user)
+            complaints = Complaint.objects.filter(user=user)
         else:
-            complaints = Complaint.objects.filter(assigned_to=request.user)
+            complaints = Complaint.objects.filter(assigned_to=user)
 
     else:  # student
-        complaints = Complaint.objects.filter(user=request.user)
+        complaints = Complaint.objects.filter(user=user)
 
     # 🔥 CRITICAL FIX
     complaints = complaints.exclude(complaint_no__isnull=True).exclude(complaint_no="")
 
-    paginator = Paginator(complaints.order_by('-created_at'), 20)
+    complaints = complaints.select_related('user', 'assigned_to', 'category', 'subcategory')
+    return complaints.order_by('-created_at'), tab or 'assigned'
+
+
+@login_required
+def complaint_list(request):
+    complaints, tab = complaint_list_queryset(request.actor, request.user, request.GET.get('tab'))
+
+    paginator = Paginator(complaints, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
     return render(request, 'complaints/complaint_list.html', {
         'page_obj': page_obj,
-        'role': role,
+        'role': request.actor.role,
         'tab': tab,
     })
 
 
-@login_required
-def complaint_detail(request, complaint_no):
-    """Complaint detail view"""
-    complaint = get_object_or_404(Complaint, complaint_no=complaint_no)
-    user_profile = getattr(request.user, 'profile', None)
-    role = user_profile.role if user_profile else 'student'
+def complaint_detail_queryset():
+    return Complaint.objects.select_related(
+        'user__profile', 'assigned_to__profile', 'category', 'subcategory',
+        'feedback', 'duplicate_of'
+    )
+
+
+def can_merge_duplicates(user, complaint):
+    """Possible duplicates are only shown to users who can merge them"""
+    return (
+        complaint.status in ('PENDING', 'PROCESSING')
+        and complaint.duplicate_of_id is None
+        and can_merge_complaint(user, complaint)
+    )
+
+
+def complaint_detail_context(request, complaint, history, history_cursor, duplicates):
+    role = request.actor.role
     
     # Admin users (staff/superuser) have full access
-    is_admin = request.user.is_staff or request.user.is_superuser
-    
-    # Check permissions
-    if not is_admin:
-        if role == 'student' and complaint.user != request.user:
-            raise Http404("Complaint not found")
-        elif role == 'faculty' and complaint.assigned_to != request.user and complaint.user != request.user:
-            raise Http404("Complaint not found")
-        elif role == 'hod':
-            pass
-    
-    # Get complaint history
-    history = complaint.history.all().order_by('-timestamp')
+    is_admin = request.actor.is_admin
     
     # Get feedback if exists
     try:
@@ -212,9 +206,10 @@ def complaint_detail(request, complaint_no):
     if role == 'hod' or is_admin:
         assign_form = ComplaintAssignmentForm(user=request.user)
 
-    context = {
+    return {
     'complaint': complaint,
     'history': history,
+    'history_cursor': history_cursor,
     'feedback': feedback,
     'role': role,
 
@@ -236,6 +231,9 @@ def complaint_detail(request, complaint_no):
 
     'assign_form': assign_form,
 
+    'can_merge': can_merge_duplicates(request.user, complaint),
+    'duplicates': duplicates,
+
     'can_feedback': (
     complaint.user == request.user and
     complaint.status == 'RESOLVED' and
@@ -245,16 +243,84 @@ def complaint_detail(request, complaint_no):
 
 }
 
+
+@login_required
+def complaint_detail(request, complaint_no):
+    """Complaint detail view"""
+    complaint = get_object_or_404(complaint_detail_queryset(), complaint_no=complaint_no)
     
+    # Check permissions
+    if not can_view_complaint(request.user, complaint):
+        raise Http404("Complaint not found")
+    
+    # Newest history entries; older ones load on demand from complaint_history
+    history, history_cursor = history_page(complaint)
+    duplicates = duplicates_for(complaint) if can_merge_duplicates(request.user, complaint) else []
+    
+    context = complaint_detail_context(request, complaint, history, history_cursor, duplicates)
     return render(request, 'complaints/complaint_detail.html', context)
 
 
 @login_required
+def complaint_attachment(request, complaint_no):
+    """Permission-checked attachment download (?size=small|preview for thumbnails)"""
+    complaint = get_object_or_404(Complaint, complaint_no=complaint_no)
+    
+    if not complaint.attachment or not can_view_complaint(request.user, complaint):
+        raise Http404("Attachment not found")
+    
+    return serve_attachment(request, complaint.attachment.name, size=request.GET.get('size'))
+
+
+@login_required
+def complaint_history(request, complaint_no):
+    """Older history entries for the detail page and admin inline (?cursor=)"""
+    complaint = get_object_or_404(Complaint, complaint_no=complaint_no)
+    
+    if not can_view_complaint(request.user, complaint):
+        raise Http404("Complaint not found")
+    
+    try:
+        entries, next_cursor = history_page(complaint, cursor=request.GET.get('cursor'))
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    
+    return JsonResponse({
+        'results': ComplaintHistorySerializer(entries, many=True).data,
+        'next_cursor': next_cursor,
+    })
+
+
+@login_required
+@require_http_methods(["POST"])
+def merge_complaint(request, complaint_no):
+    """Close this complaint as a duplicate of the one posted as 'into'"""
+    complaint = get_object_or_404(Complaint, complaint_no=complaint_no)
+    primary = Complaint.objects.filter(complaint_no=request.POST.get('into', '')).first()
+    
+    if not can_view_complaint(request.user, complaint) or not can_merge_complaint(request.user, complaint):
+        raise Http404("Complaint not found")
+    if primary is None or not can_view_complaint(request.user, primary):
+        messages.error(request, "Complaint to merge into was not found.")
+        return redirect('complaint_detail', complaint_no=complaint_no)
+    
+    try:
+        merge_complaints(complaint, primary, request.user)
+    except ValueError as exc:
+        messages.error(request, str(exc))
+        return redirect('complaint_detail', complaint_no=complaint_no)
+    
+    messages.success(request, f"{complaint.complaint_no} merged into {primary.complaint_no}.")
+    return redirect('complaint_detail', complaint_no=primary.complaint_no)
+
+
+@login_required
+@throttle('complaint_submit', charge=False)
 def create_complaint(request):
     """Create new complaint"""
-    user_profile = getattr(request.user, 'profile', None)
+    actor = request.actor
 
-    if not user_profile or user_profile.role not in ['student', 'faculty']:
+    if not actor.has_profile or actor.role not in ['student', 'faculty']:
         messages.error(request, "Only students and faculty can create complaints.")
         return redirect('dashboard')
 
@@ -267,27 +333,19 @@ def create_complaint(request):
             complaint = form.save(commit=False)
             complaint.user = request.user
 
-            # ✅ AUTO ASSIGN FACULTY (priority: subcategory → category)
-            # ✅ AUTO ASSIGN FACULTY (subcategory > category)
-            if complaint.subcategory and complaint.subcategory.faculty:
-                complaint.assigned_to = complaint.subcategory.faculty
-            elif complaint.category and complaint.category.faculty:
-                complaint.assigned_to = complaint.category.faculty
-            else:
-                complaint.assigned_to = None
+            # ✅ AUTO ASSIGN FACULTY (balanced pool, then subcategory > category)
+            complaint.assigned_to = choose_assignee(complaint.category, complaint.subcategory)
 
             # ✅ AUTO PRIORITY LOGIC
             category_name = str(complaint.category)
             subcategory_name = str(complaint.subcategory) if complaint.subcategory else ''
 
-            # ✅ PRIORITY FROM SUBCATEGORY / CATEGORY
-            if complaint.subcategory:
-                complaint.priority = complaint.subcategory.priority
-            elif complaint.category:
-                complaint.priority = 'Medium'   # fallback
+            # ✅ PRIORITY FROM SUBCATEGORY (Medium fallback)
+            complaint.priority = priority_for(complaint.subcategory)
 
             complaint.save()
             print("COMPLAINT SAVED:", complaint.id)
+            charge_throttle('complaint_submit', request)
 
             # ✅ Create history entry
             ComplaintHistory.objects.create(
@@ -310,7 +368,7 @@ def create_complaint(request):
                 )
 
             # ✅ Notify assigned faculty if complaint created by faculty
-            if user_profile.role == 'faculty' and complaint.assigned_to:
+            if actor.role == 'faculty' and complaint.assigned_to:
                 Notification.objects.create(
                     user=complaint.assigned_to,
                     message=(
@@ -324,6 +382,16 @@ def create_complaint(request):
                 request,
                 f"Complaint {complaint.complaint_no} created successfully!"
             )
+
+            # ✅ Flag likely duplicates (LSH lookup, independent of table size)
+            duplicates = duplicates_for(complaint)
+            if duplicates:
+                messages.info(
+                    request,
+                    "Similar open complaints already exist: "
+                    + ", ".join(duplicate.complaint_no for duplicate, _ in duplicates)
+                    + ". Staff may merge yours into one of them."
+                )
             return redirect('complaint_detail', complaint_no=complaint.complaint_no)
 
     else:
@@ -343,10 +411,9 @@ from .forms import ComplaintForm, ComplaintUpdateForm
 def update_complaint(request, complaint_no):
     complaint = get_object_or_404(Complaint, complaint_no=complaint_no)
     user = request.user
-    profile = getattr(user, 'profile', None)
-    role = profile.role if profile else 'student'
+    role = request.actor.role
 
-    is_admin = user.is_staff or user.is_superuser
+    is_admin = request.actor.is_admin
 
     # ==========================
     # PERMISSION CHECK
@@ -435,10 +502,8 @@ def update_complaint(request, complaint_no):
 @login_required
 def assign_complaint(request, complaint_no):
     complaint = get_object_or_404(Complaint, complaint_no=complaint_no)
-    user_profile = getattr(request.user, 'profile', None)
-
     # ✅ Only HOD or Admin can reassign
-    if not user_profile or user_profile.role != 'hod':
+    if request.actor.role != 'hod':
         raise Http404("Not allowed")
     
     if complaint.user.profile.role == 'faculty':
@@ -588,19 +653,54 @@ class ComplaintViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter complaints based on user role"""
-        user_profile = getattr(self.request.user, 'profile', None)
-        role = user_profile.role if user_profile else 'student'
+        role = self.request.actor.role
         
         if role == 'admin':
-            return Complaint.objects.all()
+            queryset = Complaint.objects.all()
         elif role == 'hod':
-            return Complaint.objects.filter(assigned_to=self.request.user)
+            queryset = Complaint.objects.filter(assigned_to=self.request.user)
         elif role == 'faculty':
-            return Complaint.objects.filter(
+            queryset = Complaint.objects.filter(
                 Q(assigned_to=self.request.user) | Q(user=self.request.user)
             )
         else:  # student
-            return Complaint.objects.filter(user=self.request.user)
+            queryset = Complaint.objects.filter(user=self.request.user)
+        
+        if self.action == 'retrieve':
+            # Load what the selected ComplaintDetailSerializer fields render up front
+            fields = ComplaintDetailSerializer.selected_fields(**self.sparse_params())
+            queryset = ComplaintDetailSerializer.setup_queryset(queryset, fields)
+        return queryset
+    
+    def sparse_params(self):
+        """
+        ``?fields=a,b`` and ``?expand=x,y`` for list and retrieve.
+
+        A missing or blank ``fields`` keeps every field; a missing
+        ``expand`` embeds every nested object, a blank one embeds none.
+        """
+        if not hasattr(self, '_sparse_params'):
+            params = {}
+            if self.action in ('list', 'retrieve'):
+                fields = self.request.query_params.get('fields', '')
+                if fields.strip():
+                    params['fields'] = [name for name in (part.strip() for part in fields.split(',')) if name]
+                if 'expand' in self.request.query_params:
+                    expand = self.request.query_params['expand']
+                    params['expand'] = [name for name in (part.strip() for part in expand.split(',')) if name]
+                self.get_serializer_class().validate_sparse_params(**params)
+            self._sparse_params = params
+        return self._sparse_params
+    
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action == 'create':
+            throttles.append(ComplaintSubmitThrottle())
+        return throttles
+    
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.sparse_params())
+        return super().get_serializer(*args, **kwargs)
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -613,13 +713,30 @@ class ComplaintViewSet(viewsets.ModelViewSet):
         else:
             return ComplaintDetailSerializer
     
+    def list(self, request, *args, **kwargs):
+        """Paginated list rendered from annotated values() rows"""
+        fields = ComplaintListSerializer.selected_fields(**self.sparse_params())
+        queryset = ComplaintListSerializer.list_values(self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
+        if page is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
+    
     def perform_create(self, serializer):
         """Create complaint with user"""
-        user_profile = getattr(self.request.user, 'profile', None)
-        if not user_profile or user_profile.role not in ['student', 'faculty']:
+        actor = self.request.actor
+        if not actor.has_profile or actor.role not in ['student', 'faculty']:
             raise PermissionError("Only students and faculty can create complaints")
         
-        complaint = serializer.save(user=self.request.user)
+        complaint = serializer.save(
+            user=self.request.user,
+            priority=priority_for(serializer.validated_data.get('subcategory')),
+            assigned_to=choose_assignee(
+                serializer.validated_data.get('category'),
+                serializer.validated_data.get('subcategory')
+            )
+        )
         
         # Create history entry
         ComplaintHistory.objects.create(
@@ -629,6 +746,25 @@ class ComplaintViewSet(viewsets.ModelViewSet):
             to_status='PENDING',
             remarks='Complaint created via API'
         )
+        self.possible_duplicates = duplicates_for(complaint)
+    
+    def create(self, request, *args, **kwargs):
+        """Create, and flag likely duplicates in the response"""
+        response = super().create(request, *args, **kwargs)
+        response.data['possible_duplicates'] = self.duplicate_payload(self.possible_duplicates)
+        return response
+    
+    def duplicate_payload(self, duplicates):
+        return [
+            {
+                'id': duplicate.pk,
+                'complaint_no': duplicate.complaint_no,
+                'title': duplicate.title,
+                'status': duplicate.status,
+                'similarity': round(score, 2),
+            }
+            for duplicate, score in duplicates
+        ]
     
     @action(detail=True, methods=['post'])
     def assign(self, request, pk=None):
@@ -663,6 +799,98 @@ class ComplaintViewSet(viewsets.ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'])
+    def bulk_update_status(self, request):
+        """Change the status of many complaints in one transaction"""
+        serializer = ComplaintBulkStatusSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            queryset = select_complaints(self.get_queryset(), data.get('ids'), data.get('filters'))
+        except (TypeError, ValueError, DjangoValidationError) as exc:
+            return Response({'error': f'Invalid filter value: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+        result = bulk_update_status(
+            request.user, queryset, data['status'],
+            remarks=data.get('remarks', ''), ids=data.get('ids')
+        )
+        return Response(result)
+
+    @action(detail=False, methods=['post'])
+    def bulk_assign(self, request):
+        """Assign many complaints to one faculty member in one transaction"""
+        if not request.user.is_staff:
+            return Response(
+                {'error': 'Only administrators can assign complaints'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = ComplaintBulkAssignSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            queryset = select_complaints(self.get_queryset(), data.get('ids'), data.get('filters'))
+        except (TypeError, ValueError, DjangoValidationError) as exc:
+            return Response({'error': f'Invalid filter value: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+        result = bulk_assign(
+            request.user, queryset, data['assigned_to'],
+            remarks=data.get('remarks', ''), ids=data.get('ids')
+        )
+        return Response(result)
+
+    @action(detail=True, methods=['get'])
+    def duplicates(self, request, pk=None):
+        """Open complaints that look like duplicates of this one"""
+        complaint = self.get_object()
+        if not can_merge_complaint(request.user, complaint):
+            return Response(
+                {'error': 'You cannot merge this complaint'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response(self.duplicate_payload(duplicates_for(complaint)))
+
+    @action(detail=True, methods=['post'])
+    def merge(self, request, pk=None):
+        """Close this complaint as a duplicate of {'into': <id or complaint_no>}"""
+        complaint = self.get_object()
+        if not can_merge_complaint(request.user, complaint):
+            return Response(
+                {'error': 'You cannot merge this complaint'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        into = str(request.data.get('into', ''))
+        lookup = Q(complaint_no=into) | Q(pk=into) if into.isdigit() else Q(complaint_no=into)
+        primary = Complaint.objects.filter(lookup).first() if into else None
+        if primary is None or not can_view_complaint(request.user, primary):
+            return Response({'error': 'Complaint to merge into was not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            merge_complaints(complaint, primary, request.user)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'message': f'{complaint.complaint_no} merged into {primary.complaint_no}'})
+
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """Complaint history, newest first, keyset-paginated with ?cursor="""
+        complaint = self.get_object()
+        try:
+            entries, next_cursor = history_page(complaint, cursor=request.query_params.get('cursor'))
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        next_url = None
+        if next_cursor:
+            next_url = request.build_absolute_uri(
+                reverse('complaint-history', args=[complaint.pk]) + f'?cursor={next_cursor}'
+            )
+        return Response({
+            'next': next_url,
+            'results': ComplaintHistorySerializer(entries, many=True, context={'request': request}).data,
+        })
+    
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         """Get complaint statistics"""
@@ -685,8 +913,7 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter feedback based on user role"""
-        user_profile = getattr(self.request.user, 'profile', None)
-        role = user_profile.role if user_profile else 'student'
+        role = self.request.actor.role
         
         if role == 'admin':
             return Feedback.objects.all()
@@ -714,7 +941,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return Notification.objects.filter(user=self.request.user).order_by('-created_at', '-id')
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
@@ -725,65 +952,212 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({'message': 'Notification marked as read'})
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def complaint_stats(request):
-    """Get complaint statistics"""
-    user_profile = getattr(request.user, 'profile', None)
-    role = user_profile.role if user_profile else 'student'
+class UploadSessionViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """API viewset for chunked, resumable attachment uploads"""
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    
+    def perform_destroy(self, instance):
+        discard_upload(instance)
+    
+    def upload_error(self, exc):
+        data = {'error': exc.message}
+        if exc.offset is not None:
+            data['offset'] = exc.offset
+        return Response(data, status=exc.status)
+    
+    def update(self, request, pk=None):
+        """PUT one chunk of raw bytes at ?offset= (or the Upload-Offset header)"""
+        session = self.get_object()
+        try:
+            offset = int(request.headers.get('Upload-Offset', request.query_params.get('offset', '')))
+        except ValueError:
+            return Response({'error': 'A numeric offset is required'}, status=status.HTTP_400_BAD_REQUEST)
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+        
+        # Read the raw body stream so the chunk goes straight to disk
+        try:
+            write_chunk(session, offset, request.stream, length)
+        except UploadError as exc:
+            return self.upload_error(exc)
+        
+        return Response(self.get_serializer(session).data)
+    
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """Assemble and validate the upload; returns the id to attach to a complaint"""
+        session = self.get_object()
+        try:
+            finalize_upload(session, sha256=request.data.get('sha256'))
+        except UploadError as exc:
+            return self.upload_error(exc)
+        
+        return Response(self.get_serializer(session).data)
+
+
+def stats_queryset(actor, user):
+    """Base queryset of complaint_stats for the actor's role"""
+    role = actor.role
     
-    # Base queryset based on role
     if role == 'admin':
-        complaints = Complaint.objects.all()
+        return Complaint.objects.all()
     elif role == 'hod':
-        complaints = Complaint.objects.filter(assigned_to=request.user)
+        return Complaint.objects.filter(assigned_to=user)
     elif role == 'faculty':
-        complaints = Complaint.objects.filter(
-            Q(assigned_to=request.user) | Q(user=request.user)
+        return Complaint.objects.filter(
+            Q(assigned_to=user) | Q(user=user)
         )
     else:  # student
-        complaints = Complaint.objects.filter(user=request.user)
+        return Complaint.objects.filter(user=user)
+
+
+def stats_count_querysets(complaints):
+    return {
+        'total_complaints': complaints,
+        'pending_complaints': complaints.filter(status='PENDING'),
+        'in_progress_complaints': complaints.filter(status='PROCESSING'),
+        'resolved_complaints': complaints.filter(status='RESOLVED'),
+        'closed_complaints': complaints.filter(status='COMPLETED'),
+    }
+
+
+def resolved_time_pairs(complaints):
+    return complaints.filter(status='RESOLVED', resolved_at__isnull=False).values_list('created_at', 'resolved_at')
+
+
+def average_resolution_time(pairs):
+    resolution_times = [resolved_at - created_at for created_at, resolved_at in pairs]
+    if resolution_times:
+        return sum(resolution_times, timedelta()) / len(resolution_times)
+    return None
+
+
+def stats_month_querysets(complaints):
+    """[(YYYY-MM, queryset)] for the last 12 months, newest first"""
+    months = []
+    for i in range(12):
+        month_start = timezone.now().replace(day=1) - timedelta(days=30*i)
+        month_end = month_start + timedelta(days=30)
+        months.append((month_start.strftime('%Y-%m'), complaints.filter(created_at__range=[month_start, month_end])))
+    return months
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def complaint_stats(request):
+    """Get complaint statistics"""
+    complaints = stats_queryset(request.actor, request.user)
     
     # Calculate statistics
-    stats = {
-        'total_complaints': complaints.count(),
-        'pending_complaints': complaints.filter(status='PENDING').count(),
-        'in_progress_complaints': complaints.filter(status='PROCESSING').count(),
-        'resolved_complaints': complaints.filter(status='RESOLVED').count(),
-        'closed_complaints': complaints.filter(status='COMPLETED').count(),
-    }
+    stats = {name: queryset.count() for name, queryset in stats_count_querysets(complaints).items()}
     
     # Calculate average resolution time
-    resolved_complaints = complaints.filter(status='RESOLVED', resolved_at__isnull=False)
-    if resolved_complaints.exists():
-        resolution_times = []
-        for complaint in resolved_complaints:
-            resolution_time = complaint.resolved_at - complaint.created_at
-            resolution_times.append(resolution_time)
-        
-        if resolution_times:
-            avg_resolution_time = sum(resolution_times, timedelta()) / len(resolution_times)
-            stats['avg_resolution_time'] = avg_resolution_time
+    avg_resolution_time = average_resolution_time(resolved_time_pairs(complaints))
+    if avg_resolution_time is not None:
+        stats['avg_resolution_time'] = avg_resolution_time
     
     # Complaints by month (last 12 months)
-    month_stats = {}
-    for i in range(12):
-        month_start = timezone.now().replace(day=1) - timedelta(days=30*i)
-        month_end = month_start + timedelta(days=30)
-        count = complaints.filter(created_at__range=[month_start, month_end]).count()
-        month_stats[month_start.strftime('%Y-%m')] = count
-    stats['complaints_by_month'] = month_stats
+    stats['complaints_by_month'] = {
+        month: queryset.count() for month, queryset in stats_month_querysets(complaints)
+    }
     
     serializer = ComplaintStatsSerializer(stats)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def resolution_analytics(request):
+    """Resolution-time percentiles and histograms per category, subcategory and faculty"""
+    role = request.actor.role
+    
+    # Same visibility as complaint_stats
+    if role == 'admin' or request.user.is_staff:
+        complaints, scope = Complaint.objects.all(), 'all'
+    elif role == 'hod':
+        complaints, scope = Complaint.objects.filter(assigned_to=request.user), f'hod:{request.user.pk}'
+    elif role == 'faculty':
+        complaints = Complaint.objects.filter(
+            Q(assigned_to=request.user) | Q(user=request.user)
+        )
+        scope = f'faculty:{request.user.pk}'
+    else:  # student
+        complaints, scope = Complaint.objects.filter(user=request.user), f'student:{request.user.pk}'
+    
+    try:
+        days = int(request.query_params.get('days', 365))
+    except ValueError:
+        days = 0
+    if not 1 <= days <= 3650:
+        return Response({'error': 'days must be between 1 and 3650'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(cached_resolution_report(complaints, scope, days=days))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def throttle_stats(request):
+    """How often each rate limit has refused a request, per scope and role"""
+    return Response(throttle_metrics())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes([*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer])
+def change_feed(request):
+    """
+    Complaints, history, feedback and notifications changed after ?since=.
+    JSON is one keyset page (follow ``next``); with Accept: application/x-ndjson
+    (or ?format=ndjson) every change up to the head is streamed, one per line.
+    """
+    try:
+        since = int(request.query_params.get('since', 0))
+        limit = int(request.query_params.get('limit', page_size()))
+    except ValueError:
+        return Response({'error': 'since and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    if since < 0:
+        return Response({'error': 'since must not be negative'}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= limit <= max_page_size():
+        return Response(
+            {'error': f'limit must be between 1 and {max_page_size()}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if cursor_expired(since):
+        return Response(
+            {'error': 'Cursor is older than the retained change log; resync from since=0', 'since': 0},
+            status=status.HTTP_410_GONE
+        )
+
+    renderer = request.accepted_renderer
+    if isinstance(renderer, NDJSONRenderer):
+        return StreamingHttpResponse(
+            renderer.lines(iter_changes(since, limit)),
+            content_type=renderer.media_type
+        )
+
+    changes, cursor, has_more = change_page(since, limit)
+    return Response({
+        'results': changes,
+        'since': cursor,
+        'has_more': has_more,
+        'next': replace_query_param(request.build_absolute_uri(), 'since', cursor) if has_more else None,
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def export_complaints(request):
     """Export complaints to CSV/PDF"""
-    user_profile = getattr(request.user, 'profile', None)
-    role = user_profile.role if user_profile else 'student'
+    role = request.actor.role
     
     if role != 'admin':
         return Response({'error': 'Only administrators can export complaints'}, status=status.HTTP_403_FORBIDDEN)
@@ -879,12 +1253,58 @@ def faculty_directory(request):
     return render(request, 'complaints/faculty_directory.html', context)
 
 
+LEADERBOARD_SORTS = {
+    'open': lambda row: row['open_complaints'],
+    'resolved': lambda row: -row['resolved_complaints'],
+    'speed': lambda row: (row['avg_resolution_hours'] is None, row['avg_resolution_hours'] or 0),
+    'feedback': lambda row: -row['feedback_count'],
+}
+
+
+@login_required
+def faculty_leaderboard(request):
+    """Faculty load and performance from the materialized FacultyWorkload table (HOD/admin)"""
+    role = request.actor.role
+    is_admin = request.actor.is_admin
+    
+    if role not in ['hod', 'admin'] and not is_admin:
+        messages.error(request, "Only HODs and admins can view the faculty leaderboard.")
+        return redirect('dashboard')
+    
+    profiles = UserProfile.objects.filter(role='faculty').select_related('user', 'user__workload')
+    # HODs see their own department's faculty
+    if role == 'hod' and not is_admin and request.actor.category:
+        profiles = profiles.filter(category=request.actor.category)
+    
+    rows = []
+    for profile in profiles:
+        workload = getattr(profile.user, 'workload', None) or FacultyWorkload(user=profile.user)
+        rows.append({
+            'user': profile.user,
+            'profile': profile,
+            'open_complaints': workload.open_complaints,
+            'resolved_complaints': workload.resolved_complaints,
+            'avg_resolution_hours': workload.avg_resolution_hours,
+            'feedback_count': workload.feedback_count,
+        })
+    
+    sort = request.GET.get('sort', 'open')
+    if sort not in LEADERBOARD_SORTS:
+        sort = 'open'
+    rows.sort(key=LEADERBOARD_SORTS[sort])
+    
+    context = {
+        'rows': rows,
+        'sort': sort,
+    }
+    return render(request, 'complaints/faculty_leaderboard.html', context)
+
+
 @login_required
 def update_complaint_status(request, complaint_no):
     """Update complaint status for faculty and HOD"""
     complaint = get_object_or_404(Complaint, complaint_no=complaint_no)
-    user_profile = getattr(request.user, 'profile', None)
-    role = user_profile.role if user_profile else 'student'
+    role = request.actor.role
     
     # Check permissions
     if role not in ['faculty', 'hod']:
@@ -0,0 +1,171 @@
+"""
+Materialized faculty workload (FacultyWorkload)
+
+Per-assignee counters: open complaints, resolved complaints with their
+total resolution time, and feedback received. They back the HOD
+leaderboard and the load shown in the assignment form.
+
+Each complaint save applies the difference between the complaint's state
+before and after as one ``UPDATE ... SET n = n + delta`` per affected user.
+Set-based writes (bulk actions, SLA escalation) bypass save(), so they call
+refresh_workloads() for the users they touched. The
+rebuild_faculty_workload command recomputes every row from scratch.
+
+FacultyWorkload is the source of truth for open load: every change to
+open_complaints is also applied to the in-memory assignment index
+(assignment.workload_index), which is seeded from these rows.
+"""
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+
+from .assignment import OPEN_STATUSES, workload_index
+from .models import Complaint, FacultyWorkload, Feedback
+
+
+COUNTERS = ('open_complaints', 'resolved_complaints', 'resolution_seconds', 'feedback_count')
+
+
+# =========================
+# Incremental updates
+# =========================
+def apply_deltas(deltas, index=True):
+    """
+    ``deltas`` maps user id -> {counter: change}; counters never go below zero.
+    Open-load changes also reach the assignment index unless ``index`` is off
+    (the caller already counted them there).
+    """
+    for user_id, changes in deltas.items():
+        changes = {field: delta for field, delta in changes.items() if delta}
+        if not user_id or not changes:
+            continue
+        if index and changes.get('open_complaints'):
+            workload_index.adjust(user_id, changes['open_complaints'])
+        update = {field: Greatest(F(field) + delta, Value(0)) for field, delta in changes.items()}
+        if FacultyWorkload.objects.filter(pk=user_id).update(**update):
+            continue
+        try:
+            with transaction.atomic():
+                FacultyWorkload.objects.create(
+                    user_id=user_id, **{field: max(delta, 0) for field, delta in changes.items()}
+                )
+        except IntegrityError:
+            # Created concurrently; the row exists now
+            FacultyWorkload.objects.filter(pk=user_id).update(**update)
+
+
+def _state(instance):
+    fields = instance.__dict__
+    if any(name not in fields for name in ('assigned_to_id', 'status', 'created_at', 'resolved_at')):
+        # Deferred via only()/defer(); reading them would cost a query
+        return None
+    return (instance.assigned_to_id, instance.status, instance.created_at, instance.resolved_at)
+
+
+def _contribution(state):
+    """(user id, counters) a complaint in ``state`` adds to its assignee"""
+    if state is None or not state[0]:
+        return None, {}
+    user_id, status, created_at, resolved_at = state
+    counters = {}
+    if status in OPEN_STATUSES:
+        counters['open_complaints'] = 1
+    if resolved_at and created_at:
+        counters['resolved_complaints'] = 1
+        counters['resolution_seconds'] = max(int((resolved_at - created_at).total_seconds()), 0)
+    return user_id, counters
+
+
+def _difference(before, after):
+    deltas = defaultdict(Counter)
+    user_id, counters = _contribution(before)
+    for field, value in counters.items():
+        deltas[user_id][field] -= value
+    user_id, counters = _contribution(after)
+    for field, value in counters.items():
+        deltas[user_id][field] += value
+    return deltas
+
+
+def complaints_created(complaints, index=True):
+    """Count complaints inserted with bulk_create(), which sends no post_save"""
+    deltas = defaultdict(Counter)
+    for complaint in complaints:
+        user_id, counters = _contribution(_state(complaint))
+        deltas[user_id].update(counters)
+    apply_deltas(deltas, index=index)
+
+
+# =========================
+# Recomputation
+# =========================
+def refresh_workloads(user_ids):
+    """Recompute the rows of ``user_ids`` from Complaint and Feedback"""
+    user_ids = {pk for pk in user_ids if pk}
+    if not user_ids:
+        return
+    totals = {pk: dict.fromkeys(COUNTERS, 0) for pk in user_ids}
+
+    open_counts = Complaint.objects.filter(
+        assigned_to__in=user_ids, status__in=OPEN_STATUSES
+    ).values('assigned_to').annotate(n=Count('id'))
+    for row in open_counts:
+        totals[row['assigned_to']]['open_complaints'] = row['n']
+
+    resolved = Complaint.objects.filter(
+        assigned_to__in=user_ids, resolved_at__isnull=False
+    ).values_list('assigned_to_id', 'created_at', 'resolved_at')
+    for user_id, created_at, resolved_at in resolved.iterator(chunk_size=2000):
+        totals[user_id]['resolved_complaints'] += 1
+        totals[user_id]['resolution_seconds'] += max(int((resolved_at - created_at).total_seconds()), 0)
+
+    feedback_counts = Feedback.objects.filter(
+        complaint__assigned_to__in=user_ids
+    ).values('complaint__assigned_to').annotate(n=Count('id'))
+    for row in feedback_counts:
+        totals[row['complaint__assigned_to']]['feedback_count'] = row['n']
+
+    for user_id, values in totals.items():
+        FacultyWorkload.objects.update_or_create(user_id=user_id, defaults=values)
+    workload_index.set_loads({user_id: values['open_complaints'] for user_id, values in totals.items()})
+
+
+def refresh_workloads_on_commit(user_ids):
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: refresh_workloads(user_ids))
+
+
+# =========================
+# Signal receivers
+# =========================
+def complaint_state_loaded(sender, instance, **kwargs):
+    """post_init: remember what the complaint currently counts for"""
+    instance._materialized_state = _state(instance)
+
+
+def complaint_state_saved(sender, instance, created, **kwargs):
+    before = None if created else getattr(instance, '_materialized_state', None)
+    after = _state(instance)
+    if not created and before is None:
+        # Loaded with deferred fields: the old state is unknown
+        refresh_workloads_on_commit([instance.assigned_to_id])
+    elif before != after:
+        apply_deltas(_difference(before, after))
+    instance._materialized_state = after
+
+
+def complaint_state_deleted(sender, instance, **kwargs):
+    apply_deltas(_difference(getattr(instance, '_materialized_state', None), None))
+
+
+def feedback_saved(sender, instance, created, **kwargs):
+    if created:
+        assignee = Complaint.objects.filter(pk=instance.complaint_id).values_list('assigned_to_id', flat=True).first()
+        apply_deltas({assignee: {'feedback_count': 1}})
+
+
+def feedback_deleted(sender, instance, **kwargs):
+    assignee = Complaint.objects.filter(pk=instance.complaint_id).values_list('assigned_to_id', flat=True).first()
+    apply_deltas({assignee: {'feedback_count': -1}})
@@ -47,10 +47,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'complaints.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'complaints.actor.ActorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -81,9 +83,26 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests; health checks drop stale ones
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+        },
     }
 }
 
+# SQLite PRAGMAs applied on every new connection (see complaints/db.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,  # ms, matches OPTIONS['timeout']
+    'mmap_size': 256 * 1024 * 1024,  # 256MB
+    'cache_size': -64000,  # ~64MB page cache (negative = KiB)
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -133,6 +152,16 @@ LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/login/'
 LOGIN_URL = '/login/'
 
+# Session users and API tokens are served from the cache
+# (complaints/authentication.py), invalidated when the user, profile or
+# token changes; AUTH_CACHE_TIMEOUT bounds staleness after bulk updates.
+AUTHENTICATION_BACKENDS = ['complaints.authentication.CachedModelBackend']
+AUTH_CACHE_TIMEOUT = 300
+
+# Sessions are read from the cache and written through to the database,
+# so they stay server-side (revocable) and survive a cache flush
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 # Local development CSRF/trust settings
 CSRF_TRUSTED_ORIGINS = [
     'http://localhost:8000',
@@ -146,7 +175,7 @@ SESSION_COOKIE_SAMESITE = 'Lax'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'complaints.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -159,8 +188,29 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'complaints.throttling.TokenBucketThrottle',
+    ],
 }
 
+# Serve dashboard, complaint list/detail, /api/stats/ and the notification
+# list from the async views (complaints/async_views.py); enable under ASGI
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False').lower() == 'true'
+
+# orjson-backed renderer/parser (complaints/renderers.py); falls back to the
+# stdlib encoder when orjson is not installed
+API_FAST_JSON = os.getenv('API_FAST_JSON', 'False').lower() == 'true'
+if API_FAST_JSON:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'complaints.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'complaints.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
+
 # Email Configuration
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
@@ -180,6 +230,58 @@ X_FRAME_OPTIONS = 'DENY'
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+ATTACHMENT_MAX_SIZE = 10 * 1024 * 1024  # 10MB per attachment
+UPLOAD_CHUNK_MAX_SIZE = 2 * 1024 * 1024  # 2MB per chunk on /api/uploads/
+
+# Protected attachment delivery (complaints/attachments.py).
+# 'nginx' -> X-Accel-Redirect to ATTACHMENT_SENDFILE_URL_PREFIX (an `internal`
+# location aliased to MEDIA_ROOT); 'apache'/'lighttpd' -> X-Sendfile.
+# None streams the file from Django with Range support.
+ATTACHMENT_SENDFILE_BACKEND = os.getenv('ATTACHMENT_SENDFILE_BACKEND') or None
+ATTACHMENT_SENDFILE_URL_PREFIX = '/protected-media/'
+
+# Image attachment thumbnails (complaints/thumbnails.py), generated in a
+# background thread after the complaint is saved
+ATTACHMENT_THUMBNAIL_SIZES = {
+    'small': (96, 96),      # complaint list
+    'preview': (640, 640),  # complaint detail
+}
+ATTACHMENT_THUMBNAILS_ASYNC = True
+
+# Auto-assignment of new complaints (complaints/assignment.py).
+# Strategy: 'least_loaded', 'weighted', 'round_robin' or a dotted class path.
+ASSIGNMENT_STRATEGY = os.getenv('ASSIGNMENT_STRATEGY', 'least_loaded')
+ASSIGNMENT_WEIGHTS = {}         # username -> relative capacity (weighted strategy); 0 = on leave
+ASSIGNMENT_CATEGORY_MAP = {}    # Category.name -> UserProfile.category key, if names differ
+ASSIGNMENT_INDEX_TTL = 300      # seconds before a worker reloads workloads from the DB
+
+# SLA: hours allowed per priority before run_sla_scheduler escalates to the HOD
+SLA_POLICIES = {
+    'Critical': 4,
+    'High': 24,
+    'Medium': 72,
+    'Low': 168,
+}
+
+# Token-bucket rate limits (complaints/throttling.py): scope -> role -> rate.
+# 'N/period' allows bursts of N refilled at N per period; None = unlimited.
+# 'api' covers every API request, 'complaint_submit' new complaints (API and web).
+THROTTLE_RATES = {
+    'api': {'admin': None, 'hod': '1200/min', 'faculty': '600/min', 'student': '300/min', 'anon': '60/min'},
+    'complaint_submit': {'admin': None, 'hod': None, 'faculty': '20/hour', 'student': '10/hour', 'anon': '10/hour'},
+}
+
+# Near-duplicate detection: minimum estimated Jaccard similarity to flag
+DUPLICATE_SIMILARITY_THRESHOLD = 0.5
+DUPLICATE_MAX_CANDIDATES = 200  # LSH candidates scored per lookup
+
+# Change feed (/api/changes/): prune_change_log compacts entries older than this
+CHANGE_FEED_RETENTION_DAYS = int(os.getenv('CHANGE_FEED_RETENTION_DAYS', '30'))
+
+# Response compression (complaints/compression.py): server preference order;
+# zstd/br are skipped unless the zstandard/brotli packages are installed
+COMPRESSION_ENCODINGS = ('zstd', 'br', 'gzip')
+COMPRESSION_MIN_SIZE = 500  # bytes; smaller bodies are sent as-is
 
 # Logging Configuration
 LOGGING = {
@@ -223,10 +325,16 @@ LOGGING = {
 # CORS not needed for local-only Django templates; remove if not using a separate frontend
 
 # Cache Configuration
+# Shared SQLite file so all worker processes on the host see the same cache
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'BACKEND': 'complaints.cache.SQLiteCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / 'cache.sqlite3')),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_FREQUENCY': 4,
+        },
     }
 }
 
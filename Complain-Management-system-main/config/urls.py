@@ -30,7 +30,7 @@ urlpatterns = [
     path('logout/', views.custom_logout, name='logout'),
 ]
 
-# Serve media files in development
+# Serve static files in development. Media is never served directly:
+# attachments go through the permission-checked complaint_attachment view.
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)